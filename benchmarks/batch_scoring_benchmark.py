@@ -0,0 +1,80 @@
+"""
+Measures offline batch-scoring throughput and its scaling from 1 to N worker processes.
+
+Without --data-path a synthetic CSV with the model's feature columns is written
+first; without --model-uri a linear model is fitted on it and exported:
+
+    python -m benchmarks.batch_scoring_benchmark --rows 2000000 --max-workers 8
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from src.batch_scoring import BatchScorer, resolve_model_path
+from src.data_cleanner import FEATURE_COLUMNS
+
+
+def _write_data(path: str, rows: int, chunksize: int):
+    rng = np.random.default_rng(0)
+    for start in range(0, rows, chunksize):
+        n = min(chunksize, rows - start)
+        chunk = pd.DataFrame(rng.random((n, len(FEATURE_COLUMNS))) * 100, columns=FEATURE_COLUMNS)
+        chunk.iloc[::11, -1] = np.nan
+        chunk["customer_state"] = rng.choice(["SP", "RJ", "MG", "RS"], n)
+        chunk.to_csv(path, mode="a", header=start == 0, index=False)
+
+
+def _write_model(model_dir: str, data_path: str):
+    from sklearn.linear_model import LinearRegression
+    from sklearn.pipeline import Pipeline
+
+    from src.data_cleanner import PreProcessTransformer
+    from src.linear_artifact import export_linear_model
+
+    X = pd.read_csv(data_path, usecols=FEATURE_COLUMNS, nrows=10_000)
+    preprocessor = PreProcessTransformer().fit(X)
+    y = np.random.default_rng(1).random(len(X))
+    pipeline = Pipeline([("preprocess", preprocessor), ("model", LinearRegression().fit(preprocessor.transform(X), y))])
+    return export_linear_model(pipeline, model_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--data-path")
+    parser.add_argument("--model-uri")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="batch-scoring-")
+    try:
+        data_path = args.data_path
+        if data_path is None:
+            data_path = os.path.join(work_dir, "orders.csv")
+            _write_data(data_path, args.rows, args.chunksize)
+        model_path = (
+            resolve_model_path(args.model_uri) if args.model_uri
+            else _write_model(os.path.join(work_dir, "model"), data_path)
+        )
+
+        workers = sorted({1, 2, 4, args.max_workers} & set(range(1, args.max_workers + 1)))
+        baseline = None
+        print(f"{'workers':>8}{'rows':>12}{'seconds':>10}{'rows/s':>12}{'rows/s/core':>13}{'speedup':>9}")
+        for n in workers:
+            output_dir = os.path.join(work_dir, f"predictions-{n}")
+            stats = BatchScorer(model_path, n_workers=n, chunksize=args.chunksize).score(data_path, output_dir)
+            baseline = baseline or stats["rows_per_second"]
+            print(f"{n:>8}{stats['rows']:>12}{stats['seconds']:>10}{stats['rows_per_second']:>12}"
+                  f"{stats['rows_per_second_per_core']:>13}{stats['rows_per_second'] / baseline:>9.2f}")
+            shutil.rmtree(output_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Compares serving-worker cold start of the pickled sklearn pipeline against the NumPy linear artifact.
+
+Each mode loads the model and scores one row in a fresh interpreter, as a new
+prediction-server worker would:
+
+    python -m benchmarks.cold_start_benchmark --repeats 5
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _build(model_dir: str, rows: int):
+    import joblib
+    import numpy as np
+    import pandas as pd
+    from sklearn.linear_model import LinearRegression
+    from sklearn.pipeline import Pipeline
+
+    from src.data_cleanner import FEATURE_COLUMNS, PreProcessTransformer
+    from src.linear_artifact import export_linear_model
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((rows, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    y = rng.random(rows)
+    preprocessor = PreProcessTransformer().fit(X)
+    pipeline = Pipeline([("preprocess", preprocessor), ("model", LinearRegression().fit(preprocessor.transform(X), y))])
+    joblib.dump(pipeline, os.path.join(model_dir, "pipeline.joblib"))
+    export_linear_model(pipeline, os.path.join(model_dir, "linear_model"))
+
+
+def _run_mode(mode: str, model_dir: str) -> dict:
+    start = time.perf_counter()
+    if mode == "pickle":
+        import joblib
+
+        model = joblib.load(os.path.join(model_dir, "pipeline.joblib"))
+        features = list(model.steps[0][1].feature_names_in_)
+    else:
+        from src.linear_artifact import LinearPredictor
+
+        model = LinearPredictor.load(os.path.join(model_dir, "linear_model"))
+        features = list(model.feature_names_in_)
+    loaded = time.perf_counter()
+
+    import numpy as np
+
+    model.predict(np.ones((1, len(features))))
+    done = time.perf_counter()
+    return {
+        "mode": mode,
+        "load_ms": round((loaded - start) * 1000, 2),
+        "first_predict_ms": round((done - loaded) * 1000, 3),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "sklearn_imported": "sklearn" in sys.modules,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=["build", "pickle", "compact"])
+    parser.add_argument("--model-dir")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.mode == "build":
+        _build(args.model_dir, args.rows)
+        return
+    if args.mode:
+        print(json.dumps(_run_mode(args.mode, args.model_dir)))
+        return
+
+    model_dir = tempfile.mkdtemp(prefix="cold-start-")
+    try:
+        # Built in a child too: peak RSS survives exec, so the parent must stay small
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.cold_start_benchmark", "--mode", "build",
+             "--model-dir", model_dir, "--rows", str(args.rows)],
+            check=True, cwd=REPO_ROOT,
+        )
+        print(f"{'mode':<9}{'load ms':>10}{'predict ms':>12}{'peak RSS MB':>14}{'sklearn':>9}")
+        for mode in ["pickle", "compact"]:
+            runs = []
+            for _ in range(args.repeats):
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.cold_start_benchmark", "--mode", mode, "--model-dir", model_dir],
+                    check=True, capture_output=True, text=True, cwd=REPO_ROOT,
+                )
+                runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+            # Report the median run
+            r = sorted(runs, key=lambda run: run["load_ms"])[len(runs) // 2]
+            print(f"{r['mode']:<9}{r['load_ms']:>10}{r['first_predict_ms']:>12}{r['peak_rss_mb']:>14}"
+                  f"{str(r['sklearn_imported']):>9}")
+    finally:
+        shutil.rmtree(model_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Tracks the import cost of the project's modules with ``python -X importtime``.
+
+Each module is imported in a fresh interpreter; the cumulative time of the
+module itself and its heaviest dependencies are reported. With ``--baseline``
+the run is compared against a stored JSON file and exits non-zero when a
+module got slower than the allowed ratio:
+
+    python -m benchmarks.import_benchmark
+    python -m benchmarks.import_benchmark --baseline benchmarks/import_baseline.json --update
+    python -m benchmarks.import_benchmark --baseline benchmarks/import_baseline.json --max-ratio 1.5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+MODULES = [
+    "src.data_cleanner",
+    "src.model_dev",
+    "src.model_evaluator",
+    "src.step_cache",
+    "src.inference_server",
+    "steps.ingest_data",
+    "steps.model_train",
+    "steps.evaluation",
+    "pipelines.deployment_pipeline",
+    "run_deployment",
+]
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Differences below this many microseconds are treated as noise
+NOISE_US = 20_000
+
+
+def import_profile(module: str, repeats: int = 3) -> dict:
+    """
+    Imports ``module`` in fresh interpreters and returns its best cumulative time.
+
+    Returns:
+        dict: ``cumulative_us`` of the import and the ``top`` five direct
+            imports by cumulative time
+    """
+    best = None
+    for _ in range(repeats):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=REPO_ROOT, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed"}
+        packages, total = {}, 0
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            cumulative = cumulative.strip()
+            if not cumulative.isdigit():
+                continue
+            # Names are indented two extra spaces per nesting level. Top-level
+            # entries are summed for the total; their direct imports (one level
+            # down) are what the breakdown reports.
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            name = name.strip()
+            if depth == 0:
+                total += int(cumulative)
+            elif depth == 1:
+                packages[name] = packages.get(name, 0) + int(cumulative)
+        if best is None or total < best["cumulative_us"]:
+            top = sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:5]
+            best = {"cumulative_us": total, "top": top}
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--baseline")
+    parser.add_argument("--update", action="store_true", help="Write the results to --baseline")
+    parser.add_argument("--max-ratio", type=float, default=1.5)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    results = {module: import_profile(module, args.repeats) for module in args.modules}
+    baseline = {}
+    if args.baseline and os.path.exists(args.baseline) and not args.update:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    regressions = []
+    print(f"{'module':<32}{'ms':>10}{'baseline ms':>13}  heaviest imports")
+    for module, result in results.items():
+        if "error" in result:
+            print(f"{module:<32}{'-':>10}{'':>13}  {result['error']}")
+            continue
+        ms = result["cumulative_us"] / 1000
+        base = baseline.get(module, {}).get("cumulative_us")
+        heaviest = ", ".join(f"{name} {us / 1000:.0f}ms" for name, us in result["top"][:3])
+        print(f"{module:<32}{ms:>10.1f}{(base / 1000 if base else float('nan')):>13.1f}  {heaviest}")
+        if base and result["cumulative_us"] > base * args.max_ratio and result["cumulative_us"] - base > NOISE_US:
+            regressions.append(module)
+
+    if args.update and args.baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    if regressions:
+        print(f"Import time regressions (>{args.max_ratio}x baseline): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
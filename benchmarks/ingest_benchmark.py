@@ -0,0 +1,76 @@
+"""
+Compares cold CSV ingestion against a warm Parquet cache.
+
+Each mode runs in a fresh interpreter so that wall time and peak RSS are not
+polluted by the previous run:
+
+    python -m benchmarks.ingest_benchmark --data-path data/olist_customers_dataset.csv
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _run_mode(mode: str, data_path: str, cache_dir: str) -> dict:
+    from steps.ingest_data import DEFAULT_CHUNKSIZE, DEFAULT_COLUMNS, IngestData
+
+    if mode == "csv_full":
+        ingest = IngestData(data_path)
+    elif mode == "csv_pruned":
+        ingest = IngestData(data_path, columns=DEFAULT_COLUMNS, chunksize=DEFAULT_CHUNKSIZE)
+    else:
+        ingest = IngestData(data_path, columns=DEFAULT_COLUMNS, chunksize=DEFAULT_CHUNKSIZE, cache_dir=cache_dir)
+
+    start = time.perf_counter()
+    df = ingest.get_data()
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": mode,
+        "seconds": round(elapsed, 4),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "rows": len(df),
+        "frame_mb": round(df.memory_usage(deep=True).sum() / (1024 * 1024), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--data-path", required=True)
+    parser.add_argument("--mode", choices=["csv_full", "csv_pruned", "cache_cold", "cache_warm"])
+    parser.add_argument("--cache-dir")
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_run_mode(args.mode, args.data_path, args.cache_dir)))
+        return
+
+    cache_dir = tempfile.mkdtemp(prefix="ingest-cache-")
+    try:
+        print(f"{'mode':<12}{'seconds':>10}{'peak RSS MB':>14}{'frame MB':>11}{'rows':>12}")
+        for mode in ["csv_full", "csv_pruned", "cache_cold", "cache_warm"]:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.ingest_benchmark", "--data-path", args.data_path,
+                 "--mode", mode, "--cache-dir", cache_dir],
+                check=True, capture_output=True, text=True,
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            )
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{r['mode']:<12}{r['seconds']:>10}{r['peak_rss_mb']:>14}{r['frame_mb']:>11}{r['rows']:>12}")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
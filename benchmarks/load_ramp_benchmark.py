@@ -0,0 +1,97 @@
+"""
+Replays requests at a rising number of concurrent clients against the autoscaled model server.
+
+Each stage keeps ``concurrency`` clients busy for ``--stage-seconds`` and
+reports the latency of its last window, once the supervisor had time to
+react, next to the number of workers serving it. Run it again with
+``--fixed-workers 1`` to see the same ramp without scaling:
+
+    python -m benchmarks.load_ramp_benchmark --model-uri <uri> --requests-file predict_requests.jsonl
+    python -m benchmarks.load_ramp_benchmark --model-uri <uri> --fixed-workers 1
+
+Without --model-uri a linear model is fitted on synthetic data; without a
+requests file, records with random feature values are replayed.
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from src.autoscaler import ScalingPolicy, WorkerSupervisor
+from src.inference_server import feature_names, load_model, read_requests, replay
+
+
+def _random_records(model_uri: str, n: int) -> list:
+    features = feature_names(load_model(model_uri))
+    values = np.random.default_rng(0).random((n, len(features))) * 100
+    return [dict(zip(features, row.tolist())) for row in values]
+
+
+async def run_ramp(supervisor: WorkerSupervisor, records: list, stages: list, stage_seconds: float,
+                   window_requests: int) -> list:
+    source = itertools.cycle(records)
+    results = []
+    for concurrency in stages:
+        deadline = time.monotonic() + stage_seconds
+        while True:
+            batch = list(itertools.islice(source, concurrency * window_requests))
+            stats = await replay(batch, supervisor.host, supervisor.port, concurrency)
+            if time.monotonic() >= deadline:
+                break
+        results.append({"concurrency": concurrency, "workers": supervisor.workers, **stats})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model-uri")
+    parser.add_argument("--requests-file", default="predict_requests.jsonl")
+    parser.add_argument("--stages", default="1,4,16,64,16,1", help="Concurrent clients per stage")
+    parser.add_argument("--stage-seconds", type=float, default=10.0)
+    parser.add_argument("--window-requests", type=int, default=20, help="Requests per client per window")
+    parser.add_argument("--min-workers", type=int, default=1)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--fixed-workers", type=int, help="Disable scaling and serve with this many workers")
+    parser.add_argument("--target-in-flight", type=float, default=8.0)
+    parser.add_argument("--max-latency-ms", type=float, default=50.0)
+    parser.add_argument("--cooldown-s", type=float, default=2.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    work_dir = tempfile.mkdtemp(prefix="load-ramp-")
+    try:
+        model_uri = args.model_uri
+        if model_uri is None:
+            from benchmarks.batch_scoring_benchmark import _write_data, _write_model
+
+            data_path = os.path.join(work_dir, "orders.csv")
+            _write_data(data_path, 10_000, 10_000)
+            model_uri = _write_model(os.path.join(work_dir, "model"), data_path)
+        if os.path.exists(args.requests_file):
+            records = read_requests(args.requests_file)
+        else:
+            records = _random_records(model_uri, 10_000)
+
+        low, high = (args.fixed_workers, args.fixed_workers) if args.fixed_workers else (args.min_workers, args.max_workers)
+        policy = ScalingPolicy(min_workers=low, max_workers=high, target_in_flight=args.target_in_flight,
+                               max_latency_ms=args.max_latency_ms, cooldown_s=args.cooldown_s)
+        stages = [int(s) for s in args.stages.split(",")]
+        with WorkerSupervisor(model_uri, port=0, policy=policy, poll_interval_s=0.25) as supervisor:
+            results = asyncio.run(run_ramp(supervisor, records, stages, args.stage_seconds, args.window_requests))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"{'clients':>8}{'workers':>9}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for r in results:
+        print(f"{r['concurrency']:>8}{r['workers']:>9}{r['requests_per_second']:>10.1f}"
+              f"{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
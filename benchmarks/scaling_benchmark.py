@@ -0,0 +1,147 @@
+"""
+Times every pipeline stage and the whole pipeline on synthetic Olist data at growing sizes.
+
+For each scale a synthetic file of ``base_rows * scale`` rows is generated
+(src/synthetic_data.py) and the stages run in a fresh interpreter, reporting
+wall time and peak RSS per stage. With ``--baseline`` the run is compared
+against a stored JSON file and exits non-zero when a stage got slower or
+bigger than the allowed ratio:
+
+    python -m benchmarks.scaling_benchmark --base-rows 100000 --scales 1,10,100
+    python -m benchmarks.scaling_benchmark --baseline benchmarks/scaling_baseline.json --update
+    python -m benchmarks.scaling_benchmark --baseline benchmarks/scaling_baseline.json --max-ratio 1.5
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STAGES = ["ingest_data", "preprocess", "split", "train", "evaluate", "bootstrap", "end_to_end"]
+# Differences below these are treated as noise
+NOISE_SECONDS = 0.05
+NOISE_MB = 20.0
+
+
+def run_stages(data_path: str, bootstrap_resamples: int) -> dict:
+    """
+    Runs ingest, preprocess, split, train and both evaluators once, like the training pipeline.
+
+    Returns:
+        dict: ``seconds``, ``peak_rss_mb`` and ``rows`` per stage, plus ``end_to_end``
+    """
+    from src.data_cleanner import DataPreProcessStrategy, DataSplitStrategy, PreProcessTransformer
+    from src.model_dev import LinearRegressionModel
+    from src.model_evaluator import BootstrapMetrics, RegressionMetrics
+    from src.profiling import profile_step
+    from steps.ingest_data import DEFAULT_CHUNKSIZE, DEFAULT_COLUMNS, IngestData
+
+    records = {}
+
+    def record(profile):
+        records[profile.name] = {
+            "seconds": profile.record["wall_s"],
+            "peak_rss_mb": profile.record["peak_rss_mb"],
+            "rows": profile.record["rows"],
+        }
+
+    with profile_step("end_to_end") as total:
+        with profile_step("ingest_data") as stage:
+            data = IngestData(data_path, columns=DEFAULT_COLUMNS, chunksize=DEFAULT_CHUNKSIZE).get_data()
+            stage.rows = total.rows = len(data)
+        record(stage)
+        with profile_step("preprocess", rows=len(data)) as stage:
+            preprocessor = PreProcessTransformer().fit(data)
+            processed = DataPreProcessStrategy().handle_data(data)
+        record(stage)
+        with profile_step("split", rows=len(processed)) as stage:
+            X_train, X_test, y_train, y_test = DataSplitStrategy().handle_data(processed)
+        record(stage)
+        with profile_step("train", rows=len(X_train)) as stage:
+            model = LinearRegressionModel().train(preprocessor.transform(X_train), y_train)
+        record(stage)
+        with profile_step("evaluate", rows=len(X_test)) as stage:
+            prediction = model.predict(preprocessor.transform(X_test))
+            RegressionMetrics().calculate_scores(y_test.to_numpy(), prediction)
+        record(stage)
+        with profile_step("bootstrap", rows=len(X_test)) as stage:
+            BootstrapMetrics(n_resamples=bootstrap_resamples).calculate_scores(y_test.to_numpy(), prediction)
+        record(stage)
+    record(total)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-rows", type=int, default=100_000)
+    parser.add_argument("--scales", default="1,10,100")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--data-dir", help="Keep generated files here and reuse them across runs")
+    parser.add_argument("--bootstrap-resamples", type=int, default=200)
+    parser.add_argument("--baseline")
+    parser.add_argument("--update", action="store_true", help="Write the results to --baseline")
+    parser.add_argument("--max-ratio", type=float, default=1.5)
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_stages(args.run, args.bootstrap_resamples)))
+        return
+
+    from src.synthetic_data import generate
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="scaling-")
+    profile_dir = tempfile.mkdtemp(prefix="scaling-profiles-")
+    results = {}
+    try:
+        for scale in [int(s) for s in args.scales.split(",")]:
+            rows = args.base_rows * scale
+            path = os.path.join(data_dir, f"olist-{rows}.{args.format}")
+            if not os.path.exists(path):
+                generate(path, rows)
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.scaling_benchmark", "--run", path,
+                 "--bootstrap-resamples", str(args.bootstrap_resamples)],
+                check=True, capture_output=True, text=True, cwd=REPO_ROOT,
+                env={**os.environ, "PROFILE_DIR": profile_dir, "STEP_CACHE": "0"},
+            )
+            results[f"{scale}x"] = json.loads(out.stdout.strip().splitlines()[-1])
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+    baseline = {}
+    if args.baseline and os.path.exists(args.baseline) and not args.update:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    regressions = []
+    print(f"{'scale':<7}{'stage':<13}{'rows':>12}{'seconds':>10}{'base s':>9}{'peak RSS MB':>13}{'base MB':>9}")
+    for scale, stages in results.items():
+        for stage in STAGES:
+            r = stages[stage]
+            base = baseline.get(scale, {}).get(stage, {})
+            base_s, base_mb = base.get("seconds"), base.get("peak_rss_mb")
+            print(f"{scale:<7}{stage:<13}{r['rows'] or 0:>12}{r['seconds']:>10.3f}"
+                  f"{(base_s if base_s is not None else float('nan')):>9.3f}{r['peak_rss_mb']:>13.1f}"
+                  f"{(base_mb if base_mb is not None else float('nan')):>9.1f}")
+            if base_s and r["seconds"] > base_s * args.max_ratio and r["seconds"] - base_s > NOISE_SECONDS:
+                regressions.append(f"{scale} {stage} time")
+            if base_mb and r["peak_rss_mb"] > base_mb * args.max_ratio and r["peak_rss_mb"] - base_mb > NOISE_MB:
+                regressions.append(f"{scale} {stage} memory")
+
+    if args.update and args.baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    if regressions:
+        print(f"Scaling regressions (>{args.max_ratio}x baseline): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Measures Optuna trial throughput for HyperparameterTuner at 1, 2 and N workers.
+
+Runs a fixed number of trials against a fresh SQLite study for each worker count
+on synthetic data shaped like the preprocessed Olist features:
+
+    python -m benchmarks.tuning_benchmark --model LightGBM --trials 40 --rows 50000
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from src.data_cleanner import FEATURE_COLUMNS
+from src.hyperparameter_tuning import HyperparameterTuner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default="LightGBM")
+    parser.add_argument("--trials", type=int, default=40)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--pruner", default="median")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(args.rows, len(FEATURE_COLUMNS)))
+    y = X @ rng.normal(size=X.shape[1]) + np.sin(X[:, 0]) + rng.normal(size=args.rows)
+
+    worker_counts = sorted({1, min(2, args.max_workers), args.max_workers})
+    tmp = tempfile.mkdtemp(prefix="tuning-bench-")
+    try:
+        print(f"{'workers':>8}{'seconds':>10}{'trials/s':>10}{'pruned':>8}{'best RMSE':>11}")
+        for workers in worker_counts:
+            tuner = HyperparameterTuner(
+                args.model,
+                os.path.join(tmp, f"study-{workers}.db"),
+                n_trials=args.trials,
+                n_workers=workers,
+                pruner=args.pruner,
+            )
+            start = time.perf_counter()
+            study = tuner.tune(X, y)
+            elapsed = time.perf_counter() - start
+            pruned = sum(t.state.name == "PRUNED" for t in study.trials)
+            print(f"{workers:>8}{elapsed:>10.2f}{len(study.trials) / elapsed:>10.2f}{pruned:>8}{study.best_value:>11.4f}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
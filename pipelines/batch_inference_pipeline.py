@@ -0,0 +1,27 @@
+from typing import List, Optional
+from zenml import pipeline
+from src.batch_scoring import DEFAULT_CHUNKSIZE
+from steps.batch_score import batch_score
+
+@pipeline(enable_cache=False)
+def batch_inference_pipeline(
+    data_path: str,
+    model_uri: str,
+    output_dir: str = "artifacts/predictions",
+    n_workers: Optional[int] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    keep_columns: Optional[List[str]] = None,
+    partition_by: Optional[str] = None,
+    overwrite: bool = True,
+):
+    """Offline scoring of historical orders with a trained model; replaces earlier output unless overwrite is off."""
+    batch_score(
+        data_path,
+        model_uri,
+        output_dir,
+        n_workers=n_workers,
+        chunksize=chunksize,
+        keep_columns=keep_columns,
+        partition_by=partition_by,
+        overwrite=overwrite,
+    )
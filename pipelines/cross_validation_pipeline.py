@@ -0,0 +1,19 @@
+from typing import Optional
+from zenml import pipeline
+from src.data_cleanner import TIME_COLUMN
+from steps.config import CrossValidationConfig
+from steps.cross_validate import cross_validate_model
+from steps.ingest_data import DEFAULT_COLUMNS, INGEST_CACHE_DIR, ingest_data
+from steps.stack import experiment_tracker_name
+
+@pipeline(enable_cache=False)
+def cross_validation_pipeline(data_path: str, cache_dir: Optional[str] = INGEST_CACHE_DIR, time_ordered: bool = False):
+    """Cross-validates the model in parallel instead of relying on one train/test split."""
+    # The timestamp is only read when the folds are ordered by it
+    columns = DEFAULT_COLUMNS + [TIME_COLUMN] if time_ordered else DEFAULT_COLUMNS
+    data = ingest_data(data_path, columns=columns, cache_dir=cache_dir)
+
+    config = CrossValidationConfig(time_ordered=time_ordered)
+    cv_mean, cv_std = cross_validate_model.with_options(experiment_tracker=experiment_tracker_name())(
+        data, config=config
+    )
@@ -3,6 +3,7 @@ import os
 import numpy as np
 from pydantic import BaseModel  
 import logging
+from typing import Optional
 
 from zenml import pipeline, step
 from zenml.config import DockerSettings
@@ -13,44 +14,98 @@ from zenml.integrations.mlflow.services import MLFlowDeploymentService
 from zenml.integrations.mlflow.steps import mlflow_model_deployer_step
 
 from steps.clean_data import clean_data
-from steps.evaluation import evaluate_model
-from steps.ingest_data import ingest_data
+from steps.dashboard import write_dashboard_aggregates
+from steps.drift import check_drift, detect_drift, update_drift_reference
+from steps.evaluation import bootstrap_evaluate_model, evaluate_model
+from steps.ingest_data import INGEST_CACHE_DIR, ingest_data
+from steps.join_tables import join_olist_tables
 from steps.model_train import train_model
-from steps.config import ModelNameConfig
+from steps.config import DriftConfig, ModelNameConfig
+from steps.stack import experiment_tracker_name
 
 docker_settings = DockerSettings(required_integrations=[MLFLOW])
 
+# Default bar for the lower bound of the bootstrap R²: the R² of always predicting
+# the mean. The Olist models explain little of the review score (R² around 0.02),
+# so any fixed bar much above zero would reject every model they can produce.
+MEAN_PREDICTOR_R2 = 0.0
+
 class DeploymentTriggerConfig(BaseModel):  
     """Configuration for deployment trigger."""
-    min_accuracy: float = 0.5
+    min_accuracy: float = MEAN_PREDICTOR_R2
+    # Only replace the deployed model when the data has drifted since the last training run
+    require_drift: bool = True
 
 @step
-def deployment_trigger(accuracy: float, config: DeploymentTriggerConfig) -> bool:
+def deployment_trigger(accuracy: float, drift_detected: bool, config: DeploymentTriggerConfig) -> bool:
     """Determines whether the model should be deployed."""
-    decision = accuracy > config.min_accuracy
+    decision = accuracy > config.min_accuracy and (drift_detected or not config.require_drift)
     logging.info(f"Deployment Trigger Decision: {decision}")
     return decision
 
+@pipeline(enable_cache=False)
+def drift_check_pipeline(data_path: str):
+    """
+    Checks whether the data has drifted since the last training run, without training.
+
+    ``run_deployment.py`` runs it first and only starts the deployment pipeline
+    when its ``drift_detected`` output is True.
+    """
+    check_drift(data_path, config=DriftConfig())
+
 @pipeline(enable_cache=False, settings={"docker": docker_settings})
 def continous_deployment_pipeline(
     data_path: str,
-    min_accuracy: float = 0.5,
+    min_accuracy: float = MEAN_PREDICTOR_R2,
     workers: int = 1,
-    timeout: int = DEFAULT_SERVICE_START_STOP_TIMEOUT
+    timeout: int = DEFAULT_SERVICE_START_STOP_TIMEOUT,
+    cache_dir: Optional[str] = INGEST_CACHE_DIR,
+    force_deploy: bool = False,
 ):
-    """Continuous deployment pipeline that trains and evaluates a model."""
-    data = ingest_data(data_path)
-    X_train, X_test, y_train, y_test = clean_data(data)
+    """
+    Continuous deployment pipeline that trains, evaluates and deploys a model.
+
+    The model is deployed when the lower bound of its bootstrap R² clears
+    ``min_accuracy`` (by default: when it reliably beats predicting the mean)
+    and the data has drifted since the last training run (``force_deploy``
+    overrides both). Once the model is evaluated, the data becomes the drift
+    reference of the next run. To skip retraining on unchanged data, run
+    ``drift_check_pipeline`` first.
+    """
+    drift_config = DriftConfig()
+    # A directory holds the raw Olist tables, which are joined; a file is the merged table
+    if os.path.isdir(data_path):
+        data = join_olist_tables(data_path)
+    else:
+        data = ingest_data(data_path, cache_dir=cache_dir)
+
+    tracker = experiment_tracker_name()
+    drift_detected, max_psi = detect_drift.with_options(experiment_tracker=tracker)(data, config=drift_config)
 
+    X_train, X_test, y_train, y_test, preprocessor = clean_data(data)
     config = ModelNameConfig()
-    model_name = train_model(X_train, X_test, y_train, y_test, config=config)
-    r2_score, rmse = evaluate_model(model_name, X_test, y_test)
+    model_name = train_model.with_options(experiment_tracker=tracker)(
+        X_train, X_test, y_train, y_test, preprocessor, config=config
+    )
+    r2_score, rmse = evaluate_model.with_options(experiment_tracker=tracker)(model_name, X_test, y_test)
 
     logging.info(f"R² Score: {r2_score}, RMSE: {rmse}")
 
-    # ✅ Force deployment regardless of accuracy
-    deployment_decision = True  
-    logging.info(f"Deployment Decision (Forced): {deployment_decision}")
+    # Gate on the lower confidence bound rather than the point estimate
+    r2_lower, r2_upper = bootstrap_evaluate_model.with_options(experiment_tracker=tracker)(
+        model_name, X_test, y_test
+    )
+    trigger_decision = deployment_trigger(
+        accuracy=r2_lower, drift_detected=drift_detected,
+        config=DeploymentTriggerConfig(min_accuracy=min_accuracy)
+    )
+
+    if force_deploy:
+        # Deploy regardless of the gate, e.g. to bootstrap the first deployment
+        deployment_decision = True
+        logging.info(f"Deployment Decision (Forced): {deployment_decision}")
+    else:
+        deployment_decision = trigger_decision
 
     mlflow_model_deployer_step(
         model=model_name,  # ✅ Ensure the correct model name is passed
@@ -58,3 +113,7 @@ def continous_deployment_pipeline(
         workers=workers,
         timeout=timeout
     )
+    # Written once the model is evaluated, after this run's drift check read the old reference
+    update_drift_reference(data, config=drift_config, after=[drift_detected, r2_score])
+    # The app serves the deployed model, so only its aggregates are shown
+    write_dashboard_aggregates(model_name, X_test, y_test, deploy_decision=deployment_decision)
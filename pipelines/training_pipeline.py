@@ -1,16 +1,38 @@
+import os
+from typing import Optional
 from zenml import pipeline
-from steps.ingest_data import ingest_data
+from steps.ingest_data import DEFAULT_COLUMNS, INGEST_CACHE_DIR, ingest_data
+from steps.join_tables import join_olist_tables
 from steps.clean_data import clean_data
 from steps.evaluation import evaluate_model
-from steps.model_train import train_model
+from steps.model_train import train_incremental_model, train_model
 from steps.config import ModelNameConfig
+from steps.stack import experiment_tracker_name
 
 @pipeline(enable_cache=False)
-def training_pipeline(data_path: str):
-    data = ingest_data(data_path)
-    X_train, X_test, y_train, y_test = clean_data(data)
+def training_pipeline(data_path: str, cache_dir: Optional[str] = INGEST_CACHE_DIR, segment_column: Optional[str] = None):
+    # With a segment column (e.g. customer_state) one model is fitted per segment
+    # and the evaluation is broken down by segment.
+    columns = DEFAULT_COLUMNS + [segment_column] if segment_column else None
+    # A directory holds the raw Olist tables, which are joined; a file is the merged table
+    if os.path.isdir(data_path):
+        data = join_olist_tables(data_path, columns=columns)
+    else:
+        data = ingest_data(data_path, columns=columns, cache_dir=cache_dir)
+    X_train, X_test, y_train, y_test, preprocessor = clean_data(data, segment_column=segment_column)
     
-    config = ModelNameConfig()
-    model = train_model(X_train, X_test, y_train, y_test, config=config)
+    tracker = experiment_tracker_name()
+    config = ModelNameConfig(segment_column=segment_column)
+    model = train_model.with_options(experiment_tracker=tracker)(X_train, X_test, y_train, y_test, preprocessor, config=config)
     
-    r2_score, rsme = evaluate_model(model, X_test, y_test)
\ No newline at end of file
+    r2_score, rsme = evaluate_model.with_options(experiment_tracker=tracker)(
+        model, X_test, y_test, segment_column=segment_column
+    )
+
+
+@pipeline(enable_cache=False)
+def incremental_training_pipeline(data_path: str, partition_id: str):
+    # data_path holds only the new partition (e.g. one month of orders); it is
+    # streamed into the persisted sufficient statistics instead of loaded whole.
+    config = ModelNameConfig(incremental=True, partition_id=partition_id)
+    train_incremental_model.with_options(experiment_tracker=experiment_tracker_name())(data_path, config=config)
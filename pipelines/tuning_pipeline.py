@@ -0,0 +1,14 @@
+from typing import Optional
+from zenml import pipeline
+from steps.ingest_data import INGEST_CACHE_DIR, ingest_data
+from steps.clean_data import clean_data
+from steps.tune_model import tune_model
+from steps.config import TuningConfig
+
+@pipeline(enable_cache=False)
+def tuning_pipeline(data_path: str, cache_dir: Optional[str] = INGEST_CACHE_DIR):
+    data = ingest_data(data_path, cache_dir=cache_dir)
+    X_train, X_test, y_train, y_test, preprocessor = clean_data(data)
+
+    config = TuningConfig()
+    best_params, best_cv_rmse = tune_model(X_train, y_train, preprocessor, config=config)
@@ -1,41 +1,106 @@
-from pipelines.deployment_pipeline import continous_deployment_pipeline
+import asyncio
+import os
 import click
 from rich import print
 from typing import cast
-from zenml.integrations.mlflow.mlflow_utils import get_tracking_uri
-from zenml.integrations.mlflow.model_deployers.mlflow_model_deployer import MLFlowModelDeployer
-from zenml.integrations.mlflow.services import MLFlowDeploymentService
+from src.inference_server import load_model, read_requests, serve_and_replay
+from src.prediction_cache import PredictionCache
+
+# ZenML, MLflow and the pipeline (and through it sklearn) are imported only on
+# the paths that need them, so `--config predict --model-uri ...` starts fast.
 
 DEPLOY = "deploy"
 PREDICT = "predict"
 DEPLOY_AND_PREDICT = "deploy_and_predict"
+SERVE = "serve"
 
 @click.command()
 @click.option(
     "--config",  # ✅ Removed incorrect alias "c"
-    type=click.Choice([DEPLOY, PREDICT, DEPLOY_AND_PREDICT]),
+    type=click.Choice([DEPLOY, PREDICT, DEPLOY_AND_PREDICT, SERVE]),
     help="Optionally choose to only run the deployment pipeline (`deploy`), "
-         "only run a prediction (`predict`), or run both (`deploy_and_predict`)."
+         "only run a prediction (`predict`), run both (`deploy_and_predict`), "
+         "or serve the model with autoscaled local workers (`serve`). The MLflow deployment "
+         "service runs a fixed number of workers; only `serve` scales with the load."
 )
 @click.option(
     "--min-accuracy",
-    default=0.5,
-    help="Minimum accuracy required to deploy the model"
+    default=0.0,
+    help="Lower bound of the bootstrap R² the model must clear to be deployed; "
+         "the default 0 means reliably beating a predictor of the mean"
+)
+@click.option(
+    "--requests-file",
+    default="predict_requests.jsonl",
+    help="JSON lines of feature records replayed against the local batching server on `predict`"
+)
+@click.option(
+    "--model-uri",
+    default=None,
+    help="MLflow model URI to serve; defaults to the model of the running MLflow deployment"
+)
+@click.option("--concurrency", default=32, help="Concurrent client connections during the replay")
+@click.option("--max-batch-size", default=256, help="Largest micro-batch scored in one predict call")
+@click.option("--max-latency-ms", default=5.0, help="Longest time a request waits for its micro-batch to fill")
+@click.option("--cache-size", default=100_000, help="Predictions cached by feature vector; 0 disables the cache")
+@click.option("--service-workers", default=3, help="Workers of the MLflow deployment service started by `deploy`")
+@click.option("--min-workers", default=1, help="`serve` processes kept at no load")
+@click.option("--max-workers", default=os.cpu_count() or 1, help="`serve` processes allowed at peak load")
+@click.option("--timeout", default=60, help="Seconds to wait for the MLflow deployment service to start or stop")
+@click.option("--port", default=8001, help="Port of the `serve` workers")
+@click.option(
+    "--data-path",
+    default="/home/muhammadumerkhan/MLOps-Project/data/olist_customers_dataset.csv",
+    help="Merged Olist CSV, or a directory of the raw Olist tables, to train on"
+)
+@click.option(
+    "--force-deploy",
+    is_flag=True,
+    help="Deploy the trained model even when the R² lower bound or drift gate rejects it; unchanged data "
+         "is still not retrained unless `--always-retrain` is also passed"
+)
+@click.option(
+    "--skip-if-no-drift/--always-retrain",
+    default=True,
+    help="Skip retraining when the data has not drifted since the last training run (default)"
 )
-def run_deployment(config: str, min_accuracy: float):
+def run_deployment(config: str, min_accuracy: float, requests_file: str, model_uri: str,
+                   concurrency: int, max_batch_size: int, max_latency_ms: float, cache_size: int,
+                   service_workers: int, min_workers: int, max_workers: int, timeout: int, port: int,
+                   data_path: str, force_deploy: bool, skip_if_no_drift: bool):
     """Runs the deployment pipeline based on the given configuration."""
     
-    mlflow_model_deployer_component = MLFlowModelDeployer.get_active_model_deployer()
     deploy = config == DEPLOY or config == DEPLOY_AND_PREDICT
     predict = config == PREDICT or config == DEPLOY_AND_PREDICT
+
+    if config == SERVE:
+        serve(model_uri, port, min_workers, max_workers, max_batch_size, max_latency_ms, cache_size)
+        return
+
+    if predict and not deploy and model_uri is not None and os.path.exists(requests_file):
+        # Lightweight path: no stack lookup is needed to serve a given model
+        replay_requests(requests_file, model_uri, concurrency, max_batch_size, max_latency_ms, cache_size)
+        return
+
+    from steps.stack import model_deployer
+    from zenml.integrations.mlflow.mlflow_utils import get_tracking_uri
+    from zenml.integrations.mlflow.services import MLFlowDeploymentService
+
+    mlflow_model_deployer_component = model_deployer()
     
     if deploy:
-        continous_deployment_pipeline(
-            data_path="/home/muhammadumerkhan/MLOps-Project/data/olist_customers_dataset.csv",
-            min_accuracy=min_accuracy,
-            workers=3,
-            timeout=60
-        )
+        from pipelines.deployment_pipeline import continous_deployment_pipeline
+
+        if skip_if_no_drift and not data_drifted(data_path):
+            print("No drift since the last training run; skipping retraining. Pass `--always-retrain` to retrain.")
+        else:
+            continous_deployment_pipeline(
+                data_path=data_path,
+                min_accuracy=min_accuracy,
+                workers=service_workers,
+                timeout=timeout,
+                force_deploy=force_deploy,
+            )
 
     if predict:
         print(
@@ -43,6 +108,10 @@ def run_deployment(config: str, min_accuracy: float):
             f"[italic green]    mlflow ui --backend-store-uri '{get_tracking_uri()}'"
             "[/italic green]\n ...to inspect your experiment runs within the MLflow UI.\n"
         )
+        if os.path.exists(requests_file):
+            replay_requests(requests_file, model_uri, concurrency, max_batch_size, max_latency_ms, cache_size)
+        else:
+            print(f"No requests file at {requests_file}; pass `--requests-file` to replay predictions.")
         
     # Fetch existing services with the same pipeline name, step name, and model name
     existing_services = mlflow_model_deployer_component.find_model_server(
@@ -71,5 +140,79 @@ def run_deployment(config: str, min_accuracy: float):
             "No MLflow prediction server is running. Run the deployment pipeline first with `--config deploy`."
         )
 
+def data_drifted(data_path):
+    """Runs the drift check pipeline and returns whether the data drifted; True when the run is not available."""
+    from pipelines.deployment_pipeline import drift_check_pipeline
+
+    run = drift_check_pipeline(data_path=data_path)
+    if run is None:
+        return True
+    return bool(run.steps["check_drift"].outputs["drift_detected"][0].load())
+
+def deployed_model_uri():
+    """Returns the model URI of the running MLflow deployment, or None."""
+    from steps.stack import model_deployer
+    from zenml.integrations.mlflow.services import MLFlowDeploymentService
+
+    services = model_deployer().find_model_server(
+        pipeline_name="continuous_deployment_pipeline",
+        pipeline_step_name="mlflow_model_deployer_step",
+        model_name="model",
+    )
+    return cast(MLFlowDeploymentService, services[0]).config.model_uri if services else None
+
+def serve(model_uri, port, min_workers, max_workers, max_batch_size, max_latency_ms, cache_size):
+    """Serves the model from worker processes scaled between `min_workers` and `max_workers` until interrupted."""
+    import time
+    from src.autoscaler import ScalingPolicy, WorkerSupervisor
+
+    model_uri = model_uri or deployed_model_uri()
+    if model_uri is None:
+        print("No deployed model found; pass `--model-uri` to choose one.")
+        return
+    supervisor = WorkerSupervisor(
+        model_uri, host="0.0.0.0", port=port,
+        policy=ScalingPolicy(min_workers=min_workers, max_workers=max_workers),
+        max_batch_size=max_batch_size, max_latency_ms=max_latency_ms, cache_size=cache_size,
+    )
+    try:
+        supervisor.start()
+    except ValueError as e:
+        print(e)
+        return
+    print(f"Serving {model_uri} at http://localhost:{supervisor.port}/invocations "
+          f"with {min_workers}-{supervisor.policy.max_workers} workers; Ctrl-C to stop.")
+    try:
+        while not supervisor.failed:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        supervisor.stop()
+    if supervisor.failed:
+        print(f"Model server workers kept crashing; check that {model_uri} can still be loaded.")
+
+def replay_requests(requests_file, model_uri, concurrency, max_batch_size, max_latency_ms, cache_size=0):
+    """Replays a JSON lines file through the local micro-batching server and prints latency/throughput."""
+    model_uri = model_uri or deployed_model_uri()
+    if model_uri is None:
+        print("No deployed model found; pass `--model-uri` to choose one.")
+        return
+
+    records = read_requests(requests_file)
+    stats = asyncio.run(serve_and_replay(
+        load_model(model_uri), records, concurrency=concurrency,
+        max_batch_size=max_batch_size, max_latency_ms=max_latency_ms,
+        cache=PredictionCache(cache_size) if cache_size > 0 else None,
+    ))
+    print(
+        f"Replayed {stats['requests']} requests from {requests_file} in {stats['seconds']}s: "
+        f"{stats['requests_per_second']} req/s, p50 {stats['p50_ms']} ms, p99 {stats['p99_ms']} ms, "
+        f"mean batch {stats['mean_batch_size']}, errors {stats['errors']}"
+    )
+    if stats["cache"]:
+        print(f"Prediction cache: hit rate {stats['cache']['hit_rate']}, "
+              f"mean lookup {stats['cache']['mean_lookup_us']} us")
+
 if __name__ == "__main__":
     run_deployment()
@@ -0,0 +1,317 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional
+
+import numpy as np
+
+# Slots of the shared array through which a worker reports to the supervisor
+READY, IN_FLIGHT, REQUESTS, LATENCY_S = range(4)
+REPORT_INTERVAL_S = 0.1
+
+
+def _serve_worker(model_uri: str, host: str, port: int, server_options: dict, drain_timeout_s: float, report):
+    """
+    Runs one InferenceServer process on the shared port until it receives SIGTERM.
+    """
+    from src.inference_server import InferenceServer, feature_names, load_model
+    from src.prediction_cache import PredictionCache
+
+    # Ctrl-C reaches the whole process group; the supervisor decides when workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(level=logging.INFO)
+    model = load_model(model_uri)
+    # The first predict call pays for lazy imports and allocations; do it
+    # before joining the port so no client request does.
+    model.predict(np.zeros((1, len(feature_names(model)))))
+
+    options = dict(server_options)
+    cache_size = options.pop("cache_size", 0)
+    cache = PredictionCache(cache_size) if cache_size > 0 else None
+
+    async def main():
+        server = InferenceServer(model, host, port, cache=cache, reuse_port=True, **options)
+        await server.start()
+        stop = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+        report[READY] = 1.0
+        while not stop.is_set():
+            report[IN_FLIGHT] = server.in_flight
+            report[REQUESTS] = server.completed
+            report[LATENCY_S] = server.latency_s
+            try:
+                await asyncio.wait_for(stop.wait(), REPORT_INTERVAL_S)
+            except asyncio.TimeoutError:
+                pass
+        report[READY] = 0.0
+        await server.drain(drain_timeout_s)
+
+    asyncio.run(main())
+
+
+class ScalingPolicy:
+    """
+    This class decides how many server processes are needed from queue depth and latency.
+
+    Load is the number of requests being answered per worker, smoothed over
+    polls. Above ``target_in_flight`` per worker, or above ``max_latency_ms``,
+    one worker is added; below ``scale_down_ratio`` of both, one is removed.
+    A change is only made ``cooldown_s`` after the previous one, so a new
+    worker has time to take load before the next decision.
+    """
+    def __init__(self, min_workers: int = 1, max_workers: Optional[int] = None, target_in_flight: float = 8.0,
+                 max_latency_ms: float = 50.0, scale_down_ratio: float = 0.3, cooldown_s: float = 5.0,
+                 smoothing: float = 0.5):
+        """
+        Args:
+            min_workers (int): Workers kept at no load
+            max_workers (int, optional): Upper bound; defaults to the CPU count
+            target_in_flight (float): Concurrent requests one worker should handle
+            max_latency_ms (float): Mean request latency that triggers a scale-up
+            scale_down_ratio (float): Fraction of both targets under which a worker is removed
+            cooldown_s (float): Minimum seconds between two changes
+            smoothing (float): Weight of the newest sample in the moving average
+        """
+        self.min_workers = min_workers
+        self.max_workers = max(max_workers or os.cpu_count() or 1, min_workers)
+        self.target_in_flight = target_in_flight
+        self.max_latency_ms = max_latency_ms
+        self.scale_down_ratio = scale_down_ratio
+        self.cooldown_s = cooldown_s
+        self.smoothing = smoothing
+
+    def desired_workers(self, workers: int, in_flight: float, latency_ms: float) -> int:
+        """
+        Returns the worker count for the observed load, one step from ``workers`` at most.
+        """
+        per_worker = in_flight / max(workers, 1)
+        if per_worker > self.target_in_flight or latency_ms > self.max_latency_ms:
+            return min(workers + 1, self.max_workers)
+        if (per_worker < self.target_in_flight * self.scale_down_ratio
+                and latency_ms < self.max_latency_ms * self.scale_down_ratio):
+            return max(workers - 1, self.min_workers)
+        return max(min(workers, self.max_workers), self.min_workers)
+
+
+class _Worker:
+    def __init__(self, process, report):
+        self.process = process
+        self.report = report
+        self.requests = 0.0
+        self.latency_s = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self.report[READY] > 0
+
+
+class WorkerSupervisor:
+    """
+    This class runs InferenceServer processes on one port and scales their number with the load.
+
+    Workers share the port with SO_REUSEPORT, so the kernel spreads new
+    connections across them. A new worker loads and warms up the model before
+    it binds the port, so scaling up never exposes a cold model; a retired
+    worker drains (see ``InferenceServer.drain``) before it exits. Crashed
+    workers are replaced after an exponential backoff; after ``max_restarts``
+    crashes in a row (e.g. the model can no longer be loaded) the supervisor
+    logs an error, sets ``failed`` and stops scaling. ``history`` keeps the
+    samples of the last ``policy.cooldown_s``, one per poll.
+
+    Workers score the raw feature array, so segmented models, which also need
+    their segment column, are refused by ``start``.
+    """
+    def __init__(self, model_uri: str, host: str = "127.0.0.1", port: int = 8001,
+                 policy: Optional[ScalingPolicy] = None, poll_interval_s: float = 0.5,
+                 drain_timeout_s: float = 30.0, max_restarts: int = 5, restart_backoff_s: float = 1.0,
+                 **server_options):
+        """
+        Args:
+            model_uri (str): Model served by every worker, see ``inference_server.load_model``
+            host (str): Interface to bind
+            port (int): Port shared by the workers; 0 picks a free port
+            policy (ScalingPolicy, optional): Scaling bounds and thresholds
+            poll_interval_s (float): Seconds between two load samples
+            drain_timeout_s (float): Longest time a retired worker keeps its open connections
+            max_restarts (int): Crashes in a row after which crashed workers are no longer replaced
+            restart_backoff_s (float): Delay before replacing the first crashed worker; doubles per crash
+            **server_options: ``max_batch_size``, ``max_latency_ms`` and ``cache_size`` of each worker
+        """
+        self.model_uri = model_uri
+        self.host = host
+        self.port = port or self._free_port(host)
+        self.policy = policy or ScalingPolicy()
+        self.poll_interval_s = poll_interval_s
+        self.drain_timeout_s = drain_timeout_s
+        self.max_restarts = max_restarts
+        self.restart_backoff_s = restart_backoff_s
+        self.server_options = server_options
+        self.failed = False
+        self.history: Deque[dict] = deque(maxlen=max(int(self.policy.cooldown_s / poll_interval_s), 1) + 1)
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: List[_Worker] = []
+        self._retiring: List[_Worker] = []
+        self._in_flight = 0.0
+        self._last_change = 0.0
+        self._last_poll = 0.0
+        self._crashes = 0
+        self._pending_restarts = 0
+        self._restart_at = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _free_port(host: str) -> int:
+        with socket.socket() as sock:
+            sock.bind((host, 0))
+            return sock.getsockname()[1]
+
+    @property
+    def workers(self) -> int:
+        return len(self._workers)
+
+    def __enter__(self) -> "WorkerSupervisor":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self, ready_timeout_s: float = 120.0):
+        """
+        Starts ``min_workers`` workers, waits until they serve, and starts scaling in the background.
+
+        Raises:
+            ValueError: If the model is segmented
+        """
+        self._check_servable()
+        for _ in range(self.policy.min_workers):
+            self._spawn()
+        deadline = time.monotonic() + ready_timeout_s
+        while not all(worker.ready for worker in self._workers):
+            if time.monotonic() > deadline or any(not w.process.is_alive() for w in self._workers):
+                self.stop()
+                raise RuntimeError(f"Model server workers did not start serving {self.model_uri}")
+            time.sleep(0.05)
+        logging.info(f"Serving on http://{self.host}:{self.port}/invocations with {self.workers} worker(s)")
+        self._last_change = self._last_poll = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="worker-supervisor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Drains and stops every worker.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        while self._workers:
+            self._retire()
+        for worker in self._retiring:
+            worker.process.join(self.drain_timeout_s + 5.0)
+            if worker.process.is_alive():
+                worker.process.kill()
+        self._retiring = []
+
+    def poll(self) -> dict:
+        """
+        Samples the workers' load, adds or retires a worker if needed and returns the sample.
+        """
+        now = time.monotonic()
+        self._retiring = [worker for worker in self._retiring if worker.process.is_alive()]
+        for worker in [w for w in self._workers if not w.process.is_alive()]:
+            self._workers.remove(worker)
+            self._crashes += 1
+            if self._crashes > self.max_restarts:
+                logging.error(f"Model server worker {worker.process.pid} exited; {self._crashes} crashes in a "
+                              f"row, giving up on replacing workers of {self.model_uri}")
+                self.failed = True
+                self._stop.set()
+                continue
+            delay = self.restart_backoff_s * 2 ** (self._crashes - 1)
+            logging.warning(f"Model server worker {worker.process.pid} exited; replacing it in {delay:.1f}s")
+            self._pending_restarts += 1
+            self._restart_at = now + delay
+        if self.failed:
+            self._pending_restarts = 0
+        elif self._pending_restarts and now >= self._restart_at:
+            for _ in range(self._pending_restarts):
+                self._spawn()
+            self._pending_restarts = 0
+
+        ready = [worker for worker in self._workers if worker.ready]
+        if ready and len(ready) == self.workers and not self._pending_restarts:
+            # Every worker came up, so the next crash starts a new series
+            self._crashes = 0
+        in_flight = sum(worker.report[IN_FLIGHT] for worker in ready)
+        requests = latency_s = 0.0
+        for worker in ready:
+            requests += worker.report[REQUESTS] - worker.requests
+            latency_s += worker.report[LATENCY_S] - worker.latency_s
+            worker.requests, worker.latency_s = worker.report[REQUESTS], worker.report[LATENCY_S]
+        latency_ms = latency_s / requests * 1000.0 if requests else 0.0
+        alpha = self.policy.smoothing
+        self._in_flight = alpha * in_flight + (1 - alpha) * self._in_flight
+
+        elapsed, self._last_poll = now - self._last_poll, now
+        # Workers still warming up count as capacity, so one burst adds one worker at a time
+        desired = self.policy.desired_workers(self.workers, self._in_flight, latency_ms)
+        # Crashed workers are replaced above, after their backoff, not by the policy
+        scalable = not self.failed and not self._pending_restarts
+        if scalable and desired != self.workers and now - self._last_change >= self.policy.cooldown_s:
+            if desired > self.workers:
+                self._spawn()
+            else:
+                self._retire()
+            self._last_change = now
+        sample = {
+            "time": now,
+            "workers": self.workers,
+            "ready": len(ready),
+            "in_flight": round(self._in_flight, 2),
+            "requests_per_second": round(requests / elapsed, 1) if elapsed > 0 else 0.0,
+            "latency_ms": round(latency_ms, 3),
+        }
+        self.history.append(sample)
+        return sample
+
+    def _check_servable(self):
+        from src.inference_server import load_model
+        from src.linear_artifact import is_segmented_pipeline
+
+        model = load_model(self.model_uri)
+        if getattr(model, "segment_column", None) is not None or is_segmented_pipeline(model):
+            raise ValueError(f"{self.model_uri} is a segmented model, which the worker processes cannot serve "
+                             "without its segment column; deploy it with `--config deploy` instead")
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval_s):
+            try:
+                self.poll()
+            except Exception as e:
+                logging.error(f"Worker supervisor poll failed: {e}")
+
+    def _spawn(self):
+        report = self._context.Array("d", 4, lock=False)
+        process = self._context.Process(
+            target=_serve_worker,
+            args=(self.model_uri, self.host, self.port, self.server_options, self.drain_timeout_s, report),
+            daemon=True,
+        )
+        process.start()
+        self._workers.append(_Worker(process, report))
+        logging.info(f"Started model server worker {process.pid} ({self.workers} total)")
+
+    def _retire(self):
+        # The newest worker goes first; it holds the fewest long-lived connections
+        worker = self._workers.pop()
+        if worker.process.is_alive():
+            os.kill(worker.process.pid, signal.SIGTERM)
+        self._retiring.append(worker)
+        logging.info(f"Draining model server worker {worker.process.pid} ({self.workers} left)")
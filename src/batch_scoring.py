@@ -0,0 +1,167 @@
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+from src.data_cleanner import COLUMN_DTYPES
+
+DEFAULT_CHUNKSIZE = 200_000
+PREDICTION_COLUMN = "prediction"
+# Directory value of rows whose partition column is null
+NULL_PARTITION = "__null__"
+
+# Set in each worker by _init_worker, so the model is loaded once per process
+_worker_model = None
+
+
+def _init_worker(model_path: str):
+    global _worker_model
+    from src.inference_server import load_model
+
+    _worker_model = load_model(model_path)
+
+
+def _score_chunk(chunk: pd.DataFrame, chunk_id: int, first_row: int, output_dir: str,
+                 keep_columns: List[str], partition_by: Optional[str]) -> int:
+    """
+    Scores one chunk in a worker and writes it as its own Parquet file(s).
+
+    Returns:
+        int: Rows written
+    """
+    out = chunk[keep_columns].reset_index(drop=True)
+    out.insert(0, "row", pd.RangeIndex(first_row, first_row + len(chunk)))
+    out[PREDICTION_COLUMN] = _worker_model.predict(chunk)
+
+    basename = f"part-{chunk_id:05d}.parquet"
+    if partition_by is None:
+        out.to_parquet(os.path.join(output_dir, basename), index=False)
+    else:
+        for value, part in out.groupby(partition_by, sort=False, observed=True, dropna=False):
+            part_dir = os.path.join(output_dir, f"{partition_by}={NULL_PARTITION if pd.isna(value) else value}")
+            os.makedirs(part_dir, exist_ok=True)
+            part.drop(columns=partition_by).to_parquet(os.path.join(part_dir, basename), index=False)
+    return len(out)
+
+
+class BatchScorer:
+    """
+    This class scores a large CSV or Parquet file offline with a pool of processes.
+
+    The input is streamed in chunks that hold only the model's features plus the
+    requested pass-through columns. Each worker loads the model once and writes
+    its chunks' predictions straight to Parquet; at most ``max_pending`` chunks
+    are in flight, so memory stays bounded whatever the input size.
+    """
+    def __init__(
+        self,
+        model_path: str,
+        n_workers: Optional[int] = None,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        keep_columns: Optional[List[str]] = None,
+        partition_by: Optional[str] = None,
+        max_pending: Optional[int] = None,
+    ):
+        """
+        Args:
+            model_path (str): Local model directory accepted by ``inference_server.load_model``
+            n_workers (int, optional): Scoring processes; defaults to the CPU count
+            chunksize (int): Rows per chunk
+            keep_columns (List[str], optional): Input columns copied next to the predictions
+            partition_by (str, optional): Column whose values become ``<column>=<value>`` directories;
+                null values go to ``<column>=__null__``
+            max_pending (int, optional): Chunks read ahead of the workers; defaults to 2 per worker
+        """
+        self.model_path = model_path
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.keep_columns = list(keep_columns or [])
+        self.partition_by = partition_by
+        if partition_by is not None and partition_by not in self.keep_columns:
+            self.keep_columns.append(partition_by)
+        self.max_pending = max_pending or 2 * self.n_workers
+
+    def iter_chunks(self, data_path: str, columns: List[str]) -> Iterator[pd.DataFrame]:
+        """
+        Streams the requested columns of a CSV or Parquet file.
+        """
+        if data_path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(data_path).iter_batches(batch_size=self.chunksize, columns=columns):
+                yield batch.to_pandas()
+            return
+
+        dtypes = {c: COLUMN_DTYPES[c] for c in columns if c in COLUMN_DTYPES}
+        with pd.read_csv(data_path, usecols=columns, dtype=dtypes, chunksize=self.chunksize) as reader:
+            yield from reader
+
+    def score(self, data_path: str, output_dir: str, features: Optional[List[str]] = None,
+              overwrite: bool = False) -> dict:
+        """
+        Scores every row of ``data_path`` into ``output_dir``.
+
+        Args:
+            data_path (str): CSV or Parquet input with at least the model's feature columns
+            output_dir (str): Directory receiving one Parquet file per chunk (and partition)
+            features (List[str], optional): Feature columns to read; defaults to the ones
+                recorded in the model
+            overwrite (bool): Delete a non-empty ``output_dir`` first instead of refusing it,
+                so part files of an earlier run are never mixed in
+        Returns:
+            dict: rows, chunks, seconds, workers, rows_per_second and rows_per_second_per_core
+        """
+        if os.path.isdir(output_dir) and os.listdir(output_dir):
+            if not overwrite:
+                raise FileExistsError(f"{output_dir} is not empty; pass overwrite=True to replace it")
+            shutil.rmtree(output_dir)
+        if features is None:
+            from src.inference_server import feature_names, load_model
+
+            features = feature_names(load_model(self.model_path))
+        columns = list(dict.fromkeys(features + self.keep_columns))
+        os.makedirs(output_dir, exist_ok=True)
+
+        rows = chunks = offset = 0
+        start = time.perf_counter()
+        with ProcessPoolExecutor(self.n_workers, initializer=_init_worker, initargs=(self.model_path,)) as pool:
+            pending = set()
+            for chunk in self.iter_chunks(data_path, columns):
+                if len(pending) >= self.max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    rows += sum(f.result() for f in done)
+                pending.add(pool.submit(
+                    _score_chunk, chunk, chunks, offset, output_dir, self.keep_columns, self.partition_by,
+                ))
+                chunks += 1
+                offset += len(chunk)
+            rows += sum(f.result() for f in wait(pending).done)
+        elapsed = time.perf_counter() - start
+
+        stats = {
+            "rows": rows,
+            "chunks": chunks,
+            "seconds": round(elapsed, 3),
+            "workers": self.n_workers,
+            "rows_per_second": round(rows / elapsed, 1) if elapsed else 0.0,
+            "rows_per_second_per_core": round(rows / elapsed / self.n_workers, 1) if elapsed else 0.0,
+        }
+        logging.info(f"Batch scoring of {data_path} into {output_dir}: {stats}")
+        return stats
+
+
+def resolve_model_path(model_uri: str) -> str:
+    """
+    Returns a local directory for an MLflow model URI, downloading it once so
+    that the workers do not each fetch it.
+    """
+    if os.path.isdir(model_uri):
+        return model_uri
+    import mlflow.artifacts
+
+    return mlflow.artifacts.download_artifacts(model_uri)
+
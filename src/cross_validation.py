@@ -0,0 +1,131 @@
+import logging
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.model_dev import get_model
+from src.model_evaluator import RegressionMetrics
+from src.model_selection import SharedArrays
+
+
+def _take(array: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """
+    Returns the rows at sorted positions ``idx``: a view when they form one range, else a copy.
+    """
+    if len(idx) and idx[-1] - idx[0] + 1 == len(idx):
+        return array[idx[0]:idx[-1] + 1]
+    return array[idx]
+
+
+def _fill_nulls(X_train: np.ndarray, X_test: np.ndarray, columns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fills nulls in ``columns`` with the medians of the fold's training rows only.
+
+    A block is copied only when it has nulls to fill, so null-free folds stay views.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-null columns stay null, as in PreProcessTransformer
+        medians = np.nanmedian(X_train[:, columns], axis=0)
+    filled = []
+    for block in (X_train, X_test):
+        rows, cols = np.nonzero(np.isnan(block[:, columns]))
+        if rows.size:
+            block = block.copy()
+            block[rows, columns[cols]] = medians[cols]
+        filled.append(block)
+    return filled[0], filled[1]
+
+
+def _fit_fold(model_name: str, specs: dict, train_idx: np.ndarray, test_idx: np.ndarray,
+              model_kwargs: dict, fill_columns: np.ndarray) -> Dict[str, float]:
+    arrays, blocks = SharedArrays.attach(specs)
+    try:
+        X, y = arrays["X"], arrays["y"]
+        X_train, X_test = _take(X, train_idx), _take(X, test_idx)
+        if fill_columns.size:
+            X_train, X_test = _fill_nulls(X_train, X_test, fill_columns)
+        model = get_model(model_name).train(X_train, _take(y, train_idx), **model_kwargs)
+        return RegressionMetrics().calculate_scores(_take(y, test_idx), model.predict(X_test))
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+
+
+class CrossValidator:
+    """
+    This class fits a registered model on every fold concurrently and summarises the scores.
+
+    The feature matrix and labels are placed in shared memory once; workers
+    receive only the fold's index arrays and map the matrix read-only. Folds
+    whose rows form one range (time-ordered folds over rows sorted by time) are
+    read as views of it; other folds, such as shuffled k-fold, are gathered into
+    a per-worker copy of their training rows. Nulls in ``fill_columns`` are
+    filled inside every fold with the medians of its training rows, so no
+    statistic of a test fold leaks into its training data; a fold with nulls
+    to fill works on a copy.
+    """
+    def __init__(
+        self,
+        model_name: str = "LinearRegression",
+        n_workers: Optional[int] = None,
+        threads_per_worker: int = 1,
+        model_params: Optional[dict] = None,
+        fill_columns: Optional[Sequence[int]] = None,
+    ):
+        """
+        Args:
+            model_name (str): Name from MODEL_REGISTRY to fit
+            n_workers (int, optional): Worker processes; defaults to the CPU count
+            threads_per_worker (int): ``n_jobs`` passed to each model, to avoid
+                oversubscribing cores
+            model_params (dict, optional): Keyword arguments for the model
+            fill_columns (Sequence[int], optional): Positions of the columns whose
+                nulls are filled with the training fold's medians
+        """
+        self.model_name = model_name
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.threads_per_worker = threads_per_worker
+        self.model_params = model_params or {}
+        self.fill_columns = np.asarray(fill_columns if fill_columns is not None else [], dtype=np.intp)
+
+    def evaluate(self, X, y, folds: List[Tuple[np.ndarray, np.ndarray]]) -> Dict[str, Dict[str, float]]:
+        """
+        Fit and score every fold.
+
+        Args:
+            X (np.ndarray): Feature matrix of all rows, nulls as NaN
+            y (np.ndarray): Labels of all rows
+            folds (List[Tuple[np.ndarray, np.ndarray]]): (train, test) indices, e.g. from IndexSplitStrategy
+
+        Returns:
+            Dict[str, Dict[str, float]]: ``mean`` and ``std`` of every metric across folds
+        """
+        try:
+            model_kwargs = {"n_jobs": self.threads_per_worker, **self.model_params}
+            with SharedArrays(
+                X=np.asarray(X, dtype=np.float64),
+                y=np.asarray(y, dtype=np.float64).ravel(),
+            ) as shared:
+                with ProcessPoolExecutor(max_workers=min(self.n_workers, len(folds))) as pool:
+                    futures = [
+                        pool.submit(_fit_fold, self.model_name, shared.specs, train_idx, test_idx, model_kwargs,
+                                    self.fill_columns)
+                        for train_idx, test_idx in folds
+                    ]
+                    results = [future.result() for future in futures]
+
+            names = list(results[0])
+            scores = np.array([[result[name] for name in names] for result in results])
+            summary = {
+                "mean": dict(zip(names, scores.mean(axis=0).tolist())),
+                "std": dict(zip(names, scores.std(axis=0, ddof=1 if len(results) > 1 else 0).tolist())),
+            }
+            logging.info(f"{self.model_name} cross-validation over {len(folds)} folds: {summary}")
+            return summary
+        except Exception as e:
+            logging.error(f"Error occurred during cross-validation: {str(e)}")
+            raise e
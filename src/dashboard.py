@@ -0,0 +1,124 @@
+import json
+import os
+import time
+import warnings
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data_cleanner import COLUMN_DTYPES
+
+# Written by the deployment pipeline for the model it deploys and read by streamlit_app.py
+AGGREGATES_PATH = "artifacts/dashboard_aggregates.json"
+PREDICTION_BINS = 20
+
+
+def segment_column_of(model) -> Optional[str]:
+    """
+    Returns the raw column a segmented model routes rows by, or None.
+    """
+    final = model.steps[-1][1] if hasattr(model, "steps") else model
+    return getattr(final, "segment_column", None)
+
+
+def input_columns(model) -> List[str]:
+    """
+    Returns the raw columns a model needs: its features, plus the segment column of a segmented model.
+    """
+    from src.inference_server import feature_names
+
+    segment_column = segment_column_of(model)
+    return feature_names(model) + ([segment_column] if segment_column else [])
+
+
+def build_aggregates(model, X_test: pd.DataFrame, y_test: pd.Series, segment_column: Optional[str] = None) -> dict:
+    """
+    Computes everything the dashboard displays, so the app never touches the dataset.
+
+    Args:
+        model: Fitted model, e.g. the output of train_model
+        X_test (pd.DataFrame): Testing data
+        y_test (pd.Series): Testing labels
+        segment_column (str, optional): Column of X_test to break the metrics down by
+    Returns:
+        dict: Overall and per-segment metrics, the prediction histogram, the
+            label distribution and per-feature input ranges
+    """
+    from src.model_evaluator import RegressionMetrics
+
+    y_true = y_test.to_numpy(dtype=np.float64)
+    prediction = np.asarray(model.predict(X_test), dtype=np.float64)
+    segments = None if segment_column is None else np.asarray(X_test[segment_column], dtype=str)
+    scores = RegressionMetrics().calculate_scores(y_true, prediction, segments)
+
+    counts, edges = np.histogram(prediction[np.isfinite(prediction)], bins=PREDICTION_BINS)
+    labels, label_counts = np.unique(y_true, return_counts=True)
+    columns = input_columns(model)
+    numeric = [c for c in columns if c != segment_column and c in X_test.columns]
+    values = X_test[numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+    with warnings.catch_warnings():
+        # All-null columns get NaN ranges
+        warnings.simplefilter("ignore", RuntimeWarning)
+        low, median, high = np.nanquantile(values, [0.0, 0.5, 1.0], axis=0)
+
+    aggregates = {
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "rows": int(len(y_true)),
+        "metrics": {name: value for name, value in scores.items() if name != "segments"},
+        "segment_column": segment_column,
+        "segments": {},
+        "prediction_histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+        "label_counts": {str(label): int(n) for label, n in zip(labels, label_counts)},
+        "features": {
+            column: {"min": float(low[j]), "median": float(median[j]), "max": float(high[j])}
+            for j, column in enumerate(numeric)
+        },
+    }
+    if segments is not None:
+        segment_labels, segment_rows = np.unique(segments, return_counts=True)
+        rows = dict(zip(segment_labels.tolist(), segment_rows.tolist()))
+        aggregates["segments"] = {
+            label: {"rows": int(rows[label]), **metrics} for label, metrics in scores["segments"].items()
+        }
+    return aggregates
+
+
+def write_aggregates(aggregates: dict, path: str = AGGREGATES_PATH):
+    """
+    Replaces the aggregates file atomically, so a running app never reads half of it.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(aggregates, f)
+    os.replace(tmp_path, path)
+
+
+def load_aggregates(path: str = AGGREGATES_PATH) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def read_batch(file, columns: List[str]) -> pd.DataFrame:
+    """
+    Reads an uploaded CSV, parsing only the model's columns with the compact dtypes.
+    """
+    wanted = set(columns)
+    dtypes = {c: COLUMN_DTYPES[c] for c in columns if c in COLUMN_DTYPES}
+    return pd.read_csv(file, usecols=lambda c: c in wanted, dtype=dtypes)
+
+
+def score_batch(model, batch: pd.DataFrame) -> np.ndarray:
+    """
+    Scores a batch of raw rows in one predict call.
+
+    Raises:
+        ValueError: When columns the model needs are missing
+    """
+    missing = [c for c in input_columns(model) if c not in batch.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {missing}")
+    return np.asarray(model.predict(batch), dtype=np.float64)
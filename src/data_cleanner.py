@@ -1,9 +1,92 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import Union
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
+from sklearn.base import BaseEstimator, TransformerMixin
+from src.quantile_sketch import QuantileSketch
+from src.profiling import profiled
+
+# Columns DataPreProcessStrategy removes before selecting the numeric features.
+DATE_COLUMNS = [
+    "order_approved_at",
+    "order_delivered_carrier_date",
+    "order_delivered_customer_date",
+    "order_estimated_delivery_date",
+    "order_purchase_timestamp",
+]
+# Products without a category also lack name, description and photo counts;
+# LinearRegression rejects the resulting nulls, so they are filled as well.
+MEDIAN_FILL_COLUMNS = [
+    "product_name_lenght",
+    "product_description_lenght",
+    "product_photos_qty",
+    "product_weight_g",
+    "product_length_cm",
+    "product_height_cm",
+    "product_width_cm",
+]
+ID_COLUMNS = ["customer_zip_code_prefix", "order_item_id"]
+
+# Timestamp IndexSplitStrategy orders rows by for time-ordered folds
+TIME_COLUMN = "order_purchase_timestamp"
+
+# Columns that survive preprocessing: the model features plus the target.
+TARGET_COLUMN = "review_score"
+FEATURE_COLUMNS = [
+    "payment_sequential",
+    "payment_installments",
+    "payment_value",
+    "price",
+    "freight_value",
+    "product_name_lenght",
+    "product_description_lenght",
+    "product_photos_qty",
+    "product_weight_g",
+    "product_length_cm",
+    "product_height_cm",
+    "product_width_cm",
+]
+
+# Compact dtypes used when reading the raw data. Integer-valued columns are
+# parsed as float32 (they may contain nulls) and narrowed once nulls are known.
+COLUMN_DTYPES = {
+    **{column: "float32" for column in FEATURE_COLUMNS},
+    TARGET_COLUMN: "float32",
+    "order_item_id": "float32",
+    "customer_zip_code_prefix": "float32",
+    "customer_state": "category",
+    "product_category_name": "category",
+}
+INTEGER_COLUMNS = [
+    "payment_sequential",
+    "payment_installments",
+    "product_photos_qty",
+    TARGET_COLUMN,
+    "order_item_id",
+]
+
+
+def narrow_integers(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts the INTEGER_COLUMNS of a frame read with COLUMN_DTYPES to int16 when they contain no nulls.
+    """
+    for column in INTEGER_COLUMNS:
+        if column in df.columns and not df[column].isna().any():
+            df[column] = df[column].astype("int16")
+    return df
+
+
+def numeric_feature_columns(dtypes: pd.Series) -> List[str]:
+    """
+    Returns the columns DataPreProcessStrategy keeps, given a frame's dtypes.
+    """
+    dropped = set(DATE_COLUMNS) | set(ID_COLUMNS)
+    return [
+        column for column, dtype in dtypes.items()
+        if column not in dropped and pd.api.types.is_numeric_dtype(dtype)
+        and not pd.api.types.is_bool_dtype(dtype)
+    ]
 
 
 class DataStrategy(ABC):
@@ -18,38 +101,181 @@ class DataPreProcessStrategy(DataStrategy):
     """
     This class handles data preprocessing by dropping unnecessary columns, filling missing values, and converting categorical variables to numerical ones.
     """
+    def __init__(self, keep_columns: Optional[List[str]] = None):
+        """
+        Args:
+            keep_columns (List[str], optional): Non-numeric columns kept as they are, e.g. a segment key
+        """
+        self.keep_columns = list(keep_columns or [])
+
+    @profiled()
     def handle_data(self, data: pd.DataFrame) -> pd.DataFrame:
         try:
-            data = data.drop(
-                [
-                    "order_approved_at",
-                    "order_delivered_carrier_date",
-                    "order_delivered_customer_date",
-                    "order_estimated_delivery_date",
-                    "order_purchase_timestamp",
-                ],
-                axis=1,
-            )
-            data["product_weight_g"].fillna(data["product_weight_g"].median(), inplace=True)
-            data["product_length_cm"].fillna(data["product_length_cm"].median(), inplace=True)
-            data["product_height_cm"].fillna(data["product_height_cm"].median(), inplace=True)
-            data["product_width_cm"].fillna(data["product_width_cm"].median(), inplace=True)
-            # write "No review" in review_comment_message column
-            data["review_comment_message"].fillna("No review", inplace=True)
-
-            data = data.select_dtypes(include=[np.number])
-            cols_to_drop = ["customer_zip_code_prefix", "order_item_id"]
-            data = data.drop(cols_to_drop, axis=1)
+            # Select the surviving numeric columns once instead of dropping and
+            # filtering in several full-frame copies. Text columns such as
+            # review_comment_message never reach the output, so they are not filled.
+            numeric = numeric_feature_columns(data.dtypes)
+            data = data[numeric + [c for c in self.keep_columns if c not in numeric]]
+            data = data.fillna(data[MEDIAN_FILL_COLUMNS].median())
             return data
         except Exception as e:
             logging.error(f"Error occurred during data preprocessing: {str(e)}")
             raise e
 
+class StreamingPreProcessStrategy(DataStrategy):
+    """
+    This class applies the same preprocessing as DataPreProcessStrategy to data that arrives in chunks.
+
+    A first pass over the chunks collects the fill medians with mergeable quantile
+    sketches; a second pass applies the column selection and fills chunk by chunk,
+    so the full dataset never has to fit in memory.
+    """
+    def __init__(self, sketch_size: int = 2048):
+        """
+        Args:
+            sketch_size (int): Capacity of each quantile sketch level
+        """
+        self.sketch_size = sketch_size
+        self.columns: List[str] = []
+        self.medians: Dict[str, float] = {}
+
+    @profiled()
+    def fit(self, chunks: Iterable[pd.DataFrame]) -> "StreamingPreProcessStrategy":
+        """
+        Computes the output columns and fill medians in a single pass.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): Chunks of raw data
+        Returns:
+            self: The fitted strategy
+        """
+        self.columns = []
+        sketches = {column: QuantileSketch(self.sketch_size) for column in MEDIAN_FILL_COLUMNS}
+        for chunk in chunks:
+            if not self.columns:
+                self.columns = numeric_feature_columns(chunk.dtypes)
+            for column, sketch in sketches.items():
+                sketch.update(chunk[column].to_numpy(dtype=np.float64, na_value=np.nan))
+        self.medians = {column: sketch.median() for column, sketch in sketches.items()}
+        return self
+
+    def to_transformer(self, target_column: str = TARGET_COLUMN) -> "PreProcessTransformer":
+        """
+        Returns a PreProcessTransformer holding the fitted columns and medians, without another pass.
+
+        Args:
+            target_column (str): Column excluded from the features
+        Returns:
+            PreProcessTransformer: Transformer to apply per chunk and to log with the model
+        """
+        transformer = PreProcessTransformer(target_column)
+        transformer.feature_names_in_ = np.array([c for c in self.columns if c != target_column], dtype=object)
+        transformer.n_features_in_ = len(transformer.feature_names_in_)
+        transformer.fill_values_ = np.array(
+            [self.medians.get(c, np.nan) for c in transformer.feature_names_in_], dtype=np.float64
+        )
+        return transformer
+
+    def transform(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Applies the column selection and median fills chunk by chunk.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): Chunks of raw data
+        Yields:
+            pd.DataFrame: Numeric batches ready for training
+        """
+        for chunk in chunks:
+            yield chunk[self.columns].fillna(self.medians)
+
+    def handle_data(self, data: Callable[[], Iterable[pd.DataFrame]]) -> Iterator[pd.DataFrame]:
+        """
+        Fits the fill medians and streams the preprocessed chunks.
+
+        Args:
+            data (Callable[[], Iterable[pd.DataFrame]]): Returns a fresh iterator over
+                the raw chunks each time it is called, e.g. ``IngestData.iter_chunks``
+        Returns:
+            Iterator[pd.DataFrame]: Numeric batches ready for training
+        """
+        try:
+            self.fit(data())
+            return self.transform(data())
+        except Exception as e:
+            logging.error(f"Error occurred during streaming data preprocessing: {str(e)}")
+            raise e
+
+class PreProcessTransformer(BaseEstimator, TransformerMixin):
+    """
+    This class is a fitted, serialisable version of DataPreProcessStrategy for inference.
+
+    ``fit`` captures the feature columns and fill medians once; ``transform`` copies
+    those columns into a pre-allocated float64 array and fills nulls with NumPy,
+    so serving never recomputes statistics or re-runs pandas dtype selection.
+    """
+    def __init__(self, target_column: str = TARGET_COLUMN):
+        """
+        Args:
+            target_column (str): Column excluded from the features
+        """
+        self.target_column = target_column
+
+    @profiled()
+    def fit(self, X: pd.DataFrame, y=None) -> "PreProcessTransformer":
+        """
+        Captures the feature columns and their fill values.
+
+        Args:
+            X (pd.DataFrame): Raw or preprocessed data
+            y: Ignored
+        Returns:
+            self: The fitted transformer
+        """
+        self.feature_names_in_ = np.array(
+            [c for c in numeric_feature_columns(X.dtypes) if c != self.target_column], dtype=object
+        )
+        self.n_features_in_ = len(self.feature_names_in_)
+        medians = X[MEDIAN_FILL_COLUMNS].median()
+        # NaN fill values mean "leave as is", matching DataPreProcessStrategy,
+        # which only fills the product columns.
+        self.fill_values_ = np.array(
+            [medians.get(c, np.nan) for c in self.feature_names_in_], dtype=np.float64
+        )
+        return self
+
+    def transform(self, X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        """
+        Selects the feature columns and fills missing values.
+
+        Args:
+            X (Union[pd.DataFrame, np.ndarray]): Data with at least the fitted columns,
+                or an array whose columns are already in ``feature_names_in_`` order
+        Returns:
+            np.ndarray: Float64 feature matrix of shape (n_rows, n_features_in_)
+        """
+        if isinstance(X, pd.DataFrame):
+            out = np.empty((len(X), self.n_features_in_), dtype=np.float64)
+            for j, column in enumerate(self.feature_names_in_):
+                out[:, j] = X[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            out = np.array(X, dtype=np.float64, copy=True, ndmin=2)
+            if out.shape[1] != self.n_features_in_:
+                raise ValueError(
+                    f"Expected {self.n_features_in_} features, got {out.shape[1]}"
+                )
+        rows, cols = np.nonzero(np.isnan(out))
+        out[rows, cols] = self.fill_values_[cols]
+        return out
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        return self.feature_names_in_.copy()
+
 class DataSplitStrategy(DataStrategy):
     """
     This class splits the data into training and testing sets.
     """
     
+    @profiled()
     def handle_data(self, data: pd.DataFrame) -> Union[pd.DataFrame, pd.Series]:
         """
         Splits the data into training and testing sets.
@@ -60,6 +286,8 @@ class DataSplitStrategy(DataStrategy):
         Returns:
             Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]: The training and testing sets.
         """
+        from sklearn.model_selection import train_test_split
+
         try:
             X = data.drop(["review_score"], axis=1)
             y = data["review_score"]
@@ -69,6 +297,75 @@ class DataSplitStrategy(DataStrategy):
             logging.error(f"Error occurred during data splitting: {str(e)}")
             raise e
 
+class IndexSplitStrategy(DataStrategy):
+    """
+    This class produces cross-validation folds as positional index arrays.
+
+    Only indices are produced; callers slice one feature matrix with them. Folds
+    are shuffled k-fold (repeated ``n_repeats`` times with fresh shuffles) or,
+    with ``time_column``, expanding-window folds over the rows sorted by time,
+    where each fold tests on the block that follows its training rows. On data
+    already in ``time_order``, those folds are contiguous ranges.
+    """
+    def __init__(self, n_splits: int = 5, n_repeats: int = 1, time_column: Optional[str] = None,
+                 seed: int = 42):
+        """
+        Args:
+            n_splits (int): Folds per repeat (test blocks, for time-ordered folds)
+            n_repeats (int): Shuffled repeats; must be 1 for time-ordered folds
+            time_column (str, optional): Column to order rows by, e.g. TIME_COLUMN
+            seed (int): Seed of the shuffles
+        """
+        if n_splits < 2:
+            raise ValueError("n_splits must be at least 2")
+        if time_column is not None and n_repeats != 1:
+            raise ValueError("Time-ordered folds cannot be repeated")
+        self.n_splits = n_splits
+        self.n_repeats = n_repeats
+        self.time_column = time_column
+        self.seed = seed
+
+    def time_order(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Returns the positions of the rows sorted by ``time_column``.
+
+        Rows without a timestamp are put first, so they only ever train;
+        ``np.argsort`` alone would put them last, into the final test block.
+        """
+        timestamps = pd.to_datetime(data[self.time_column], errors="coerce").to_numpy()
+        missing = np.isnat(timestamps)
+        dated = np.flatnonzero(~missing)
+        return np.concatenate([np.flatnonzero(missing), dated[np.argsort(timestamps[dated], kind="stable")]])
+
+    def handle_data(self, data: pd.DataFrame) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Builds the folds.
+
+        Args:
+            data (pd.DataFrame): The input data; only its length (and ``time_column``) is used
+        Returns:
+            List[Tuple[np.ndarray, np.ndarray]]: (train, test) positional indices per fold
+        """
+        try:
+            if self.time_column is not None:
+                blocks = np.array_split(self.time_order(data), self.n_splits + 1)
+                return [
+                    (np.sort(np.concatenate(blocks[:k + 1])), np.sort(blocks[k + 1]))
+                    for k in range(self.n_splits)
+                ]
+
+            rng = np.random.default_rng(self.seed)
+            folds = []
+            for _ in range(self.n_repeats):
+                blocks = np.array_split(rng.permutation(len(data)), self.n_splits)
+                for k in range(self.n_splits):
+                    train = np.concatenate(blocks[:k] + blocks[k + 1:])
+                    folds.append((np.sort(train), np.sort(blocks[k])))
+            return folds
+        except Exception as e:
+            logging.error(f"Error occurred during fold generation: {str(e)}")
+            raise e
+
 class DataCleaning:
     """
     This class handles data cleaning by applying different data handling strategies.
@@ -0,0 +1,186 @@
+import json
+import os
+from typing import Callable, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data_cleanner import numeric_feature_columns
+from src.quantile_sketch import QuantileSketch
+
+# Bump when the file written by DriftReference.save changes
+FORMAT = "drift-reference-v1"
+# Proportions are clipped to this before taking logs, so empty bins do not make PSI infinite
+PSI_EPSILON = 1e-4
+
+
+def to_matrix(chunk: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """
+    Copies columns into one (n_rows, n_columns) float64 array, nulls as NaN.
+    """
+    out = np.empty((len(chunk), len(columns)), dtype=np.float64)
+    for j, column in enumerate(columns):
+        out[:, j] = chunk[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    return out
+
+
+def bin_counts(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Histograms every column at once.
+
+    Args:
+        values (np.ndarray): (n_rows, n_columns) values, NaN for nulls
+        edges (np.ndarray): (n_columns, n_bins - 1) inner bin edges per column
+    Returns:
+        np.ndarray: (n_columns, n_bins + 1) counts; bin ``i`` holds values in
+            ``(edges[i - 1], edges[i]]`` and the last bin counts nulls
+    """
+    n_columns, n_edges = edges.shape
+    n_bins = n_edges + 1
+    bins = (values[:, :, None] > edges[None, :, :]).sum(axis=2)
+    bins[np.isnan(values)] = n_bins
+    flat = bins + np.arange(n_columns) * (n_bins + 1)
+    return np.bincount(flat.ravel(), minlength=n_columns * (n_bins + 1)).reshape(n_columns, n_bins + 1)
+
+
+def psi(reference: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """
+    Population stability index per row of two count matrices, nulls included as a bin.
+    """
+    p = np.clip(reference / np.maximum(reference.sum(axis=1, keepdims=True), 1), PSI_EPSILON, None)
+    q = np.clip(current / np.maximum(current.sum(axis=1, keepdims=True), 1), PSI_EPSILON, None)
+    return ((q - p) * np.log(q / p)).sum(axis=1)
+
+
+def ks(reference: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """
+    Kolmogorov-Smirnov statistic per row of two count matrices, on the binned non-null values.
+    """
+    ref_cdf = np.cumsum(reference[:, :-1], axis=1) / np.maximum(reference[:, :-1].sum(axis=1, keepdims=True), 1)
+    cur_cdf = np.cumsum(current[:, :-1], axis=1) / np.maximum(current[:, :-1].sum(axis=1, keepdims=True), 1)
+    return np.abs(ref_cdf - cur_cdf).max(axis=1)
+
+
+class DriftReference:
+    """
+    This class summarises the data a model was trained on so that new data can be checked for drift.
+
+    Every numeric column is reduced to the quantile edges of ``n_bins`` bins
+    and the reference counts in those bins plus a null bin, a few hundred
+    numbers in total. New data is binned on the same edges for all columns at
+    once, chunk by chunk, and compared with PSI and KS; the null bin makes a
+    change in null rate count as drift too.
+    """
+    def __init__(self, columns: List[str], edges: np.ndarray, counts: np.ndarray):
+        """
+        Args:
+            columns (List[str]): Monitored columns
+            edges (np.ndarray): (n_columns, n_bins - 1) inner bin edges
+            counts (np.ndarray): (n_columns, n_bins + 1) reference counts, nulls last
+        """
+        self.columns = list(columns)
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+
+    @classmethod
+    def fit(cls, chunks: Callable[[], Iterable[pd.DataFrame]], columns: List[str],
+            n_bins: int = 10) -> "DriftReference":
+        """
+        Builds the reference in two streaming passes: quantile edges, then counts.
+
+        Args:
+            chunks (Callable[[], Iterable[pd.DataFrame]]): Returns a fresh iterator over the data
+            columns (List[str]): Columns to monitor
+            n_bins (int): Quantile bins per column
+        """
+        sketches = [QuantileSketch() for _ in columns]
+        for chunk in chunks():
+            values = to_matrix(chunk, columns)
+            for j, sketch in enumerate(sketches):
+                sketch.update(values[:, j])
+        qs = np.linspace(0, 1, n_bins + 1)[1:-1]
+        edges = np.array([sketch.quantiles(qs) if sketch.count else np.full(len(qs), np.nan)
+                          for sketch in sketches]).reshape(len(columns), len(qs))
+        reference = cls(columns, edges, np.zeros((len(columns), n_bins + 1), dtype=np.int64))
+        reference.counts = reference.count(chunks())
+        return reference
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, columns: Optional[List[str]] = None, n_bins: int = 10,
+                   chunksize: int = 200_000) -> "DriftReference":
+        """
+        Builds the reference from an in-memory frame, by default over all its numeric columns.
+        """
+        columns = columns if columns is not None else numeric_feature_columns(data.dtypes)
+        return cls.fit(lambda: iter_frame_chunks(data, chunksize), columns, n_bins)
+
+    def count(self, chunks: Iterable[pd.DataFrame]) -> np.ndarray:
+        """
+        Bins data on the reference edges in one pass.
+
+        Returns:
+            np.ndarray: (n_columns, n_bins + 1) counts, nulls last
+        """
+        counts = np.zeros_like(self.counts)
+        for chunk in chunks:
+            counts += bin_counts(to_matrix(chunk, self.columns), self.edges)
+        return counts
+
+    def compare(self, chunks: Iterable[pd.DataFrame], psi_threshold: float = 0.2,
+                ks_threshold: float = 0.1) -> dict:
+        """
+        Compares new data with the reference.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): New data, e.g. streamed from a file
+            psi_threshold (float): PSI above which a column has drifted
+            ks_threshold (float): KS statistic above which a column has drifted
+        Returns:
+            dict: ``rows``, ``max_psi``, ``max_ks``, the ``drifted`` columns and,
+                per column, its ``psi``, ``ks`` and reference and current null rates
+        """
+        current = self.count(chunks)
+        psi_values, ks_values = psi(self.counts, current), ks(self.counts, current)
+        null_reference = self.counts[:, -1] / np.maximum(self.counts.sum(axis=1), 1)
+        null_current = current[:, -1] / np.maximum(current.sum(axis=1), 1)
+        drifted = (psi_values > psi_threshold) | (ks_values > ks_threshold)
+        return {
+            "rows": int(current[0].sum()) if self.columns else 0,
+            "max_psi": float(psi_values.max()) if self.columns else 0.0,
+            "max_ks": float(ks_values.max()) if self.columns else 0.0,
+            "drifted": [column for column, flag in zip(self.columns, drifted) if flag],
+            "columns": {
+                column: {
+                    "psi": round(float(psi_values[j]), 6),
+                    "ks": round(float(ks_values[j]), 6),
+                    "null_rate_reference": round(float(null_reference[j]), 6),
+                    "null_rate_current": round(float(null_current[j]), 6),
+                }
+                for j, column in enumerate(self.columns)
+            },
+        }
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({
+                "format": FORMAT,
+                "columns": self.columns,
+                # NaN edges (all-null columns) are stored as null
+                "edges": [[None if np.isnan(e) else float(e) for e in row] for row in self.edges],
+                "counts": self.counts.tolist(),
+            }, f)
+
+    @classmethod
+    def load(cls, path: str) -> "DriftReference":
+        with open(path) as f:
+            spec = json.load(f)
+        if spec.get("format") != FORMAT:
+            raise ValueError(f"Unsupported drift reference format: {spec.get('format')}")
+        edges = np.array([[np.nan if e is None else e for e in row] for row in spec["edges"]], dtype=np.float64)
+        return cls(spec["columns"], edges.reshape(len(spec["columns"]), -1), spec["counts"])
+
+
+def iter_frame_chunks(data: pd.DataFrame, chunksize: int) -> Iterable[pd.DataFrame]:
+    for start in range(0, len(data), chunksize):
+        yield data.iloc[start:start + chunksize]
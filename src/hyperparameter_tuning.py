@@ -0,0 +1,267 @@
+import hashlib
+import inspect
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.model_dev import get_model
+from src.model_evaluator import RMSE
+from src.model_selection import SharedArrays
+from src.step_cache import fingerprint_frame
+
+
+def _linear_regression_space(trial) -> dict:
+    return {
+        "fit_intercept": trial.suggest_categorical("fit_intercept", [True, False]),
+        "positive": trial.suggest_categorical("positive", [True, False]),
+    }
+
+
+def _lightgbm_space(trial) -> dict:
+    return {
+        "n_estimators": trial.suggest_int("n_estimators", 50, 500, log=True),
+        "learning_rate": trial.suggest_float("learning_rate", 0.01, 0.3, log=True),
+        "num_leaves": trial.suggest_int("num_leaves", 8, 256, log=True),
+        "min_child_samples": trial.suggest_int("min_child_samples", 5, 100, log=True),
+        "subsample": trial.suggest_float("subsample", 0.5, 1.0),
+        "subsample_freq": 1,
+        "colsample_bytree": trial.suggest_float("colsample_bytree", 0.5, 1.0),
+    }
+
+
+def _xgboost_space(trial) -> dict:
+    return {
+        "n_estimators": trial.suggest_int("n_estimators", 50, 500, log=True),
+        "learning_rate": trial.suggest_float("learning_rate", 0.01, 0.3, log=True),
+        "max_depth": trial.suggest_int("max_depth", 2, 10),
+        "min_child_weight": trial.suggest_float("min_child_weight", 1.0, 20.0, log=True),
+        "subsample": trial.suggest_float("subsample", 0.5, 1.0),
+        "colsample_bytree": trial.suggest_float("colsample_bytree", 0.5, 1.0),
+    }
+
+
+def _catboost_space(trial) -> dict:
+    return {
+        "iterations": trial.suggest_int("iterations", 50, 500, log=True),
+        "learning_rate": trial.suggest_float("learning_rate", 0.01, 0.3, log=True),
+        "depth": trial.suggest_int("depth", 2, 10),
+        "l2_leaf_reg": trial.suggest_float("l2_leaf_reg", 1.0, 10.0, log=True),
+    }
+
+
+# Optuna search space for every model in MODEL_REGISTRY
+SEARCH_SPACES = {
+    "LinearRegression": _linear_regression_space,
+    "LightGBM": _lightgbm_space,
+    "XGBoost": _xgboost_space,
+    "CatBoost": _catboost_space,
+}
+
+
+def search_space_fingerprint(model_name: str, n_folds: int) -> str:
+    """
+    Fingerprints what a trial's score depends on besides the data: the search space code and the folds.
+    """
+    source = inspect.getsource(SEARCH_SPACES[model_name])
+    return hashlib.sha256(f"{source}:{n_folds}".encode()).hexdigest()
+
+
+def _make_pruner(name: str, n_folds: int):
+    import optuna
+
+    if name == "median":
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=1)
+    if name == "hyperband":
+        return optuna.pruners.HyperbandPruner(min_resource=1, max_resource=n_folds)
+    if name == "none":
+        return optuna.pruners.NopPruner()
+    raise ValueError(f"Unsupported pruner: {name}")
+
+
+def _storage(storage_path: str):
+    import optuna
+
+    # A generous busy timeout lets several worker processes share one SQLite file.
+    return optuna.storages.RDBStorage(
+        f"sqlite:///{os.path.abspath(storage_path)}",
+        engine_kwargs={"connect_args": {"timeout": 60}},
+    )
+
+
+def _finished_trials(study) -> int:
+    import optuna
+
+    states = (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+    return len(study.get_trials(deepcopy=False, states=states))
+
+
+def _run_worker(study_name: str, storage_path: str, model_name: str, specs: dict, n_trials: int,
+                n_folds: int, pruner: str, seed: int):
+    import optuna
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    arrays, blocks = SharedArrays.attach(specs)
+    try:
+        X, y = arrays["X"], arrays["y"]
+        folds = np.array_split(np.random.default_rng(0).permutation(X.shape[0]), n_folds)
+        space = SEARCH_SPACES[model_name]
+
+        def objective(trial):
+            params = space(trial)
+            scores = []
+            for step, test_idx in enumerate(folds):
+                train_mask = np.ones(X.shape[0], dtype=bool)
+                train_mask[test_idx] = False
+                model = get_model(model_name).train(X[train_mask], y[train_mask], n_jobs=1, **params)
+                scores.append(RMSE().calculate_scores(y[test_idx], model.predict(X[test_idx])))
+                # Report the running mean so pruners compare trials after each fold.
+                trial.report(float(np.mean(scores)), step)
+                if trial.should_prune():
+                    raise optuna.TrialPruned()
+            return float(np.mean(scores))
+
+        study = optuna.load_study(
+            study_name=study_name,
+            storage=_storage(storage_path),
+            sampler=optuna.samplers.TPESampler(seed=seed),
+            pruner=_make_pruner(pruner, n_folds),
+        )
+        states = (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+        study.optimize(
+            objective,
+            callbacks=[optuna.study.MaxTrialsCallback(n_trials, states=states)],
+        )
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+
+
+class HyperparameterTuner:
+    """
+    This class runs a resumable, parallel Optuna search over a registered model's hyperparameters.
+
+    Trials are stored in SQLite, so an interrupted search resumes from the trials
+    already finished; workers are separate processes sharing the training matrix
+    through shared memory and the study through the SQLite file.
+    """
+    def __init__(
+        self,
+        model_name: str,
+        storage_path: str,
+        study_name: Optional[str] = None,
+        n_trials: int = 50,
+        n_workers: int = 1,
+        n_folds: int = 3,
+        pruner: str = "median",
+        seed: int = 42,
+    ):
+        """
+        Args:
+            model_name (str): Name from MODEL_REGISTRY to tune
+            storage_path (str): SQLite file holding the study
+            study_name (str, optional): Study to create or resume; defaults to
+                ``<model_name>-tuning-<hash>``, keyed on the training data and the
+                search space, so new data starts a new study
+            n_trials (int): Total finished (complete or pruned) trials to reach,
+                including those from earlier runs
+            n_workers (int): Worker processes running trials concurrently
+            n_folds (int): Cross-validation folds; each fold is one pruning step
+            pruner (str): ``median``, ``hyperband`` or ``none``
+            seed (int): Base seed for the samplers; worker ``i`` uses ``seed + i``
+        """
+        if model_name not in SEARCH_SPACES:
+            raise ValueError(f"No search space for model: {model_name}")
+        self.model_name = model_name
+        self.storage_path = storage_path
+        self.study_name = study_name
+        self.n_trials = n_trials
+        self.n_workers = n_workers
+        self.n_folds = n_folds
+        self.pruner = pruner
+        self.seed = seed
+
+    def tune(self, X_train, y_train):
+        """
+        Run (or resume) the study until ``n_trials`` trials have finished.
+
+        Args:
+            X_train (np.ndarray): Training data
+            y_train (np.ndarray): Training labels
+
+        Returns:
+            optuna.Study: The study, with ``best_params`` and ``best_value`` (mean CV RMSE)
+        """
+        import optuna
+        import pandas as pd
+
+        try:
+            X = np.asarray(X_train, dtype=np.float64)
+            y = np.asarray(y_train, dtype=np.float64).ravel()
+            data_fingerprint = hashlib.sha256(
+                (fingerprint_frame(pd.DataFrame(X)) + fingerprint_frame(pd.Series(y))).encode()
+            ).hexdigest()
+            space_fingerprint = search_space_fingerprint(self.model_name, self.n_folds)
+            study_name = self.study_name or (
+                f"{self.model_name}-tuning-"
+                f"{hashlib.sha256((data_fingerprint + space_fingerprint).encode()).hexdigest()[:12]}"
+            )
+
+            os.makedirs(os.path.dirname(os.path.abspath(self.storage_path)), exist_ok=True)
+            study = optuna.create_study(
+                study_name=study_name,
+                storage=_storage(self.storage_path),
+                direction="minimize",
+                load_if_exists=True,
+            )
+            # A study only resumes on the data and search space it was started with;
+            # its trials' scores mean nothing for another dataset.
+            expected = {"data_fingerprint": data_fingerprint, "search_space": space_fingerprint}
+            for attr, value in expected.items():
+                stored = study.user_attrs.get(attr)
+                if stored is None:
+                    study.set_user_attr(attr, value)
+                elif stored != value:
+                    raise ValueError(
+                        f"Study {study_name} was built on a different {attr.replace('_', ' ')}; "
+                        f"use another study_name or leave it unset"
+                    )
+            done = _finished_trials(study)
+            if done >= self.n_trials:
+                logging.info(f"Study {study_name} already has {done} finished trials.")
+                return study
+            logging.info(f"Running study {study_name} from {done} to {self.n_trials} trials.")
+
+            with SharedArrays(X=X, y=y) as shared:
+                args = (study_name, self.storage_path, self.model_name, shared.specs,
+                        self.n_trials, self.n_folds, self.pruner)
+                if self.n_workers == 1:
+                    _run_worker(*args, self.seed)
+                else:
+                    with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                        futures = [pool.submit(_run_worker, *args, self.seed + i) for i in range(self.n_workers)]
+                        for future in futures:
+                            future.result()
+
+            study = optuna.load_study(study_name=study_name, storage=_storage(self.storage_path))
+            logging.info(f"Best {self.model_name} params: {study.best_params} (RMSE {study.best_value}).")
+            return study
+        except Exception as e:
+            logging.error(f"Error occurred during hyperparameter tuning: {str(e)}")
+            raise e
+
+    def best_model_params(self, study) -> Dict:
+        """
+        Rebuild the keyword arguments of the best trial, including fixed ones.
+
+        Args:
+            study (optuna.Study): A study returned by ``tune``
+        Returns:
+            Dict: Keyword arguments for the model's ``train``
+        """
+        import optuna
+
+        return SEARCH_SPACES[self.model_name](optuna.trial.FixedTrial(study.best_params))
@@ -0,0 +1,526 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.linear_artifact import LinearPredictor, find_linear_artifact
+from src.prediction_cache import PredictionCache
+
+
+def load_model(model_uri: str):
+    """
+    Loads a trained model from an MLflow URI (e.g. ``runs:/<run_id>/model``) or a local path.
+
+    Linear models logged by ``log_linear_model`` are memory-mapped without
+    importing sklearn; anything else is unpickled with ``mlflow.sklearn``.
+
+    Args:
+        model_uri (str): MLflow model URI or directory
+    Returns:
+        The fitted model logged by train_model
+    """
+    local_path = model_uri
+    if not os.path.isdir(model_uri):
+        import mlflow.artifacts
+
+        local_path = mlflow.artifacts.download_artifacts(model_uri)
+    artifact_path = find_linear_artifact(local_path)
+    if artifact_path is not None:
+        return LinearPredictor.load(artifact_path)
+
+    import mlflow.sklearn
+
+    return mlflow.sklearn.load_model(local_path)
+
+
+def feature_names(model) -> List[str]:
+    """
+    Returns the raw feature columns the model expects, in order.
+    """
+    names = getattr(model, "feature_names_in_", None)
+    if names is None and hasattr(model, "steps"):
+        names = getattr(model.steps[0][1], "feature_names_in_", None)
+    if names is None:
+        raise ValueError("Model does not record its input feature names")
+    return [str(name) for name in names]
+
+
+def fill_values(model) -> Optional[np.ndarray]:
+    """
+    Returns the per-feature null fill values of the model's preprocessing, if it records them.
+    """
+    values = getattr(model, "fill_values_", None)
+    if values is None and hasattr(model, "steps"):
+        values = getattr(model.steps[0][1], "fill_values_", None)
+    return None if values is None else np.asarray(values, dtype=np.float64)
+
+
+def model_version(model_uri: str) -> str:
+    """
+    Identifies the model behind a URI; a redeployed or re-registered model gets a new value.
+    """
+    if os.path.isdir(model_uri) and not os.path.exists(os.path.join(model_uri, "MLmodel")):
+        return f"{os.path.abspath(model_uri)}@{os.stat(model_uri).st_mtime_ns}"
+    from mlflow.models import get_model_info
+
+    return get_model_info(model_uri).model_uuid or model_uri
+
+
+class MicroBatcher:
+    """
+    This class groups concurrent prediction requests into one ``predict`` call.
+
+    Requests wait until ``max_batch_size`` rows are queued or ``max_latency_ms``
+    has passed since the first queued row, then the rows are scored together
+    from a single contiguous float64 array.
+    """
+    def __init__(self, model, max_batch_size: int = 256, max_latency_ms: float = 5.0):
+        """
+        Args:
+            model: Fitted model whose ``predict`` accepts a 2D array in feature order
+            max_batch_size (int): Largest number of rows scored per call
+            max_latency_ms (float): Longest time a request waits for others to join its batch
+        """
+        self.set_model(model)
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000.0
+        self.batch_sizes: List[int] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def set_model(self, model):
+        """
+        Scores subsequent batches with ``model``.
+        """
+        self.model = model
+        self.features = feature_names(model)
+        self.fill_values = fill_values(model)
+
+    def start(self):
+        """
+        Starts the batching task on the running event loop.
+        """
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+    def to_rows(self, records: Sequence[Dict[str, float]]) -> np.ndarray:
+        """
+        Converts JSON records into rows in the model's feature order; missing values become NaN.
+        """
+        rows = np.empty((len(records), len(self.features)), dtype=np.float64)
+        for i, record in enumerate(records):
+            rows[i] = [record.get(name, np.nan) for name in self.features]
+        return rows
+
+    def canonicalize(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Fills nulls in place the way the model's preprocessing would, so rows
+        that only differ by a filled null get the same cache key.
+        """
+        if self.fill_values is not None:
+            missing_rows, missing_cols = np.nonzero(np.isnan(rows))
+            rows[missing_rows, missing_cols] = self.fill_values[missing_cols]
+        return rows
+
+    async def predict(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Queues rows for the next batch and waits for their predictions.
+
+        Args:
+            rows (np.ndarray): (n, n_features) rows in feature order
+        Returns:
+            np.ndarray: Predictions for the given rows
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((rows, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._queue.get()]
+            size = items[0][0].shape[0]
+            deadline = loop.time() + self.max_latency
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                size += item[0].shape[0]
+
+            batch = np.concatenate([rows for rows, _ in items]) if len(items) > 1 else items[0][0]
+            try:
+                predictions = np.asarray(self.model.predict(batch))
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batch_sizes.append(size)
+            offset = 0
+            for rows, future in items:
+                if not future.done():
+                    future.set_result(predictions[offset:offset + rows.shape[0]])
+                offset += rows.shape[0]
+
+
+async def _read_request(reader: asyncio.StreamReader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    parts = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if len(parts) != 3 or not headers.get("content-length", "0").isdigit():
+        raise ValueError(f"Malformed request: {request_line[:100]!r}")
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return parts[0], parts[1], headers, body
+
+
+def _response(status: str, payload: dict, keep_alive: bool) -> bytes:
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+class InferenceServer:
+    """
+    This class serves ``POST /invocations`` over HTTP/1.1 using a MicroBatcher.
+
+    The body is either one JSON record of feature values or
+    ``{"instances": [record, ...]}``; the response is ``{"predictions": [...]}``.
+    With a PredictionCache, rows are looked up by their canonical feature
+    vector before they are queued, and only the misses reach the model.
+    ``GET /stats`` returns the cache counters, batch sizes and request latency.
+    """
+    def __init__(self, model, host: str = "127.0.0.1", port: int = 8001,
+                 max_batch_size: int = 256, max_latency_ms: float = 5.0,
+                 cache: Optional[PredictionCache] = None, model_version: str = "initial",
+                 reuse_port: bool = False):
+        """
+        Args:
+            model: Fitted model, e.g. from ``load_model``
+            host (str): Interface to bind
+            port (int): Port to bind; 0 picks a free port
+            max_batch_size (int): Largest number of rows scored per call
+            max_latency_ms (float): Longest time a request waits for others to join its batch
+            cache (PredictionCache, optional): Prediction cache; None scores every row
+            model_version (str): Version of ``model``, e.g. from ``model_version``
+            reuse_port (bool): Share the port with other server processes (SO_REUSEPORT)
+        """
+        self.batcher = MicroBatcher(model, max_batch_size, max_latency_ms)
+        self.cache = cache
+        self.model_version = model_version
+        if cache is not None:
+            cache.set_version(model_version)
+        self.host = host
+        self.port = port
+        self.reuse_port = reuse_port
+        # Requests being answered, requests answered and their summed latency
+        self.in_flight = 0
+        self.completed = 0
+        self.latency_s = 0.0
+        self._server = None
+        self._connections = set()
+        self._draining = False
+
+    def swap_model(self, model, version: str):
+        """
+        Serves ``model`` from now on and drops the predictions cached for the previous one.
+        """
+        self.batcher.set_model(model)
+        self.model_version = version
+        if self.cache is not None:
+            self.cache.set_version(version)
+        logging.info(f"Now serving model version {version}")
+
+    async def predict_records(self, records: Sequence[Dict[str, float]]) -> np.ndarray:
+        """
+        Scores JSON records, answering from the cache where possible.
+        """
+        rows = self.batcher.to_rows(records)
+        if self.cache is None:
+            return await self.batcher.predict(rows)
+
+        keys = [row.tobytes() for row in self.batcher.canonicalize(rows)]
+        predictions = np.empty(len(keys), dtype=np.float64)
+        missing = []
+        for i, key in enumerate(keys):
+            cached = self.cache.get(key)
+            if cached is None:
+                missing.append(i)
+            else:
+                predictions[i] = cached
+        if missing:
+            version = self.cache.version
+            scored = await self.batcher.predict(rows[missing])
+            predictions[missing] = scored
+            # Results of a model swapped out while they were computed are not kept
+            if self.cache.version == version:
+                for i, prediction in zip(missing, scored.tolist()):
+                    self.cache.put(keys[i], prediction)
+        return predictions
+
+    def stats(self) -> dict:
+        sizes = self.batcher.batch_sizes
+        return {
+            "model_version": self.model_version,
+            "batches": len(sizes),
+            "mean_batch_size": round(float(np.mean(sizes)), 2) if sizes else 0.0,
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "in_flight": self.in_flight,
+            "requests": self.completed,
+            "mean_latency_ms": round(self.latency_s / self.completed * 1000.0, 3) if self.completed else 0.0,
+        }
+
+    async def start(self):
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                  reuse_port=self.reuse_port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logging.info(f"Inference server listening on http://{self.host}:{self.port}/invocations")
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+        await self.batcher.stop()
+
+    async def drain(self, timeout_s: float = 30.0):
+        """
+        Stops accepting connections and stops once the open ones are done.
+
+        Every open connection gets its next response with ``Connection: close``,
+        so clients move to another server without losing a request; connections
+        still open after ``timeout_s`` are closed.
+        """
+        self._draining = True
+        self._server.close()
+        deadline = time.monotonic() + timeout_s
+        while (self._connections or self.in_flight) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        for writer in list(self._connections):
+            writer.close()
+        await self.batcher.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except ValueError as e:
+                    # Where the next request starts is unknown, so the connection is closed
+                    writer.write(_response("400 Bad Request", {"error": str(e)}, False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "keep-alive").lower() != "close" and not self._draining
+                route = path.split("?")[0]
+                if method == "GET" and route == "/stats":
+                    writer.write(_response("200 OK", self.stats(), keep_alive))
+                elif method != "POST" or route != "/invocations":
+                    writer.write(_response("404 Not Found", {"error": "POST /invocations"}, keep_alive))
+                else:
+                    self.in_flight += 1
+                    start = time.perf_counter()
+                    try:
+                        payload = json.loads(body)
+                        records = payload["instances"] if isinstance(payload, dict) and "instances" in payload else [payload]
+                        predictions = await self.predict_records(records)
+                        writer.write(_response("200 OK", {"predictions": predictions.tolist()}, keep_alive))
+                    except Exception as e:
+                        writer.write(_response("400 Bad Request", {"error": str(e)}, keep_alive))
+                    finally:
+                        self.in_flight -= 1
+                        self.completed += 1
+                        self.latency_s += time.perf_counter() - start
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+
+async def replay(records: Sequence[dict], host: str, port: int, concurrency: int = 32) -> dict:
+    """
+    Replays records against a running server over keep-alive connections and measures latency.
+
+    A client whose connection is closed by the server (``Connection: close``,
+    e.g. while the server drains) reconnects before its next request.
+
+    Args:
+        records (Sequence[dict]): One JSON request body per record
+        host (str): Server host
+        port (int): Server port
+        concurrency (int): Number of concurrent client connections
+
+    Returns:
+        dict: requests, seconds, requests_per_second, p50_ms, p99_ms and errors
+    """
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def client():
+        nonlocal errors, next_index
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while next_index < len(records):
+                if writer.is_closing():
+                    reader, writer = await asyncio.open_connection(host, port)
+                body = json.dumps(records[next_index]).encode()
+                next_index += 1
+                start = time.perf_counter()
+                writer.write(
+                    f"POST /invocations HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+                status = await reader.readline()
+                length = 0
+                close = False
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                    elif line.lower().startswith(b"connection:"):
+                        close = b"close" in line.lower()
+                await reader.readexactly(length)
+                if close:
+                    writer.close()
+                latencies.append(time.perf_counter() - start)
+                if b" 200 " not in status:
+                    errors += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(min(concurrency, max(len(records), 1)))))
+    elapsed = time.perf_counter() - start
+    latencies_ms = np.array(latencies) * 1000.0
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3) if latencies else None,
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 3) if latencies else None,
+        "errors": errors,
+    }
+
+
+async def watch_model(server: InferenceServer, resolve_uri: Callable[[], str], interval_s: float = 30.0):
+    """
+    Polls for a newly deployed model and swaps it in, which also invalidates the cache.
+
+    Args:
+        server (InferenceServer): Running server
+        resolve_uri (Callable[[], str]): Returns the URI of the model that should be served
+        interval_s (float): Seconds between checks
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            uri = await loop.run_in_executor(None, resolve_uri)
+            version = await loop.run_in_executor(None, model_version, uri)
+            if version != server.model_version:
+                server.swap_model(await loop.run_in_executor(None, load_model, uri), version)
+        except Exception as e:
+            logging.warning(f"Model watch failed: {e}")
+
+
+async def serve_and_replay(model, records: Sequence[dict], concurrency: int = 32,
+                           max_batch_size: int = 256, max_latency_ms: float = 5.0,
+                           cache: Optional[PredictionCache] = None) -> dict:
+    """
+    Starts a local server on a free port, replays the records against it and shuts it down.
+
+    Returns:
+        dict: The ``replay`` statistics plus the mean batch size and the cache counters
+    """
+    server = InferenceServer(model, port=0, max_batch_size=max_batch_size, max_latency_ms=max_latency_ms,
+                             cache=cache)
+    await server.start()
+    try:
+        stats = await replay(records, server.host, server.port, concurrency)
+    finally:
+        await server.stop()
+    server_stats = server.stats()
+    stats["mean_batch_size"] = server_stats["mean_batch_size"]
+    stats["cache"] = server_stats["cache"]
+    return stats
+
+
+def read_requests(path: str) -> List[dict]:
+    """
+    Reads one JSON request body per line.
+    """
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a trained model with request micro-batching.")
+    parser.add_argument("--model-uri", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-latency-ms", type=float, default=5.0)
+    parser.add_argument("--cache-size", type=int, default=100_000, help="0 disables the prediction cache")
+    parser.add_argument("--cache-ttl-s", type=float, default=3600.0)
+    parser.add_argument("--watch-interval-s", type=float, default=0.0,
+                        help="Reload the model when the URI points to a new one; 0 disables")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    cache = PredictionCache(args.cache_size, args.cache_ttl_s) if args.cache_size > 0 else None
+    server = InferenceServer(load_model(args.model_uri), args.host, args.port,
+                             args.max_batch_size, args.max_latency_ms,
+                             cache=cache, model_version=model_version(args.model_uri))
+
+    async def main():
+        if args.watch_interval_s > 0:
+            asyncio.get_running_loop().create_task(
+                watch_model(server, lambda: args.model_uri, args.watch_interval_s)
+            )
+        await server.serve_forever()
+
+    asyncio.run(main())
@@ -0,0 +1,222 @@
+import json
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Bump when the files written by export_linear_model change
+FORMAT = "linear-npy-v1"
+# Stacked per-segment weights, one row per segment plus a global fallback row
+SEGMENTED_FORMAT = "segmented-linear-npy-v1"
+HEADER_FILE = "header.json"
+WEIGHTS_FILE = "weights.npy"
+FILL_VALUES_FILE = "fill_values.npy"
+
+
+def segment_codes(segments: np.ndarray, values) -> np.ndarray:
+    """
+    Maps segment values to their row in a stacked weight matrix.
+
+    Args:
+        segments (np.ndarray): Sorted segment labels, as strings
+        values: Segment of every row
+    Returns:
+        np.ndarray: Index into ``segments`` per row; ``len(segments)`` (the
+            global row) for segments not seen in training
+    """
+    values = np.asarray(values, dtype=str)
+    if len(segments) == 0:
+        return np.zeros(len(values), dtype=np.intp)
+    codes = np.minimum(np.searchsorted(segments, values), len(segments) - 1)
+    return np.where(segments[codes] == values, codes, len(segments))
+
+
+class LinearPredictor:
+    """
+    This class scores rows with a linear model using NumPy only.
+
+    It holds what the fitted ``Pipeline([("preprocess", PreProcessTransformer),
+    ("model", LinearRegression)])`` needs at prediction time: the feature order,
+    the fill value of each feature and the weights. Loading it imports neither
+    sklearn nor pandas, and the arrays are memory-mapped, so every serving worker
+    on a host shares the same pages.
+
+    A SegmentedLinearRegression is held the same way with one weight row per
+    segment; each row is scored with the weights of its ``segment_column`` value.
+    """
+    def __init__(self, feature_names: Sequence[str], coef: np.ndarray, intercept,
+                 fill_values: np.ndarray, segment_column: Optional[str] = None,
+                 segments: Optional[Sequence[str]] = None):
+        """
+        Args:
+            feature_names (Sequence[str]): Raw feature columns, in model order
+            coef (np.ndarray): (n_features,) weights, or (n_segments + 1, n_features) when segmented
+            intercept: Bias term, or (n_segments + 1,) bias terms when segmented
+            fill_values (np.ndarray): (n_features,) value replacing nulls; NaN leaves nulls as is
+            segment_column (str, optional): Column routing rows to their segment's weights
+            segments (Sequence[str], optional): Sorted segment labels, one per weight row but the last
+        """
+        self.feature_names_in_ = np.array(list(feature_names), dtype=object)
+        self.n_features_in_ = len(self.feature_names_in_)
+        self.coef_ = coef
+        self.intercept_ = float(intercept) if segment_column is None else intercept
+        self.fill_values_ = fill_values
+        self.segment_column = segment_column
+        self.segments_ = None if segments is None else np.array(list(segments), dtype=str)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "LinearPredictor":
+        """
+        Loads an artifact written by ``export_linear_model``.
+
+        Args:
+            path (str): Artifact directory
+            mmap (bool): Memory-map the arrays instead of reading them
+        """
+        with open(os.path.join(path, HEADER_FILE)) as f:
+            header = json.load(f)
+        if header.get("format") not in (FORMAT, SEGMENTED_FORMAT):
+            raise ValueError(f"Unsupported model artifact format: {header.get('format')}")
+        mode = "r" if mmap else None
+        weights = np.load(os.path.join(path, WEIGHTS_FILE), mmap_mode=mode, allow_pickle=False)
+        fill_values = np.load(os.path.join(path, FILL_VALUES_FILE), mmap_mode=mode, allow_pickle=False)
+        if header["format"] == SEGMENTED_FORMAT:
+            return cls(header["features"], weights[:, :-1], weights[:, -1], fill_values,
+                       header["segment_column"], header["segments"])
+        return cls(header["features"], weights[:-1], weights[-1], fill_values)
+
+    def predict(self, X, params: Optional[dict] = None) -> np.ndarray:
+        """
+        Fills nulls and applies the weights.
+
+        Args:
+            X: DataFrame with at least the feature columns, or an array whose
+                columns are in ``feature_names_in_`` order; a segmented model
+                needs a DataFrame that also holds ``segment_column``
+            params (dict, optional): Ignored; accepted for the MLflow pyfunc interface
+        Returns:
+            np.ndarray: (n_rows,) predictions
+        """
+        if self.segment_column is not None and not hasattr(X, "columns"):
+            raise ValueError(f"A segmented model needs a DataFrame with the {self.segment_column} column")
+        if hasattr(X, "columns"):
+            rows = np.empty((len(X), self.n_features_in_), dtype=np.float64)
+            for j, column in enumerate(self.feature_names_in_):
+                rows[:, j] = X[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            rows = np.array(X, dtype=np.float64, copy=True, ndmin=2)
+            if rows.shape[1] != self.n_features_in_:
+                raise ValueError(f"Expected {self.n_features_in_} features, got {rows.shape[1]}")
+        missing_rows, missing_cols = np.nonzero(np.isnan(rows))
+        rows[missing_rows, missing_cols] = self.fill_values_[missing_cols]
+        if self.segment_column is None:
+            return rows @ self.coef_ + self.intercept_
+        codes = segment_codes(self.segments_, X[self.segment_column])
+        return np.einsum("ij,ij->i", rows, self.coef_[codes]) + self.intercept_[codes]
+
+
+def is_segmented_pipeline(pipeline) -> bool:
+    """
+    Returns True when the pipeline is a single fitted SegmentedLinearRegression.
+    """
+    steps = getattr(pipeline, "steps", None)
+    return bool(steps) and len(steps) == 1 and hasattr(steps[0][1], "segments_")
+
+
+def is_linear_pipeline(pipeline) -> bool:
+    """
+    Returns True when the pipeline is a PreProcessTransformer followed by a
+    single-output linear model, or a segmented linear model, i.e. when it can
+    be exported.
+    """
+    if is_segmented_pipeline(pipeline):
+        return True
+    steps = getattr(pipeline, "steps", None)
+    if not steps or len(steps) != 2:
+        return False
+    preprocessor, model = steps[0][1], steps[1][1]
+    coef = getattr(model, "coef_", None)
+    return (
+        hasattr(preprocessor, "fill_values_")
+        and coef is not None
+        and np.ndim(coef) == 1
+        and np.ndim(getattr(model, "intercept_", 0.0)) == 0
+    )
+
+
+def export_linear_model(pipeline, path: str) -> str:
+    """
+    Writes a fitted linear pipeline as a header plus two flat ``.npy`` arrays.
+
+    A segmented model's weights are stacked into one (n_segments + 1,
+    n_features + 1) array; the header lists the segments in row order.
+
+    Args:
+        pipeline: Fitted ``Pipeline`` accepted by ``is_linear_pipeline``
+        path (str): Artifact directory, created if needed
+    Returns:
+        str: The artifact directory
+    """
+    if not is_linear_pipeline(pipeline):
+        raise ValueError("Only a PreProcessTransformer followed by a linear model can be exported")
+    if is_segmented_pipeline(pipeline):
+        model = preprocessor = pipeline.steps[0][1]
+        weights = np.column_stack([model.coef_, model.intercept_]).astype(np.float64)
+        header = {"format": SEGMENTED_FORMAT, "segment_column": model.segment_column,
+                  "segments": [str(s) for s in model.segments_]}
+    else:
+        preprocessor, model = pipeline.steps[0][1], pipeline.steps[1][1]
+        weights = np.append(np.asarray(model.coef_, dtype=np.float64), float(model.intercept_))
+        header = {"format": FORMAT}
+    header["features"] = [str(c) for c in preprocessor.feature_names_in_]
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, WEIGHTS_FILE), weights, allow_pickle=False)
+    np.save(os.path.join(path, FILL_VALUES_FILE), np.asarray(preprocessor.fill_values_, dtype=np.float64),
+            allow_pickle=False)
+    with open(os.path.join(path, HEADER_FILE), "w") as f:
+        json.dump(header, f, indent=2)
+    return path
+
+
+def find_linear_artifact(model_dir: str) -> Optional[str]:
+    """
+    Returns the artifact directory inside a local model directory, if there is one.
+
+    Accepts the artifact directory itself or an MLflow model logged by
+    ``log_linear_model`` (which keeps it under ``data/``).
+    """
+    for candidate in (model_dir, os.path.join(model_dir, "data", "linear_model")):
+        if os.path.isfile(os.path.join(candidate, HEADER_FILE)):
+            return candidate
+    return None
+
+
+def log_linear_model(pipeline, artifact_path: str = "model", signature=None):
+    """
+    Logs a fitted linear pipeline to the active MLflow run as a pyfunc model
+    backed by the NumPy artifact instead of a pickle.
+
+    MLflow loads it through ``_load_pyfunc`` below, so the deployer's prediction
+    server workers memory-map the same files.
+    """
+    import tempfile
+
+    import mlflow.pyfunc
+
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = export_linear_model(pipeline, os.path.join(tmp, "linear_model"))
+        mlflow.pyfunc.log_model(
+            artifact_path=artifact_path,
+            loader_module="src.linear_artifact",
+            data_path=data_path,
+            code_paths=[src_dir],
+            pip_requirements=[f"numpy=={np.__version__}"],
+            signature=signature,
+        )
+
+
+def _load_pyfunc(data_path: str) -> LinearPredictor:
+    # Entry point used by mlflow.pyfunc.load_model for models from log_linear_model
+    return LinearPredictor.load(data_path)
+
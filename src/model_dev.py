@@ -1,6 +1,10 @@
+import copy
 import logging
+import os
 from abc import ABC, abstractmethod
-from sklearn.linear_model import LinearRegression
+from typing import Iterable, Tuple
+import numpy as np
+from src.profiling import profiled
 
 class Model(ABC):
     """
@@ -25,6 +29,7 @@ class LinearRegressionModel(Model):
     This class implements a linear regression model.
     """
     
+    @profiled()
     def train(self, X_train, y_train, **kwargs):
         """
         Train the linear regression model.
@@ -37,6 +42,8 @@ class LinearRegressionModel(Model):
             self: The trained linear regression model
         """
         
+        from sklearn.linear_model import LinearRegression
+
         try:
             reg = LinearRegression(**kwargs)
             reg.fit(X_train, y_train)
@@ -44,4 +51,319 @@ class LinearRegressionModel(Model):
             return reg
         except Exception as e:
             logging.error(f"Error occurred during model training: {str(e)}")
-            raise e
\ No newline at end of file
+            raise e
+
+class LightGBMModel(Model):
+    """
+    This class implements a LightGBM gradient boosting model.
+    """
+
+    @profiled()
+    def train(self, X_train, y_train, **kwargs):
+        """
+        Train the LightGBM model.
+
+        Args:
+            X_train (pd.DataFrame): Training data
+            y_train (pd.Series): Training labels
+
+        Returns:
+            self: The trained LightGBM model
+        """
+
+        try:
+            from lightgbm import LGBMRegressor
+
+            reg = LGBMRegressor(**{"verbose": -1, **kwargs})
+            reg.fit(X_train, y_train)
+            logging.info("LightGBM model trained successfully.")
+            return reg
+        except Exception as e:
+            logging.error(f"Error occurred during model training: {str(e)}")
+            raise e
+
+class XGBoostModel(Model):
+    """
+    This class implements an XGBoost gradient boosting model.
+    """
+
+    @profiled()
+    def train(self, X_train, y_train, **kwargs):
+        """
+        Train the XGBoost model.
+
+        Args:
+            X_train (pd.DataFrame): Training data
+            y_train (pd.Series): Training labels
+
+        Returns:
+            self: The trained XGBoost model
+        """
+
+        try:
+            from xgboost import XGBRegressor
+
+            reg = XGBRegressor(**kwargs)
+            reg.fit(X_train, y_train)
+            logging.info("XGBoost model trained successfully.")
+            return reg
+        except Exception as e:
+            logging.error(f"Error occurred during model training: {str(e)}")
+            raise e
+
+class CatBoostModel(Model):
+    """
+    This class implements a CatBoost gradient boosting model.
+    """
+
+    @profiled()
+    def train(self, X_train, y_train, **kwargs):
+        """
+        Train the CatBoost model.
+
+        Args:
+            X_train (pd.DataFrame): Training data
+            y_train (pd.Series): Training labels
+
+        Returns:
+            self: The trained CatBoost model
+        """
+
+        try:
+            from catboost import CatBoostRegressor
+
+            # CatBoost calls the thread count thread_count; accept n_jobs like the others
+            if "n_jobs" in kwargs:
+                kwargs["thread_count"] = kwargs.pop("n_jobs")
+            reg = CatBoostRegressor(**{"verbose": False, "allow_writing_files": False, **kwargs})
+            reg.fit(X_train, y_train)
+            logging.info("CatBoost model trained successfully.")
+            return reg
+        except Exception as e:
+            logging.error(f"Error occurred during model training: {str(e)}")
+            raise e
+
+# Models selectable through ModelNameConfig.ml_model_name
+MODEL_REGISTRY = {
+    "LinearRegression": LinearRegressionModel,
+    "LightGBM": LightGBMModel,
+    "XGBoost": XGBoostModel,
+    "CatBoost": CatBoostModel,
+}
+
+def get_model(name: str) -> Model:
+    """
+    Look up a model in the registry.
+
+    Args:
+        name (str): Registered model name
+    Returns:
+        Model: A new instance of the registered model
+    """
+    if name not in MODEL_REGISTRY:
+        raise ValueError(f"Unsupported model name: {name}")
+    return MODEL_REGISTRY[name]()
+
+class LinearSufficientStatistics:
+    """
+    This class accumulates the sufficient statistics of a least-squares fit.
+
+    XᵀX and Xᵀy (with a leading column of ones for the intercept) are additive
+    across row partitions, so new data can be folded in without revisiting old rows.
+    ``fill_values`` are the null fill values every partition was preprocessed with.
+    """
+    def __init__(self, n_features: int, fill_values=None):
+        """
+        Args:
+            n_features (int): Number of feature columns
+            fill_values (np.ndarray, optional): Fill values of the feature columns
+        """
+        self.xtx = np.zeros((n_features + 1, n_features + 1), dtype=np.float64)
+        self.xty = np.zeros(n_features + 1, dtype=np.float64)
+        self.n_samples = 0
+        self.partitions = []
+        self.fill_values = None if fill_values is None else np.asarray(fill_values, dtype=np.float64)
+
+    def update(self, X, y) -> "LinearSufficientStatistics":
+        """
+        Fold a chunk of rows into the statistics.
+
+        Args:
+            X (np.ndarray): Chunk of training data
+            y (np.ndarray): Chunk of training labels
+        Returns:
+            self: The updated statistics
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64).ravel()
+        column_sums = X.sum(axis=0)
+        self.xtx[0, 0] += X.shape[0]
+        self.xtx[0, 1:] += column_sums
+        self.xtx[1:, 0] += column_sums
+        self.xtx[1:, 1:] += X.T @ X
+        self.xty[0] += y.sum()
+        self.xty[1:] += X.T @ y
+        self.n_samples += X.shape[0]
+        return self
+
+    def solve(self, fit_intercept: bool = True):
+        """
+        Solve the normal equations.
+
+        Args:
+            fit_intercept (bool): Whether to estimate an intercept
+        Returns:
+            Tuple[np.ndarray, float]: Coefficients and intercept
+        """
+        start = 0 if fit_intercept else 1
+        # lstsq rather than solve so that collinear features do not fail the fit
+        beta = np.linalg.lstsq(self.xtx[start:, start:], self.xty[start:], rcond=None)[0]
+        if fit_intercept:
+            return beta[1:], float(beta[0])
+        return beta, 0.0
+
+    def save(self, path: str):
+        """
+        Persist the statistics as an ``.npz`` artifact.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(
+            path,
+            xtx=self.xtx,
+            xty=self.xty,
+            n_samples=self.n_samples,
+            partitions=np.array(self.partitions, dtype=str),
+            **({} if self.fill_values is None else {"fill_values": self.fill_values}),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "LinearSufficientStatistics":
+        """
+        Load statistics saved by ``save``.
+        """
+        with np.load(path) as f:
+            stats = cls(f["xty"].shape[0] - 1)
+            stats.xtx = f["xtx"]
+            stats.xty = f["xty"]
+            stats.n_samples = int(f["n_samples"])
+            stats.partitions = f["partitions"].tolist()
+            stats.fill_values = f["fill_values"] if "fill_values" in f.files else None
+        return stats
+
+
+class IncrementalLinearRegressionModel(Model):
+    """
+    This class implements a warm-started linear regression model.
+
+    Each call folds only the given partition into persisted sufficient statistics
+    and re-solves the normal equations, so retraining cost scales with the new data
+    rather than the full history. The caller passes only the new rows and a stable
+    id for them; the fill values of the first partition are frozen in the
+    statistics and used for every later one (see ``freeze_preprocessor``).
+    """
+    def __init__(self, state_path: str):
+        """
+        Args:
+            state_path (str): ``.npz`` file holding the accumulated statistics
+        """
+        self.state_path = state_path
+
+    def freeze_preprocessor(self, preprocessor):
+        """
+        Returns the preprocessor with the fill values the statistics were accumulated with.
+
+        Args:
+            preprocessor (PreProcessTransformer): Preprocessor fitted on the new partition
+        Returns:
+            PreProcessTransformer: A copy carrying the frozen fill values, or
+                ``preprocessor`` itself before the first partition
+        """
+        if not os.path.exists(self.state_path):
+            return preprocessor
+        stats = LinearSufficientStatistics.load(self.state_path)
+        if stats.fill_values is None:
+            return preprocessor
+        if stats.fill_values.shape[0] != preprocessor.n_features_in_:
+            raise ValueError(
+                f"{self.state_path} holds {stats.fill_values.shape[0]} features, "
+                f"the preprocessor {preprocessor.n_features_in_}"
+            )
+        frozen = copy.deepcopy(preprocessor)
+        frozen.fill_values_ = stats.fill_values.copy()
+        return frozen
+
+    def train(self, X_train, y_train, partition_id: str = None, fill_values=None, chunksize: int = 100_000,
+              fit_intercept: bool = True):
+        """
+        Fold a new partition into the statistics and refit.
+
+        Args:
+            X_train (np.ndarray): Training data of the new partition only
+            y_train (np.ndarray): Training labels of the new partition only
+            partition_id (str): Stable identifier of the partition, e.g. its
+                month; partitions already folded in are skipped
+            fill_values (np.ndarray, optional): Fill values X_train was preprocessed
+                with, stored when the statistics are created
+            chunksize (int): Rows accumulated per chunk
+            fit_intercept (bool): Whether to estimate an intercept
+
+        Returns:
+            LinearRegression: Model fitted on every partition seen so far
+        """
+        X = np.asarray(X_train, dtype=np.float64)
+        y = np.asarray(y_train, dtype=np.float64).ravel()
+        batches = ((X[start:start + chunksize], y[start:start + chunksize])
+                   for start in range(0, max(X.shape[0], 1), chunksize))
+        return self.train_batches(batches, partition_id, fill_values, fit_intercept)
+
+    @profiled()
+    def train_batches(self, batches: Iterable[Tuple[np.ndarray, np.ndarray]], partition_id: str = None,
+                      fill_values=None, fit_intercept: bool = True):
+        """
+        Fold a new partition that arrives in batches into the statistics and refit.
+
+        The batches are not consumed when the partition was already folded in,
+        so a streamed source is not read again.
+
+        Args:
+            batches (Iterable[Tuple[np.ndarray, np.ndarray]]): Preprocessed (X, y) batches of the new partition
+            partition_id (str): Stable identifier of the partition
+            fill_values (np.ndarray, optional): Fill values the batches were preprocessed
+                with, stored when the statistics are created
+            fit_intercept (bool): Whether to estimate an intercept
+
+        Returns:
+            LinearRegression: Model fitted on every partition seen so far
+        """
+        from sklearn.linear_model import LinearRegression
+
+        try:
+            if partition_id is None:
+                raise ValueError("Incremental training needs the id of the new partition")
+            stats = LinearSufficientStatistics.load(self.state_path) if os.path.exists(self.state_path) else None
+
+            if stats is not None and partition_id in stats.partitions:
+                logging.info(f"Partition {partition_id} already folded in; reusing statistics.")
+            else:
+                for X, y in batches:
+                    if stats is None:
+                        stats = LinearSufficientStatistics(np.shape(X)[1], fill_values)
+                    stats.update(X, y)
+                if stats is None:
+                    raise ValueError(f"Partition {partition_id} has no rows")
+                stats.partitions.append(partition_id)
+                stats.save(self.state_path)
+
+            coef, intercept = stats.solve(fit_intercept)
+            reg = LinearRegression(fit_intercept=fit_intercept)
+            reg.coef_ = coef
+            reg.intercept_ = intercept
+            reg.n_features_in_ = coef.shape[0]
+            logging.info(
+                f"Incremental linear regression solved on {stats.n_samples} rows "
+                f"from {len(stats.partitions)} partitions."
+            )
+            return reg
+        except Exception as e:
+            logging.error(f"Error occurred during incremental model training: {str(e)}")
+            raise e
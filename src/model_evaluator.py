@@ -1,7 +1,7 @@
 import logging
 from abc import ABC, abstractmethod
 import numpy as np
-from sklearn.metrics import mean_squared_error, r2_score, root_mean_squared_error
+from src.profiling import profiled
 
 class Evaluation(ABC):
     """
@@ -22,6 +22,7 @@ class MSE(Evaluation):
     """
     This class calculates the Mean Squared Error (MSE) for model evaluation.
     """
+    @profiled()
     def calculate_scores(self, y_true: np.ndarray, y_pred: np.ndarray):
         """
         Calculate the Mean Squared Error (MSE) for model evaluation.
@@ -33,6 +34,8 @@ class MSE(Evaluation):
         Returns:
             mse (float): Mean Squared Error
         """
+        from sklearn.metrics import mean_squared_error
+
         try:
             logging.info("Calculating mean squared error")
             mse = mean_squared_error(y_true=y_true, y_pred=y_pred)
@@ -46,6 +49,7 @@ class R2_score(Evaluation):
     """
     This class calculates the R-squared score (R2) for model evaluation.
     """
+    @profiled()
     def calculate_scores(self, y_true: np.ndarray, y_pred: np.ndarray):
         """
         Calculate the R-squared score (R2) for model evaluation.
@@ -57,6 +61,8 @@ class R2_score(Evaluation):
         Returns:
             r2 (float): R-squared score
         """
+        from sklearn.metrics import r2_score
+
         try:
             logging.info("Calculating R-squared score")
             r2 = r2_score(y_true=y_true, y_pred=y_pred)
@@ -70,6 +76,7 @@ class RMSE(Evaluation):
     """
     This class calculates the Root Mean Squared Error (RMSE) for model evaluation.
     """
+    @profiled()
     def calculate_scores(self, y_true: np.ndarray, y_pred: np.ndarray):
         """
         Calculate the Root Mean Squared Error (RMSE) for model evaluation.
@@ -81,6 +88,8 @@ class RMSE(Evaluation):
         Returns:
             rmse (float): Root Mean Squared Error
         """
+        from sklearn.metrics import root_mean_squared_error
+
         try:
             logging.info("Calculating root mean squared error")
             rmse = root_mean_squared_error(y_true=y_true, y_pred=y_pred)
@@ -88,4 +97,253 @@ class RMSE(Evaluation):
             return rmse
         except Exception as e:
             logging.error(f"Error occurred during RMSE calculation: {str(e)}")
-            raise e
\ No newline at end of file
+            raise e
+
+class RegressionMetricsAccumulator:
+    """
+    This class accumulates streaming sums for MSE, RMSE, MAE and R², overall and per segment.
+
+    Each batch is reduced to counts, means, centred sums of squares and error sums,
+    which are merged with Chan's parallel formula, so predictions never have to be
+    held in memory at once.
+    """
+    def __init__(self):
+        self.n = np.zeros(0)
+        self.mean_y = np.zeros(0)
+        self.m2_y = np.zeros(0)
+        self.sse = np.zeros(0)
+        self.sae = np.zeros(0)
+
+    def _grow(self, size: int):
+        if size > self.n.size:
+            pad = size - self.n.size
+            for name in ("n", "mean_y", "m2_y", "sse", "sae"):
+                setattr(self, name, np.concatenate([getattr(self, name), np.zeros(pad)]))
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray, segments: np.ndarray = None) -> "RegressionMetricsAccumulator":
+        """
+        Fold a batch of predictions into the sums.
+
+        Args:
+            y_true (np.ndarray): True labels
+            y_pred (np.ndarray): Predicted labels
+            segments (np.ndarray, optional): Non-negative integer segment code per row;
+                slot 0 is used for every row when omitted
+        Returns:
+            self: The updated accumulator
+        """
+        y_true = np.asarray(y_true, dtype=np.float64).ravel()
+        y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
+        codes = np.zeros(y_true.size, dtype=np.intp) if segments is None else np.asarray(segments, dtype=np.intp)
+        size = int(codes.max()) + 1 if codes.size else 1
+        self._grow(size)
+
+        err = y_pred - y_true
+        n = np.bincount(codes, minlength=size).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.bincount(codes, weights=y_true, minlength=size) / n
+        mean = np.nan_to_num(mean)
+        centred = y_true - mean[codes]
+        m2 = np.bincount(codes, weights=centred * centred, minlength=size)
+        sse = np.bincount(codes, weights=err * err, minlength=size)
+        sae = np.bincount(codes, weights=np.abs(err), minlength=size)
+
+        n_a = self.n[:size]
+        total = n_a + n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean - self.mean_y[:size]
+            self.mean_y[:size] = np.where(total > 0, self.mean_y[:size] + delta * n / total, 0.0)
+            self.m2_y[:size] += m2 + np.where(total > 0, delta * delta * n_a * n / total, 0.0)
+        self.n[:size] = total
+        self.sse[:size] += sse
+        self.sae[:size] += sae
+        return self
+
+    @staticmethod
+    def _scores(n, m2_y, sse, sae) -> dict:
+        mse = sse / n
+        return {
+            "MSE": float(mse),
+            "RMSE": float(np.sqrt(mse)),
+            "MAE": float(sae / n),
+            "r2_score": float(1.0 - sse / m2_y) if m2_y > 0 else float("nan"),
+        }
+
+    def result(self) -> dict:
+        """
+        Overall metrics across every row seen.
+
+        Returns:
+            dict: MSE, RMSE, MAE and r2_score
+        """
+        n = self.n.sum()
+        if n == 0:
+            raise ValueError("No predictions have been accumulated")
+        # Combine the per-segment moments into the overall centred sum of squares.
+        mean = (self.n * self.mean_y).sum() / n
+        m2 = self.m2_y.sum() + (self.n * (self.mean_y - mean) ** 2).sum()
+        return self._scores(n, m2, self.sse.sum(), self.sae.sum())
+
+    def segment_results(self) -> dict:
+        """
+        Metrics for every segment code that received at least one row.
+
+        Returns:
+            dict: Segment code -> metrics dict
+        """
+        return {
+            code: self._scores(self.n[code], self.m2_y[code], self.sse[code], self.sae[code])
+            for code in np.flatnonzero(self.n)
+        }
+
+
+class RegressionMetrics(Evaluation):
+    """
+    This class calculates MSE, RMSE, MAE and R² together in one vectorised pass.
+    """
+    @profiled()
+    def calculate_scores(self, y_true: np.ndarray, y_pred: np.ndarray, segments: np.ndarray = None):
+        """
+        Calculate every regression metric at once.
+
+        Args:
+            y_true (np.ndarray): True labels
+            y_pred (np.ndarray): Predicted labels
+            segments (np.ndarray, optional): Segment label per row for a per-segment breakdown
+
+        Returns:
+            scores (dict): MSE, RMSE, MAE and r2_score, plus ``segments`` mapping each
+                segment label to its own metrics when ``segments`` is given
+        """
+        try:
+            logging.info("Calculating regression metrics")
+            accumulator = RegressionMetricsAccumulator()
+            if segments is None:
+                accumulator.update(y_true, y_pred)
+                scores = accumulator.result()
+            else:
+                labels, codes = np.unique(np.asarray(segments), return_inverse=True)
+                accumulator.update(y_true, y_pred, codes)
+                scores = accumulator.result()
+                # Object arrays (e.g. a string column's to_numpy()) hold plain Python values without .item()
+                scores["segments"] = {
+                    labels[code].item() if hasattr(labels[code], "item") else labels[code]: s
+                    for code, s in accumulator.segment_results().items()
+                }
+            logging.info(f"Regression metrics: MSE={scores['MSE']}, RMSE={scores['RMSE']}, "
+                         f"MAE={scores['MAE']}, R2={scores['r2_score']}")
+            return scores
+        except Exception as e:
+            logging.error(f"Error occurred during regression metrics calculation: {str(e)}")
+            raise e
+
+
+def _bootstrap_batch(columns: np.ndarray, n_resamples: int, seed, batch_size: int) -> np.ndarray:
+    """
+    Resample rows with batched index matrices and reduce each resample to its sums.
+
+    Each batch draws a (batch, n) index matrix, turns it into per-row counts with a
+    single bincount over offset indices, and reduces every resample with one
+    (batch, n) @ (n, 4) matrix product.
+
+    Args:
+        columns (np.ndarray): (n, 4) array of squared error, absolute error, centred y and its square
+        n_resamples (int): Resamples to draw
+        seed: Seed or SeedSequence for this batch
+        batch_size (int): Resamples drawn per count matrix
+
+    Returns:
+        np.ndarray: (n_resamples, 4) weighted column sums
+    """
+    rng = np.random.default_rng(seed)
+    n = columns.shape[0]
+    sums = np.empty((n_resamples, columns.shape[1]))
+    for start in range(0, n_resamples, batch_size):
+        stop = min(start + batch_size, n_resamples)
+        size = stop - start
+        idx = rng.integers(0, n, size=(size, n))
+        idx += np.arange(size)[:, None] * n
+        counts = np.bincount(idx.ravel(), minlength=size * n).reshape(size, n)
+        sums[start:stop] = counts.astype(np.float64) @ columns
+    return sums
+
+
+class BootstrapMetrics(Evaluation):
+    """
+    This class calculates bootstrap confidence intervals for MSE, RMSE, MAE and R².
+
+    Thousands of resamples are drawn at once as index matrices and reduced with a
+    single matrix product per batch, optionally spread over several processes.
+    """
+    def __init__(self, n_resamples: int = 2000, confidence: float = 0.95, n_workers: int = 1,
+                 seed: int = 42, memory_budget_mb: int = 256):
+        """
+        Args:
+            n_resamples (int): Number of bootstrap resamples
+            confidence (float): Confidence level of the intervals
+            n_workers (int): Processes drawing resamples in parallel
+            seed (int): Seed for the resampling
+            memory_budget_mb (int): Upper bound on the index and count matrices of a batch
+        """
+        self.n_resamples = n_resamples
+        self.confidence = confidence
+        self.n_workers = n_workers
+        self.seed = seed
+        self.memory_budget_mb = memory_budget_mb
+
+    @profiled()
+    def calculate_scores(self, y_true: np.ndarray, y_pred: np.ndarray):
+        """
+        Calculate point estimates and bootstrap confidence intervals.
+
+        Args:
+            y_true (np.ndarray): True labels
+            y_pred (np.ndarray): Predicted labels
+
+        Returns:
+            scores (dict): Metric name -> {"value", "lower", "upper"}
+        """
+        try:
+            logging.info(f"Calculating bootstrap confidence intervals ({self.n_resamples} resamples)")
+            y_true = np.asarray(y_true, dtype=np.float64).ravel()
+            y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
+            err = y_pred - y_true
+            n = y_true.size
+            # y is centred on its mean first, so SST below does not subtract two
+            # large, nearly equal sums when the mean is large next to the spread
+            centred = y_true - y_true.mean()
+            columns = np.column_stack([err * err, np.abs(err), centred, centred * centred])
+            batch_size = max(1, (self.memory_budget_mb << 20) // (24 * n))
+
+            seeds = np.random.SeedSequence(self.seed).spawn(self.n_workers)
+            shares = np.array_split(np.arange(self.n_resamples), self.n_workers)
+            if self.n_workers == 1:
+                sums = _bootstrap_batch(columns, self.n_resamples, seeds[0], batch_size)
+            else:
+                from concurrent.futures import ProcessPoolExecutor
+
+                with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                    futures = [
+                        pool.submit(_bootstrap_batch, columns, share.size, seed, batch_size)
+                        for share, seed in zip(shares, seeds)
+                    ]
+                    sums = np.concatenate([future.result() for future in futures])
+
+            sse, sae, sum_c, sum_c2 = sums.T
+            mse = sse / n
+            sst = sum_c2 - sum_c * sum_c / n
+            with np.errstate(invalid="ignore", divide="ignore"):
+                r2 = np.where(sst > 0, 1.0 - sse / sst, np.nan)
+            samples = {"MSE": mse, "RMSE": np.sqrt(mse), "MAE": sae / n, "r2_score": r2}
+
+            point = RegressionMetrics().calculate_scores(y_true, y_pred)
+            alpha = (1.0 - self.confidence) / 2
+            scores = {}
+            for name, values in samples.items():
+                lower, upper = np.nanquantile(values, [alpha, 1.0 - alpha])
+                scores[name] = {"value": point[name], "lower": float(lower), "upper": float(upper)}
+            logging.info(f"Bootstrap R2 interval: [{scores['r2_score']['lower']}, {scores['r2_score']['upper']}]")
+            return scores
+        except Exception as e:
+            logging.error(f"Error occurred during bootstrap evaluation: {str(e)}")
+            raise e
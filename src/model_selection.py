@@ -0,0 +1,157 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.model_dev import get_model
+from src.model_evaluator import MSE, RMSE, R2_score
+
+# Evaluation used to rank candidates, and whether larger scores are better
+SELECTION_METRICS = {
+    "rmse": (RMSE, False),
+    "mse": (MSE, False),
+    "r2": (R2_score, True),
+}
+
+
+class SharedArrays:
+    """
+    This class places NumPy arrays in shared memory so worker processes can read them without a pickled copy.
+
+    Use it as a context manager in the parent process; pass ``specs`` to the workers
+    and rebuild the arrays there with ``attach``.
+    """
+    def __init__(self, **arrays: np.ndarray):
+        """
+        Args:
+            **arrays (np.ndarray): Arrays to share, by name
+        """
+        self._blocks = []
+        self.specs = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.specs[name] = (block.name, array.shape, array.dtype.str)
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+    @staticmethod
+    def attach(specs: Dict[str, Tuple[str, tuple, str]]):
+        """
+        Map shared arrays into the current process as read-only views.
+
+        Args:
+            specs (Dict[str, Tuple[str, tuple, str]]): ``SharedArrays.specs`` from the parent
+        Returns:
+            Tuple[Dict[str, np.ndarray], List[SharedMemory]]: The views and the blocks
+                backing them; close the blocks once the views are no longer used
+        """
+        arrays, blocks = {}, []
+        for name, (block_name, shape, dtype) in specs.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            view.flags.writeable = False
+            arrays[name] = view
+            blocks.append(block)
+        return arrays, blocks
+
+
+def _train_candidate(name: str, specs: dict, metric: str, model_kwargs: dict) -> Tuple[str, float]:
+    # Only the score goes back to the parent: the winner is refitted there, so
+    # pickling every fitted candidate across processes would be wasted work.
+    arrays, blocks = SharedArrays.attach(specs)
+    try:
+        model = get_model(name).train(arrays["X_train"], arrays["y_train"], **model_kwargs)
+        prediction = model.predict(arrays["X_val"])
+        score = SELECTION_METRICS[metric][0]().calculate_scores(arrays["y_val"], prediction)
+        return name, float(score)
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+
+
+class CandidateSelection:
+    """
+    This class trains several registered models concurrently and keeps the best one.
+
+    Candidates are ranked on a validation split carved from the training data,
+    so the test split stays unseen for the reported metrics; the winner is then
+    refitted on all training rows.
+    """
+    def __init__(
+        self,
+        model_names: List[str],
+        metric: str = "rmse",
+        n_workers: Optional[int] = None,
+        threads_per_worker: int = 1,
+        validation_fraction: float = 0.2,
+        random_state: int = 42,
+    ):
+        """
+        Args:
+            model_names (List[str]): Names from MODEL_REGISTRY to train
+            metric (str): One of SELECTION_METRICS, computed on the validation split
+            n_workers (int, optional): Worker processes; defaults to one per candidate,
+                capped at the CPU count
+            threads_per_worker (int): ``n_jobs`` passed to each model, to avoid
+                oversubscribing cores
+            validation_fraction (float): Share of the training rows held out for ranking
+            random_state (int): Seed of the validation split
+        """
+        if metric not in SELECTION_METRICS:
+            raise ValueError(f"Unsupported selection metric: {metric}")
+        self.model_names = model_names
+        self.metric = metric
+        self.n_workers = n_workers or min(len(model_names), os.cpu_count() or 1)
+        self.threads_per_worker = threads_per_worker
+        self.validation_fraction = validation_fraction
+        self.random_state = random_state
+
+    def train(self, X_train, y_train):
+        """
+        Train every candidate and select the best by the evaluation metric.
+
+        Args:
+            X_train (np.ndarray): Training data
+            y_train (np.ndarray): Training labels
+
+        Returns:
+            Tuple[str, object, Dict[str, float]]: Best model name, the model refitted
+                on all of X_train, and the validation score of every candidate
+        """
+        try:
+            higher_is_better = SELECTION_METRICS[self.metric][1]
+            model_kwargs = {"n_jobs": self.threads_per_worker}
+            X = np.asarray(X_train, dtype=np.float64)
+            y = np.asarray(y_train, dtype=np.float64).ravel()
+            order = np.random.default_rng(self.random_state).permutation(len(y))
+            n_val = max(int(len(y) * self.validation_fraction), 1)
+            val_idx, fit_idx = np.sort(order[:n_val]), np.sort(order[n_val:])
+            with SharedArrays(X_train=X[fit_idx], y_train=y[fit_idx], X_val=X[val_idx], y_val=y[val_idx]) as shared:
+                with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                    futures = [
+                        pool.submit(_train_candidate, name, shared.specs, self.metric, model_kwargs)
+                        for name in self.model_names
+                    ]
+                    results = [future.result() for future in futures]
+
+            scores = dict(results)
+            pick = max if higher_is_better else min
+            best_name = pick(scores, key=scores.get)
+            logging.info(f"Candidate validation scores ({self.metric}): {scores}; selected {best_name}.")
+            return best_name, get_model(best_name).train(X, y), scores
+        except Exception as e:
+            logging.error(f"Error occurred during candidate model selection: {str(e)}")
+            raise e
@@ -0,0 +1,174 @@
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data_cleanner import COLUMN_DTYPES
+
+# Kaggle file name, join keys and value columns of every raw Olist table
+OLIST_TABLES = {
+    "items": {
+        "file": "olist_order_items_dataset.csv",
+        "keys": ["order_id", "product_id"],
+        "columns": ["order_item_id", "seller_id", "shipping_limit_date", "price", "freight_value"],
+    },
+    "orders": {
+        "file": "olist_orders_dataset.csv",
+        "keys": ["order_id", "customer_id"],
+        "columns": ["order_status", "order_purchase_timestamp", "order_approved_at",
+                    "order_delivered_carrier_date", "order_delivered_customer_date",
+                    "order_estimated_delivery_date"],
+    },
+    "payments": {
+        "file": "olist_order_payments_dataset.csv",
+        "keys": ["order_id"],
+        "columns": ["payment_sequential", "payment_type", "payment_installments", "payment_value"],
+    },
+    "customers": {
+        "file": "olist_customers_dataset.csv",
+        "keys": ["customer_id"],
+        "columns": ["customer_unique_id", "customer_zip_code_prefix", "customer_city", "customer_state"],
+    },
+    "products": {
+        "file": "olist_products_dataset.csv",
+        "keys": ["product_id"],
+        "columns": ["product_category_name", "product_name_lenght", "product_description_lenght",
+                    "product_photos_qty", "product_weight_g", "product_length_cm", "product_height_cm",
+                    "product_width_cm"],
+    },
+    "reviews": {
+        "file": "olist_order_reviews_dataset.csv",
+        "keys": ["order_id"],
+        "columns": ["review_id", "review_score", "review_comment_title", "review_comment_message",
+                    "review_creation_date", "review_answer_timestamp"],
+    },
+}
+
+# Inner joins applied to the order items, in order: (table, key)
+JOIN_PLAN = [
+    ("orders", "order_id"),
+    ("payments", "order_id"),
+    ("customers", "customer_id"),
+    ("products", "product_id"),
+    ("reviews", "order_id"),
+]
+
+
+def hash_join(left_codes: np.ndarray, right_codes: np.ndarray, n_keys: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Inner-joins two integer key columns.
+
+    The right side is bucketed by key with a counting sort, so every left row
+    finds its matches by offset instead of by comparison; many-to-many keys
+    produce every pair, like ``pd.merge``.
+
+    Args:
+        left_codes (np.ndarray): Key code per left row; -1 never matches
+        right_codes (np.ndarray): Key code per right row; -1 never matches
+        n_keys (int): Number of distinct codes
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Positions of the joined rows in the left and right inputs
+    """
+    valid = right_codes >= 0
+    order = np.flatnonzero(valid)[np.argsort(right_codes[valid], kind="stable")]
+    counts = np.bincount(right_codes[valid], minlength=n_keys)
+    starts = np.cumsum(counts) - counts
+
+    left_rows = np.flatnonzero(left_codes >= 0)
+    matches = counts[left_codes[left_rows]]
+    left_idx = np.repeat(left_rows, matches)
+    # Rank of every output row among the matches of its left row
+    within = np.arange(len(left_idx)) - np.repeat(np.cumsum(matches) - matches, matches)
+    right_idx = order[np.repeat(starts[left_codes[left_rows]], matches) + within]
+    return left_idx, right_idx
+
+
+def encode_keys(*columns: pd.Series) -> Tuple[List[np.ndarray], int]:
+    """
+    Maps the values of one key across several tables onto shared integer codes.
+
+    Returns:
+        Tuple[List[np.ndarray], int]: Codes per column (-1 for nulls) and the number of distinct keys
+    """
+    codes, uniques = pd.factorize(pd.concat(columns, ignore_index=True))
+    bounds = np.cumsum([0] + [len(column) for column in columns])
+    return [codes[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])], len(uniques)
+
+
+class OlistTableJoin:
+    """
+    This class builds the wide orders table from the raw Olist tables.
+
+    Each table is read with only its join keys and the requested columns, using
+    the compact dtypes of COLUMN_DTYPES. String keys are encoded once into
+    shared integer codes; the joins then only combine position arrays, and the
+    requested columns are gathered a single time at the end.
+    """
+    def __init__(self, data_dir: str, columns: List[str], files: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            data_dir (str): Directory holding the raw tables
+            columns (List[str]): Columns of the joined output
+            files (Dict[str, str], optional): File name per table, overriding OLIST_TABLES
+        """
+        # Value columns belong to their table; a key column is taken from the
+        # first table in join order that holds it.
+        owners = {}
+        for table in ["items"] + [t for t, _ in JOIN_PLAN]:
+            for key in OLIST_TABLES[table]["keys"]:
+                owners.setdefault(key, table)
+        for table, spec in OLIST_TABLES.items():
+            owners.update({column: table for column in spec["columns"]})
+        unknown = [column for column in columns if column not in owners]
+        if unknown:
+            raise ValueError(f"Columns not found in the Olist tables: {unknown}")
+        self.data_dir = data_dir
+        self.columns = columns
+        self.files = {table: (files or {}).get(table, spec["file"]) for table, spec in OLIST_TABLES.items()}
+        self._owners = owners
+
+    def paths(self) -> Dict[str, str]:
+        return {table: os.path.join(self.data_dir, name) for table, name in self.files.items()}
+
+    def read_table(self, table: str) -> pd.DataFrame:
+        """
+        Reads a table's join keys plus the requested columns it holds.
+        """
+        spec = OLIST_TABLES[table]
+        wanted = [c for c in self.columns if c in spec["columns"] and c not in spec["keys"]]
+        usecols = spec["keys"] + wanted
+        dtypes = {c: COLUMN_DTYPES[c] for c in wanted if c in COLUMN_DTYPES}
+        return pd.read_csv(self.paths()[table], usecols=usecols, dtype=dtypes)
+
+    def join(self) -> pd.DataFrame:
+        """
+        Joins the tables and returns the requested columns.
+        """
+        tables = {table: self.read_table(table) for table in OLIST_TABLES}
+        # One review per order: Olist has a few orders reviewed twice; keep the last one listed.
+        tables["reviews"] = tables["reviews"].drop_duplicates("order_id", keep="last").reset_index(drop=True)
+
+        codes = {}
+        for key in {key for _, key in JOIN_PLAN}:
+            holders = [table for table, spec in OLIST_TABLES.items() if key in spec["keys"]]
+            encoded, n_keys = encode_keys(*(tables[table][key] for table in holders))
+            codes[key] = ({table: c for table, c in zip(holders, encoded)}, n_keys)
+
+        # Row positions of every table in the output, starting from the order items
+        positions = {"items": np.arange(len(tables["items"]))}
+        for table, key in JOIN_PLAN:
+            table_codes, n_keys = codes[key]
+            source = next(t for t in positions if key in OLIST_TABLES[t]["keys"])
+            left_idx, right_idx = hash_join(table_codes[source][positions[source]], table_codes[table], n_keys)
+            positions = {t: p[left_idx] for t, p in positions.items()}
+            positions[table] = right_idx
+
+        out = {}
+        for column in self.columns:
+            table = self._owners[column]
+            out[column] = tables[table][column].take(positions[table]).reset_index(drop=True)
+        joined = pd.DataFrame(out)
+        logging.info(f"Joined {len(joined)} rows from {self.data_dir}")
+        return joined
@@ -0,0 +1,85 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+
+class PredictionCache:
+    """
+    This class caches predictions by feature vector, with LRU and TTL eviction.
+
+    Keys are the bytes of a canonical (filled, float64) feature row; the cache
+    belongs to one model version and is emptied when ``set_version`` sees a new
+    one, so a redeployed model never serves its predecessor's results. Lookup
+    and store latencies and hit/miss/eviction counts are kept for ``stats``.
+    """
+    def __init__(self, max_entries: int = 100_000, ttl_s: float = 3600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_entries (int): Entries kept before the least recently used is evicted
+            ttl_s (float): Seconds an entry stays valid after it was stored
+            clock (Callable[[], float]): Time source, in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.clock = clock
+        self.version: Optional[str] = None
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self.hits = self.misses = self.expired = self.evicted = self.invalidations = 0
+        self.lookup_s = 0.0
+        self.lookups = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def set_version(self, version: str):
+        """
+        Binds the cache to a model version, dropping every entry if it changed.
+        """
+        if version != self.version:
+            if self.version is not None:
+                self.invalidations += 1
+            self._entries.clear()
+            self.version = version
+
+    def get(self, key: bytes) -> Optional[float]:
+        """
+        Returns the cached prediction, or None on a miss or an expired entry.
+        """
+        start = time.perf_counter()
+        entry = self._entries.get(key)
+        if entry is not None and self.clock() - entry[1] > self.ttl_s:
+            del self._entries[key]
+            self.expired += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        self.lookups += 1
+        self.lookup_s += time.perf_counter() - start
+        return None if entry is None else entry[0]
+
+    def put(self, key: bytes, prediction: float):
+        self._entries[key] = (prediction, self.clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evicted += 1
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the counters, the hit rate and the mean lookup latency in microseconds.
+        """
+        return {
+            "version": self.version,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "invalidations": self.invalidations,
+            "mean_lookup_us": round(self.lookup_s / self.lookups * 1e6, 3) if self.lookups else 0.0,
+        }
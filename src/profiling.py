@@ -0,0 +1,231 @@
+import cProfile
+import functools
+import inspect
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(REPO_ROOT, "artifacts", "profiles"))
+# Comma-separated step or call names to run under cProfile, e.g. "train_model"
+CPROFILE_TARGETS = {name for name in os.environ.get("PROFILE_STEPS", "").split(",") if name}
+
+# Records of the current top-level step, in completion order; cleared when it is flushed
+RECORDS: List[Dict] = []
+_depth = 0
+# Last MLflow run of the process when the current top-level step started
+_previous_run_id: Optional[str] = None
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def count_rows(obj) -> Optional[int]:
+    """
+    Returns the number of rows of a DataFrame, Series or array, or None.
+    """
+    shape = getattr(obj, "shape", None)
+    if shape:
+        return int(shape[0])
+    try:
+        return len(obj)
+    except TypeError:
+        return None
+
+
+class StepProfile:
+    """
+    This class holds the measurements of one profiled block.
+
+    Set ``rows`` inside the block to get rows/second in the record.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.rows: Optional[int] = None
+        self.record: Dict = {}
+
+
+@contextmanager
+def profile_step(name: str, rows: Optional[int] = None):
+    """
+    Measures wall time, CPU time, peak RSS and throughput of a block.
+
+    The outermost block (a pipeline step) logs every record collected within it
+    as MLflow metrics to its MLflow run, if it used one, and appends them
+    to the pipeline run's JSON profile under ``PROFILE_DIR``. Names listed in
+    ``PROFILE_STEPS`` additionally run under cProfile, with the stats dumped next
+    to the JSON profile. Blocks in worker processes (model selection, tuning and
+    cross-validation pools) are not recorded: their parent's step covers them.
+
+    Args:
+        name (str): Step or call name
+        rows (int, optional): Rows processed, if known up front
+
+    Yields:
+        StepProfile: Set its ``rows`` attribute once the row count is known
+    """
+    global _depth, _previous_run_id
+    profile = StepProfile(name)
+    profile.rows = rows
+    if multiprocessing.parent_process() is not None:
+        yield profile
+        return
+    profiler = cProfile.Profile() if name in CPROFILE_TARGETS else None
+    if _depth == 0:
+        _previous_run_id = _last_run_id()
+    _depth += 1
+    wall, cpu = time.perf_counter(), time.process_time()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield profile
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        _depth -= 1
+        profile.record = {
+            "name": name,
+            "depth": _depth,
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "rows": profile.rows,
+            "rows_per_s": round(profile.rows / wall, 1) if profile.rows and wall > 0 else None,
+        }
+        RECORDS.append(profile.record)
+        if profiler is not None:
+            _dump_cprofile(name, profiler)
+        if _depth == 0:
+            _flush(profile.record)
+
+
+def profiled(name: Optional[str] = None, rows_from: Optional[str] = None):
+    """
+    Decorator form of ``profile_step`` for pipeline steps and hot methods.
+
+    Args:
+        name (str, optional): Record name; defaults to ``<Class>.<method>`` for
+            methods and the function name otherwise
+        rows_from (str, optional): Argument whose rows are counted, or ``"return"``
+            to count the result; defaults to the first argument after ``self``
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        params = list(signature.parameters)
+        is_method = bool(params) and params[0] == "self"
+        source = rows_from or (params[1:2] if is_method else params[:1] or [None])[0]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            label = name or (f"{type(args[0]).__name__}.{func.__name__}" if is_method else func.__name__)
+            with profile_step(label) as profile:
+                result = func(*args, **kwargs)
+                if source == "return":
+                    counted = result[0] if isinstance(result, tuple) else result
+                else:
+                    counted = signature.bind_partial(*args, **kwargs).arguments.get(source)
+                profile.rows = count_rows(counted) if counted is not None else None
+                return result
+        return wrapper
+    return decorator
+
+
+def _last_run_id() -> Optional[str]:
+    mlflow = sys.modules.get("mlflow")
+    run = mlflow.last_active_run() if mlflow is not None else None
+    return run.info.run_id if run is not None else None
+
+
+def _mlflow_run_id() -> Optional[str]:
+    """
+    Returns the active MLflow run, or the run the current step started and already ended.
+
+    MLflow is only consulted when the step already imported it. A step that
+    used no run of its own gets None, so its metrics never land in the run of
+    an earlier step or pipeline.
+    """
+    mlflow = sys.modules.get("mlflow")
+    if mlflow is None:
+        return None
+    run = mlflow.active_run()
+    if run is not None:
+        return run.info.run_id
+    run_id = _last_run_id()
+    return run_id if run_id != _previous_run_id else None
+
+
+def _run_name() -> str:
+    if "zenml" in sys.modules:
+        try:
+            from zenml import get_step_context
+
+            return get_step_context().pipeline_run.name
+        except Exception:
+            pass
+    return f"process-{os.getpid()}"
+
+
+def _dump_cprofile(name: str, profiler: cProfile.Profile):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"{_run_name()}-{name}.prof")
+    profiler.dump_stats(path)
+    logging.info(f"cProfile stats for {name} written to {path}")
+    run_id = _mlflow_run_id()
+    if run_id is not None:
+        from mlflow.tracking import MlflowClient
+
+        MlflowClient().log_artifact(run_id, path, artifact_path="profiles")
+
+
+def _flush(step_record: Dict):
+    """
+    Logs the records of the finished step, appends them to the run's JSON profile and clears them.
+    """
+    step_records = list(RECORDS)
+    RECORDS.clear()
+    for record in step_records:
+        record["step"] = step_record["name"]
+
+    run_name = _run_name()
+    path = os.path.join(PROFILE_DIR, f"{run_name}.json")
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        records = []
+        if os.path.exists(path):
+            with open(path) as f:
+                records = json.load(f)["records"]
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"run": run_name, "records": records + step_records}, f, indent=2)
+        os.replace(tmp_path, path)
+    except (OSError, ValueError, KeyError) as e:
+        logging.warning(f"Could not write profile {path}: {e}")
+
+    logging.info(
+        f"{step_record['name']}: {step_record['wall_s']}s wall, {step_record['cpu_s']}s CPU, "
+        f"peak RSS {step_record['peak_rss_mb']} MB, rows/s {step_record['rows_per_s']}"
+    )
+    run_id = _mlflow_run_id()
+    if run_id is not None:
+        from mlflow.entities import Metric
+        from mlflow.tracking import MlflowClient
+
+        timestamp = int(time.time() * 1000)
+        metrics = {}
+        for record in step_records:
+            for key in ("wall_s", "cpu_s", "peak_rss_mb", "rows", "rows_per_s"):
+                if record[key] is not None:
+                    metrics[f"perf.{record['name']}.{key}"] = float(record[key])
+        client = MlflowClient()
+        client.log_batch(run_id, metrics=[Metric(k, v, timestamp, 0) for k, v in metrics.items()])
+        client.log_dict(run_id, {"run": run_name, "records": step_records}, f"profiles/{step_record['name']}.json")
@@ -0,0 +1,115 @@
+import numpy as np
+
+
+class QuantileSketch:
+    """
+    This class implements a mergeable approximate-quantile sketch (a simplified KLL sketch).
+
+    Values are buffered in level 0; whenever a level holds more than ``k`` items it is
+    sorted and every other item is promoted to the next level with twice the weight.
+    Memory stays at roughly ``k * log2(n / k)`` items and two sketches built over
+    different chunks can be merged into one describing their union.
+    """
+    def __init__(self, k: int = 2048, seed: int = 0):
+        """
+        Args:
+            k (int): Capacity of each level; larger values give more accurate quantiles
+            seed (int): Seed for the random offset used when compacting a level
+        """
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray) -> "QuantileSketch":
+        """
+        Add a batch of values to the sketch. NaNs are ignored.
+
+        Args:
+            values (np.ndarray): Values to add
+        Returns:
+            self: The updated sketch
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.count += values.size
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """
+        Fold another sketch into this one.
+
+        Args:
+            other (QuantileSketch): Sketch built over a different part of the data
+        Returns:
+            self: The merged sketch
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for height, items in enumerate(other.levels):
+            self.levels[height] = np.concatenate([self.levels[height], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the ``q``-quantile of every value seen so far.
+
+        Args:
+            q (float): Quantile in [0, 1]
+        Returns:
+            float: The estimated quantile, or NaN for an empty sketch
+        """
+        return float(self.quantiles(np.array([q]))[0])
+
+    def quantiles(self, qs: np.ndarray) -> np.ndarray:
+        """
+        Estimate several quantiles at once.
+
+        Args:
+            qs (np.ndarray): Quantiles in [0, 1]
+        Returns:
+            np.ndarray: The estimated quantiles
+        """
+        qs = np.asarray(qs, dtype=np.float64)
+        if self.count == 0:
+            return np.full(qs.shape, np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(level.size, 2.0 ** height) for height, level in enumerate(self.levels)]
+        )
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        # Midpoint rule so that the median of an even-sized exact sample averages
+        # the two central values, matching pandas' median.
+        targets = qs * (cumulative[-1] - 1) + 1
+        lower = np.searchsorted(cumulative, np.floor(targets), side="left")
+        upper = np.searchsorted(cumulative, np.ceil(targets), side="left")
+        frac = targets - np.floor(targets)
+        return items[lower] * (1 - frac) + items[upper] * frac
+
+    def median(self) -> float:
+        """
+        Estimate the median of every value seen so far.
+        """
+        return self.quantile(0.5)
+
+    def _compress(self):
+        height = 0
+        while height < len(self.levels):
+            level = self.levels[height]
+            if level.size > self.k:
+                level = np.sort(level)
+                # An odd item out stays on this level so no weight is lost.
+                keep = level[-1:] if level.size % 2 else level[:0]
+                paired = level[: level.size - keep.size]
+                promoted = paired[self._rng.integers(2)::2]
+                self.levels[height] = keep
+                if height + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                self.levels[height + 1] = np.concatenate([self.levels[height + 1], promoted])
+            height += 1
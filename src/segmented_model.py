@@ -0,0 +1,158 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin
+
+from src.data_cleanner import PreProcessTransformer
+from src.linear_artifact import segment_codes
+from src.model_selection import SharedArrays
+from src.profiling import profiled
+
+
+def group_offsets(codes: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Orders rows by group with a counting sort.
+
+    Args:
+        codes (np.ndarray): Group code of every row, in ``[0, n_groups)``
+        n_groups (int): Number of groups
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Row order that puts each group's rows
+            together, and the (n_groups + 1,) offsets of every group in it
+    """
+    order = np.argsort(codes, kind="stable")
+    offsets = np.zeros(n_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=n_groups), out=offsets[1:])
+    return order, offsets
+
+
+def fit_least_squares(X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Fits ordinary least squares with an intercept, like ``LinearRegression``.
+    """
+    x_mean, y_mean = X.mean(axis=0), y.mean()
+    coef = np.linalg.lstsq(X - x_mean, y - y_mean, rcond=None)[0]
+    return coef, float(y_mean - x_mean @ coef)
+
+
+def _fit_groups(X: np.ndarray, y: np.ndarray, offsets: np.ndarray, first: int, last: int,
+                min_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Rows of group g are X[offsets[g]:offsets[g + 1]]; groups too small to fit get NaN weights
+    coef = np.full((last - first, X.shape[1]), np.nan)
+    intercept = np.full(last - first, np.nan)
+    for i, group in enumerate(range(first, last)):
+        start, stop = offsets[group], offsets[group + 1]
+        if stop - start >= min_rows:
+            coef[i], intercept[i] = fit_least_squares(X[start:stop], y[start:stop])
+    return coef, intercept
+
+
+def _fit_groups_shared(specs: dict, first: int, last: int, min_rows: int):
+    arrays, blocks = SharedArrays.attach(specs)
+    try:
+        return _fit_groups(arrays["X"], arrays["y"], arrays["offsets"], first, last, min_rows)
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+
+
+def _partition_groups(offsets: np.ndarray, n_parts: int) -> List[Tuple[int, int]]:
+    """
+    Splits the groups into contiguous ranges holding about the same number of rows.
+    """
+    n_groups = len(offsets) - 1
+    bounds = np.searchsorted(offsets, np.linspace(0, offsets[-1], n_parts + 1)[1:-1])
+    bounds = np.unique(np.concatenate([[0], np.clip(bounds, 0, n_groups), [n_groups]]))
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+class SegmentedLinearRegression(BaseEstimator, RegressorMixin):
+    """
+    This class fits one linear regression per segment (e.g. customer state) and routes rows to them.
+
+    ``fit`` sorts the preprocessed rows by segment once; every segment is then a
+    contiguous slice of that matrix, and ranges of segments are fitted in
+    parallel processes that map it from shared memory. The weights are stacked
+    into ``coef_`` (n_segments + 1, n_features) and ``intercept_``, whose last
+    row is a global model used for unseen segments and segments with fewer
+    than ``min_segment_rows`` rows. ``predict`` gathers each row's weights by
+    its segment code instead of looping over segments.
+    """
+    def __init__(self, preprocessor=None, segment_column: str = "customer_state",
+                 min_segment_rows: int = 50, n_workers: Optional[int] = None):
+        """
+        Args:
+            preprocessor (PreProcessTransformer, optional): Fitted transformer selecting and filling
+                the features; when None, ``fit`` fits one on its training rows
+            segment_column (str): Raw column holding the segment of each row
+            min_segment_rows (int): Segments with fewer training rows use the global model
+            n_workers (int, optional): Fitting processes; defaults to the CPU count
+        """
+        self.preprocessor = preprocessor
+        self.segment_column = segment_column
+        self.min_segment_rows = min_segment_rows
+        self.n_workers = n_workers
+
+    @profiled(rows_from="X")
+    def fit(self, X, y) -> "SegmentedLinearRegression":
+        """
+        Fits the global model and every segment's model.
+
+        Args:
+            X (pd.DataFrame): Raw rows with the features and ``segment_column``
+            y: Labels
+        Returns:
+            self: The fitted estimator
+        """
+        self.preprocessor_ = self.preprocessor if self.preprocessor is not None else PreProcessTransformer().fit(X)
+        features = self.preprocessor_.transform(X)
+        labels = np.asarray(X[self.segment_column], dtype=str)
+        y = np.asarray(y, dtype=np.float64).ravel()
+        self.segments_, codes = np.unique(labels, return_inverse=True)
+        n_segments = len(self.segments_)
+        order, offsets = group_offsets(codes, n_segments)
+
+        global_coef, global_intercept = fit_least_squares(features, y)
+        n_workers = min(self.n_workers or os.cpu_count() or 1, n_segments)
+        ranges = _partition_groups(offsets, n_workers)
+        sorted_X, sorted_y = features[order], y[order]
+        if n_workers <= 1:
+            parts = [_fit_groups(sorted_X, sorted_y, offsets, first, last, self.min_segment_rows)
+                     for first, last in ranges]
+        else:
+            with SharedArrays(X=sorted_X, y=sorted_y, offsets=offsets) as shared:
+                with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                    futures = [pool.submit(_fit_groups_shared, shared.specs, first, last, self.min_segment_rows)
+                               for first, last in ranges]
+                    parts = [future.result() for future in futures]
+
+        coef = np.vstack([part[0] for part in parts] + [global_coef[None, :]])
+        intercept = np.concatenate([part[1] for part in parts] + [[global_intercept]])
+        fallback = np.isnan(intercept)
+        coef[fallback], intercept[fallback] = global_coef, global_intercept
+
+        self.coef_, self.intercept_ = coef, intercept
+        self.segment_rows_ = np.diff(offsets)
+        self.feature_names_in_ = self.preprocessor_.feature_names_in_
+        self.fill_values_ = self.preprocessor_.fill_values_
+        self.n_features_in_ = len(self.feature_names_in_)
+        logging.info(f"Fitted {n_segments - int(fallback.sum())} of {n_segments} {self.segment_column} "
+                     f"segments; the rest use the global model")
+        return self
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Scores every row with the model of its segment.
+
+        Args:
+            X (pd.DataFrame): Raw rows with the features and ``segment_column``
+        Returns:
+            np.ndarray: (n_rows,) predictions
+        """
+        rows = self.preprocessor_.transform(X)
+        codes = segment_codes(self.segments_, X[self.segment_column])
+        return np.einsum("ij,ij->i", rows, self.coef_[codes]) + self.intercept_[codes]
@@ -0,0 +1,173 @@
+import functools
+import hashlib
+import logging
+import os
+import pickle
+from typing import Any, Iterable, Optional
+
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.environ.get("STEP_CACHE_DIR", os.path.join(REPO_ROOT, "artifacts", "step_cache"))
+DEFAULT_MAX_BYTES = int(os.environ.get("STEP_CACHE_MAX_BYTES", 5 * 1024 ** 3))
+SAMPLE_BLOCKS = 16
+SAMPLE_BLOCK_SIZE = 64 * 1024
+# Set STEP_CACHE=0 to always recompute
+CACHE_ENABLED = os.environ.get("STEP_CACHE", "1") != "0"
+
+
+def fingerprint_file(path: str, sample_blocks: int = SAMPLE_BLOCKS, block_size: int = SAMPLE_BLOCK_SIZE) -> str:
+    """
+    Fingerprints a file from its size, mtime and evenly spaced content samples.
+
+    Args:
+        path (str): File to fingerprint
+        sample_blocks (int): Number of blocks hashed, including the first and last
+        block_size (int): Bytes per sampled block
+    Returns:
+        str: Hex digest
+    """
+    stat = os.stat(path)
+    digest = hashlib.sha256(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(path, "rb") as f:
+        if stat.st_size <= sample_blocks * block_size:
+            digest.update(f.read())
+        else:
+            last = stat.st_size - block_size
+            for i in range(sample_blocks):
+                f.seek(last * i // (sample_blocks - 1))
+                digest.update(f.read(block_size))
+    return digest.hexdigest()
+
+
+def fingerprint_frame(data: Any) -> str:
+    """
+    Fingerprints a DataFrame or Series from its labels, dtypes and row hashes.
+    """
+    digest = hashlib.sha256()
+    if isinstance(data, pd.DataFrame):
+        digest.update(repr(list(zip(data.columns, map(str, data.dtypes)))).encode())
+    else:
+        digest.update(f"{data.name}:{data.dtype}".encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def fingerprint_object(obj: Any) -> str:
+    """
+    Fingerprints any picklable object (configs, fitted transformers) by its pickle bytes.
+    """
+    return hashlib.sha256(pickle.dumps(obj, protocol=4)).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def source_fingerprint(dirs: Iterable[str] = ("src", "steps")) -> str:
+    """
+    Fingerprints the Python sources under the given repository directories.
+
+    Computed once per process; any code change produces a new key.
+    """
+    digest = hashlib.sha256()
+    for directory in dirs:
+        for root, subdirs, files in os.walk(os.path.join(REPO_ROOT, directory)):
+            subdirs[:] = sorted(d for d in subdirs if d != "__pycache__")
+            for name in sorted(files):
+                if name.endswith(".py"):
+                    path = os.path.join(root, name)
+                    digest.update(os.path.relpath(path, REPO_ROOT).encode())
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+    return digest.hexdigest()
+
+
+class StepCache:
+    """
+    This class stores step outputs on disk under content-addressed keys.
+
+    Entries are joblib files named after the key; a hit refreshes the entry's
+    mtime, and writes evict the least recently used entries until the store
+    fits in ``max_bytes``.
+    """
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 enabled: bool = CACHE_ENABLED):
+        """
+        Args:
+            cache_dir (str): Directory holding the entries
+            max_bytes (int): Size bound of the store
+            enabled (bool): When False every lookup misses and nothing is stored
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+    @staticmethod
+    def key(step_name: str, *parts: Any) -> str:
+        """
+        Builds the key of a step from its input fingerprints and the source fingerprint.
+        """
+        digest = hashlib.sha256(step_name.encode())
+        digest.update(source_fingerprint().encode())
+        for part in parts:
+            digest.update(repr(part).encode())
+        return f"{step_name}-{digest.hexdigest()[:32]}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.joblib")
+
+    def get(self, key: str) -> Any:
+        """
+        Loads an entry.
+
+        Returns:
+            The stored object, or None when absent
+        """
+        if not self.enabled:
+            return None
+        import joblib
+
+        path = self._path(key)
+        try:
+            value = joblib.load(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Discarding unreadable cache entry {path}: {e}")
+            os.remove(path)
+            return None
+        os.utime(path)
+        logging.info(f"Step cache hit: {key}")
+        return value
+
+    def put(self, key: str, value: Any):
+        """
+        Stores an entry, then evicts least recently used entries over the size bound.
+        """
+        if not self.enabled:
+            return
+        import joblib
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, path)
+        self.evict(keep=path)
+
+    def evict(self, keep: Optional[str] = None):
+        """
+        Removes least recently used entries until the store fits in ``max_bytes``.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".joblib"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, os.path.join(self.cache_dir, name)))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            os.remove(path)
+            total -= size
+            logging.info(f"Evicted step cache entry {path}")
@@ -0,0 +1,267 @@
+import logging
+import os
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+# Columns of the merged Olist file the pipeline reads, in file order
+OLIST_COLUMNS = [
+    "order_id",
+    "customer_id",
+    "order_status",
+    "order_purchase_timestamp",
+    "order_approved_at",
+    "order_delivered_carrier_date",
+    "order_delivered_customer_date",
+    "order_estimated_delivery_date",
+    "payment_sequential",
+    "payment_type",
+    "payment_installments",
+    "payment_value",
+    "customer_unique_id",
+    "customer_zip_code_prefix",
+    "customer_city",
+    "customer_state",
+    "order_item_id",
+    "product_id",
+    "seller_id",
+    "shipping_limit_date",
+    "price",
+    "freight_value",
+    "product_category_name",
+    "product_name_lenght",
+    "product_description_lenght",
+    "product_photos_qty",
+    "product_weight_g",
+    "product_length_cm",
+    "product_height_cm",
+    "product_width_cm",
+    "product_category_name_english",
+    "review_id",
+    "review_score",
+    "review_comment_title",
+    "review_comment_message",
+    "review_creation_date",
+    "review_answer_timestamp",
+]
+
+STATES = np.array(["SP", "RJ", "MG", "RS", "PR", "SC", "BA", "DF", "ES", "GO", "PE", "CE", "PA", "MT", "MA"])
+STATE_WEIGHTS = np.array([42, 13, 12, 5.5, 5, 3.7, 3.4, 2.2, 2, 2, 1.7, 1.3, 1, 0.9, 0.8])
+CITIES = np.array(["sao paulo", "rio de janeiro", "belo horizonte", "brasilia", "curitiba",
+                   "campinas", "porto alegre", "salvador", "guarulhos", "niteroi"])
+CATEGORIES = np.array(["cama_mesa_banho", "beleza_saude", "esporte_lazer", "moveis_decoracao",
+                       "informatica_acessorios", "utilidades_domesticas", "relogios_presentes",
+                       "telefonia", "ferramentas_jardim", "automotivo"])
+CATEGORIES_ENGLISH = np.array(["bed_bath_table", "health_beauty", "sports_leisure", "furniture_decor",
+                               "computers_accessories", "housewares", "watches_gifts",
+                               "telephony", "garden_tools", "auto"])
+PAYMENT_TYPES = np.array(["credit_card", "boleto", "voucher", "debit_card"])
+PAYMENT_WEIGHTS = np.array([74, 19, 5.5, 1.5])
+STATUSES = np.array(["delivered", "shipped", "canceled", "invoiced", "processing"])
+STATUS_WEIGHTS = np.array([97, 1.1, 0.6, 0.7, 0.6])
+COMMENTS = np.array(["Recebi bem antes do prazo estipulado.", "Produto muito bom, recomendo.",
+                     "Ainda nao recebi o produto.", "Veio errado, quero trocar.", "Otimo vendedor."])
+TITLES = np.array(["recomendo", "otimo", "bom", "ruim", "nao recebi"])
+
+FIRST_PURCHASE = np.datetime64("2016-09-04T00:00:00")
+LAST_PURCHASE = np.datetime64("2018-09-03T00:00:00")
+DEFAULT_CHUNKSIZE = 500_000
+
+
+class SyntheticOlistGenerator:
+    """
+    This class generates rows with the schema of the merged Olist orders file.
+
+    Values are drawn with NumPy in chunks, so any size can be written with
+    bounded memory, and the same seed and chunk size always produce the same
+    file. The review score depends on delivery delay, freight share and
+    installments, so models have signal to learn. Nulls follow the real data:
+    products without a category also lack name, description and photo counts,
+    a few products lack dimensions, most reviews have no comment, and
+    undelivered orders have no delivery dates.
+    """
+    def __init__(
+        self,
+        seed: int = 42,
+        product_null_rate: float = 0.015,
+        dimension_null_rate: float = 0.002,
+        comment_null_rate: float = 0.58,
+        title_null_rate: float = 0.88,
+    ):
+        """
+        Args:
+            seed (int): Base seed; chunk ``i`` uses ``(seed, i)``
+            product_null_rate (float): Share of rows missing the product category,
+                name, description and photo counts
+            dimension_null_rate (float): Share of rows missing product weight and dimensions
+            comment_null_rate (float): Share of rows without ``review_comment_message``
+            title_null_rate (float): Share of rows without ``review_comment_title``
+        """
+        self.seed = seed
+        self.product_null_rate = product_null_rate
+        self.dimension_null_rate = dimension_null_rate
+        self.comment_null_rate = comment_null_rate
+        self.title_null_rate = title_null_rate
+
+    def generate_chunk(self, n_rows: int, chunk_id: int = 0, first_row: int = 0) -> pd.DataFrame:
+        """
+        Generates one chunk of rows.
+
+        Args:
+            n_rows (int): Rows in the chunk
+            chunk_id (int): Chunk number, used to derive the chunk's seed
+            first_row (int): Row number of the first row, used for unique ids
+        Returns:
+            pd.DataFrame: Rows with OLIST_COLUMNS
+        """
+        rng = np.random.default_rng((self.seed, chunk_id))
+        row = np.arange(first_row, first_row + n_rows)
+        day = np.timedelta64(1, "D")
+
+        span = (LAST_PURCHASE - FIRST_PURCHASE).astype("timedelta64[s]").astype(np.int64)
+        purchase = FIRST_PURCHASE + rng.integers(0, span, n_rows).astype("timedelta64[s]")
+        status = rng.choice(STATUSES, n_rows, p=STATUS_WEIGHTS / STATUS_WEIGHTS.sum())
+        delivered = status == "delivered"
+        approved = purchase + rng.exponential(10 * 3600, n_rows).astype("timedelta64[s]")
+        carrier = approved + (rng.gamma(2.0, 1.5, n_rows) * 86400).astype("timedelta64[s]")
+        transit_days = rng.gamma(3.0, 3.5, n_rows)
+        customer = carrier + (transit_days * 86400).astype("timedelta64[s]")
+        estimated = (purchase + rng.integers(15, 35, n_rows) * day).astype("datetime64[D]")
+        delay_days = (customer - estimated.astype("datetime64[s]")).astype(np.int64) / 86400.0
+
+        price = np.round(np.exp(rng.normal(4.4, 0.9, n_rows)), 2)
+        freight = np.round(np.exp(rng.normal(2.8, 0.5, n_rows)), 2)
+        installments = np.clip(rng.geometric(0.35, n_rows), 1, 24)
+        payment_sequential = np.where(rng.random(n_rows) < 0.96, 1, rng.integers(2, 6, n_rows))
+        weight = np.round(np.exp(rng.normal(6.6, 1.2, n_rows)))
+        length = rng.integers(7, 105, n_rows)
+        height = rng.integers(2, 105, n_rows)
+        width = rng.integers(6, 118, n_rows)
+        category = rng.integers(0, len(CATEGORIES), n_rows)
+
+        late = np.where(delivered, np.maximum(delay_days, 0.0), 10.0)
+        score = (
+            4.6 - 0.18 * late - 1.2 * freight / (price + freight) - 0.03 * installments
+            + rng.normal(0, 0.9, n_rows)
+        )
+        review_score = np.clip(np.rint(score), 1, 5).astype(np.int64)
+        review_created = (customer + rng.integers(0, 3, n_rows) * day).astype("datetime64[D]")
+
+        df = pd.DataFrame({
+            "order_id": _ids("o", row),
+            "customer_id": _ids("c", row),
+            "order_status": status,
+            "order_purchase_timestamp": purchase,
+            "order_approved_at": approved,
+            "order_delivered_carrier_date": carrier,
+            "order_delivered_customer_date": customer,
+            "order_estimated_delivery_date": estimated.astype("datetime64[s]"),
+            "payment_sequential": payment_sequential,
+            "payment_type": rng.choice(PAYMENT_TYPES, n_rows, p=PAYMENT_WEIGHTS / PAYMENT_WEIGHTS.sum()),
+            "payment_installments": installments,
+            "payment_value": np.round((price + freight) * rng.uniform(0.95, 1.3, n_rows), 2),
+            "customer_unique_id": _ids("u", rng.integers(0, max(first_row + n_rows, 1), n_rows)),
+            "customer_zip_code_prefix": rng.integers(1000, 99990, n_rows),
+            "customer_city": rng.choice(CITIES, n_rows),
+            "customer_state": rng.choice(STATES, n_rows, p=STATE_WEIGHTS / STATE_WEIGHTS.sum()),
+            "order_item_id": np.clip(rng.geometric(0.88, n_rows), 1, 21),
+            "product_id": _ids("p", rng.integers(0, 33_000, n_rows)),
+            "seller_id": _ids("s", rng.integers(0, 3_100, n_rows)),
+            "shipping_limit_date": approved + np.timedelta64(6, "D"),
+            "price": price,
+            "freight_value": freight,
+            "product_category_name": CATEGORIES[category],
+            "product_name_lenght": rng.integers(5, 77, n_rows).astype(np.float64),
+            "product_description_lenght": rng.integers(4, 3993, n_rows).astype(np.float64),
+            "product_photos_qty": np.clip(rng.geometric(0.5, n_rows), 1, 20).astype(np.float64),
+            "product_weight_g": weight,
+            "product_length_cm": length.astype(np.float64),
+            "product_height_cm": height.astype(np.float64),
+            "product_width_cm": width.astype(np.float64),
+            "product_category_name_english": CATEGORIES_ENGLISH[category],
+            "review_id": _ids("r", row),
+            "review_score": review_score,
+            "review_comment_title": rng.choice(TITLES, n_rows),
+            "review_comment_message": rng.choice(COMMENTS, n_rows),
+            "review_creation_date": review_created.astype("datetime64[s]"),
+            "review_answer_timestamp": review_created + (rng.exponential(2.5, n_rows) * 86400).astype("timedelta64[s]"),
+        })
+
+        for column in ["order_delivered_carrier_date", "order_delivered_customer_date"]:
+            df.loc[~delivered, column] = pd.NaT
+        df.loc[rng.random(n_rows) < 0.002, "order_approved_at"] = pd.NaT
+        missing_product = rng.random(n_rows) < self.product_null_rate
+        df.loc[missing_product, ["product_category_name", "product_name_lenght", "product_description_lenght",
+                                 "product_photos_qty", "product_category_name_english"]] = np.nan
+        missing_dimensions = rng.random(n_rows) < self.dimension_null_rate
+        df.loc[missing_dimensions, ["product_weight_g", "product_length_cm", "product_height_cm",
+                                    "product_width_cm"]] = np.nan
+        df.loc[rng.random(n_rows) < self.comment_null_rate, "review_comment_message"] = np.nan
+        df.loc[rng.random(n_rows) < self.title_null_rate, "review_comment_title"] = np.nan
+        return df
+
+    def iter_chunks(self, n_rows: int, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+        """
+        Yields ``n_rows`` rows in chunks of at most ``chunksize``.
+        """
+        for chunk_id, start in enumerate(range(0, n_rows, chunksize)):
+            yield self.generate_chunk(min(chunksize, n_rows - start), chunk_id, start)
+
+    def write(self, path: str, n_rows: int, chunksize: int = DEFAULT_CHUNKSIZE) -> str:
+        """
+        Writes ``n_rows`` rows to a CSV or (``.parquet``) Parquet file, chunk by chunk.
+
+        Args:
+            path (str): Output file
+            n_rows (int): Rows to write, e.g. 100_000 to 100_000_000
+            chunksize (int): Rows generated and written at a time
+        Returns:
+            str: The output file
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        writer = None
+        try:
+            for i, chunk in enumerate(self.iter_chunks(n_rows, chunksize)):
+                if path.endswith(".parquet"):
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(tmp_path, table.schema)
+                    writer.write_table(table.cast(writer.schema))
+                else:
+                    chunk.to_csv(tmp_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        finally:
+            if writer is not None:
+                writer.close()
+        os.replace(tmp_path, path)
+        logging.info(f"Wrote {n_rows} synthetic rows to {path}")
+        return path
+
+
+def _ids(prefix: str, values: np.ndarray) -> np.ndarray:
+    return np.char.add(prefix, np.char.zfill(values.astype(str), 12))
+
+
+def generate(path: str, n_rows: int, seed: int = 42, chunksize: Optional[int] = None) -> str:
+    """
+    Writes a synthetic Olist file with the default null rates.
+    """
+    return SyntheticOlistGenerator(seed).write(path, n_rows, chunksize or DEFAULT_CHUNKSIZE)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write a synthetic Olist-schema orders file.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--out", default="data/synthetic_olist.csv")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    generate(args.out, args.rows, args.seed, args.chunksize)
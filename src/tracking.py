@@ -0,0 +1,162 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# MLflow's limits per log_batch request
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_PER_BATCH = 100
+MAX_TAGS_PER_BATCH = 100
+MAX_ENTITIES_PER_BATCH = 1000
+SIGNATURE_SAMPLE_ROWS = 100
+
+# Control items: _FLUSH ends the current batch early, _STOP also ends the thread
+_FLUSH = object()
+_STOP = object()
+
+
+class AsyncTracker:
+    """
+    This class queues MLflow params, metrics, tags and artifacts and writes them from a background thread.
+
+    Queued values are grouped into ``log_batch`` requests, so a step pays for
+    tracking I/O once per batch and only while it has nothing else to do. Use
+    it as a context manager: leaving the block flushes everything and re-raises
+    the first write error, so a step never finishes with tracking data unwritten.
+    """
+    def __init__(self, run_id: Optional[str] = None, flush_interval_s: float = 0.5):
+        """
+        Args:
+            run_id (str, optional): Run to write to; defaults to the active run. Without
+                one a run is started, and ended again by ``close``
+            flush_interval_s (float): Longest time a queued value waits for others to join its batch
+        """
+        import mlflow
+        from mlflow.tracking import MlflowClient
+
+        self._started_run = False
+        if run_id is None:
+            run = mlflow.active_run()
+            if run is None:
+                run, self._started_run = mlflow.start_run(), True
+            run_id = run.info.run_id
+        self.run_id = run_id
+        self.flush_interval_s = flush_interval_s
+        self._client = MlflowClient()
+        self._queue: queue.Queue = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="mlflow-tracker", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "AsyncTracker":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def log_metrics(self, metrics: Dict[str, float], step: int = 0):
+        timestamp = int(time.time() * 1000)
+        for key, value in metrics.items():
+            self._queue.put(("metric", (key, float(value), timestamp, step)))
+
+    def log_params(self, params: Dict[str, Any]):
+        for key, value in params.items():
+            self._queue.put(("param", (key, str(value))))
+
+    def set_tags(self, tags: Dict[str, Any]):
+        for key, value in tags.items():
+            self._queue.put(("tag", (key, str(value))))
+
+    def log_artifact(self, local_path: str, artifact_path: Optional[str] = None):
+        self._queue.put(("artifact", (local_path, artifact_path)))
+
+    def log_dict(self, dictionary: dict, artifact_file: str):
+        self._queue.put(("dict", (dictionary, artifact_file)))
+
+    def flush(self):
+        """
+        Blocks until everything queued so far is written.
+        """
+        self._queue.put((_FLUSH, None))
+        self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self):
+        """
+        Flushes and stops the writer thread, and ends the run if this tracker started it.
+        """
+        try:
+            self.flush()
+        finally:
+            self._queue.put((_STOP, None))
+            self._thread.join()
+            if self._started_run:
+                import mlflow
+
+                active = mlflow.active_run()
+                if active is not None and active.info.run_id == self.run_id:
+                    mlflow.end_run()
+                self._started_run = False
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval_s
+            while items[-1][0] not in (_FLUSH, _STOP):
+                try:
+                    items.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            try:
+                self._write([item for item in items if item[0] not in (_FLUSH, _STOP)])
+            except Exception as e:
+                logging.error(f"MLflow tracking write failed: {e}")
+                self._error = self._error or e
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+            if items[-1][0] is _STOP:
+                return
+
+    def _write(self, items: List[tuple]):
+        from mlflow.entities import Metric, Param, RunTag
+
+        metrics = [Metric(*value) for kind, value in items if kind == "metric"]
+        # MLflow rejects a param logged twice with different values; keep the latest.
+        params = [Param(*pair) for pair in dict(value for kind, value in items if kind == "param").items()]
+        tags = [RunTag(*value) for kind, value in items if kind == "tag"]
+        while metrics or params or tags:
+            # Params and tags go first; metrics fill what is left of the request's entity limit
+            n_params = min(len(params), MAX_PARAMS_PER_BATCH)
+            n_tags = min(len(tags), MAX_TAGS_PER_BATCH)
+            n_metrics = min(len(metrics), MAX_METRICS_PER_BATCH, MAX_ENTITIES_PER_BATCH - n_params - n_tags)
+            self._client.log_batch(
+                self.run_id,
+                metrics=metrics[:n_metrics],
+                params=params[:n_params],
+                tags=tags[:n_tags],
+            )
+            metrics = metrics[n_metrics:]
+            params = params[n_params:]
+            tags = tags[n_tags:]
+        for kind, value in items:
+            if kind == "artifact":
+                self._client.log_artifact(self.run_id, *value)
+            elif kind == "dict":
+                self._client.log_dict(self.run_id, *value)
+
+
+def sample_signature(model, X, n_rows: int = SIGNATURE_SAMPLE_ROWS):
+    """
+    Infers an MLflow model signature from a fixed-size sample of the input.
+
+    The schema only depends on column names and dtypes, so predicting on the
+    whole training set to infer it costs time for nothing.
+    """
+    from mlflow.models.signature import infer_signature
+
+    sample = X.sample(min(n_rows, len(X)), random_state=0) if len(X) > n_rows else X
+    return infer_signature(sample, model.predict(sample))
@@ -0,0 +1,47 @@
+import logging
+from typing import List, Optional
+from zenml import step
+from typing_extensions import Annotated
+from src.batch_scoring import DEFAULT_CHUNKSIZE, BatchScorer, resolve_model_path
+
+@step
+def batch_score(
+    data_path: str,
+    model_uri: str,
+    output_dir: str,
+    n_workers: Optional[int] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    keep_columns: Optional[List[str]] = None,
+    partition_by: Optional[str] = None,
+    overwrite: bool = False
+) -> Annotated[dict, "batch_stats"]:
+    """
+    Scores a CSV or Parquet file offline into partitioned Parquet.
+
+    The model's own preprocessor (the fitted form of DataPreProcessStrategy) is
+    applied to each chunk, so the rows get exactly the training-time treatment.
+
+    Args:
+        data_path (str): Input file
+        model_uri (str): MLflow model URI (e.g. ``runs:/<run_id>/model``) or local model directory
+        output_dir (str): Directory receiving the prediction files
+        n_workers (int, optional): Scoring processes; defaults to the CPU count
+        chunksize (int): Rows per chunk
+        keep_columns (List[str], optional): Input columns copied next to the predictions
+        partition_by (str, optional): Column to partition the output directories by
+        overwrite (bool): Replace a non-empty output_dir instead of failing
+    Returns:
+        batch_stats: Row count, timing and rows/second (overall and per core)
+    """
+    try:
+        scorer = BatchScorer(
+            resolve_model_path(model_uri),
+            n_workers=n_workers,
+            chunksize=chunksize,
+            keep_columns=keep_columns,
+            partition_by=partition_by,
+        )
+        return scorer.score(data_path, output_dir, overwrite=overwrite)
+    except Exception as e:
+        logging.error(f"Error occurred during batch scoring: {str(e)}")
+        raise e
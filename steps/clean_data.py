@@ -1,30 +1,44 @@
 import logging
 import pandas as pd
 from zenml import step
-from src.data_cleanner import DataCleaning, DataPreProcessStrategy, DataSplitStrategy
+from src.profiling import profiled
+from src.step_cache import StepCache, fingerprint_frame
+from src.data_cleanner import DataCleaning, DataPreProcessStrategy, DataSplitStrategy, PreProcessTransformer
 from typing_extensions import Annotated
-from typing import Tuple
+from typing import Optional, Tuple
 
 @step
-def clean_data(data: pd.DataFrame) -> Tuple[
+@profiled(name="clean_data")
+def clean_data(data: pd.DataFrame, segment_column: Optional[str] = None) -> Tuple[
     Annotated[pd.DataFrame, "X_train"],
     Annotated[pd.DataFrame, "X_test"],
     Annotated[pd.Series, "y_train"],
-    Annotated[pd.Series, "y_test"]
+    Annotated[pd.Series, "y_test"],
+    Annotated[PreProcessTransformer, "preprocessor"]
 ]:
     """
     Performs data cleaning and splitting.
 
     Args:
         data (pd.DataFrame): The input data.
+        segment_column (str, optional): Column kept in X_train/X_test for segmented training and evaluation
     Returns:
         X_train: Training data
         X_test: Testing data
         y_train: Training labels
         y_test: Testing labels
+        preprocessor: Transformer holding the fitted fill values, for inference
     """
     try:
-        process_strategy = DataPreProcessStrategy()
+        step_cache = StepCache()
+        key = step_cache.key("clean_data", fingerprint_frame(data), segment_column)
+        cached = step_cache.get(key)
+        if cached is not None:
+            return cached
+
+        preprocessor = PreProcessTransformer().fit(data)
+
+        process_strategy = DataPreProcessStrategy(keep_columns=[segment_column] if segment_column else None)
         data_cleanning = DataCleaning(data, process_strategy)
         processed_data = data_cleanning.handle_data()
         
@@ -33,7 +47,8 @@ def clean_data(data: pd.DataFrame) -> Tuple[
         X_train, X_test, y_train, y_test = data_cleaning.handle_data()
         
         logging.info("Data cleaning and splitting completed successfully.")
-        return X_train, X_test, y_train, y_test
+        step_cache.put(key, (X_train, X_test, y_train, y_test, preprocessor))
+        return X_train, X_test, y_train, y_test, preprocessor
     
     except Exception as e:
         logging.error(f"Error occurred during data cleaning and splitting: {str(e)}")
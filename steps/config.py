@@ -1,10 +1,74 @@
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
 
+# ml_model_name value that trains candidate_models in parallel and keeps the best
+AUTO_MODEL = "auto"
+
 class ModelNameConfig(BaseModel):  
     """
     Configuration for the model name.
     """
     ml_model_name: str = "LinearRegression"
+    candidate_models: List[str] = ["LinearRegression", "LightGBM", "XGBoost", "CatBoost"]
+    selection_metric: str = "rmse"
+    n_workers: Optional[int] = None
+    # Keyword arguments for the model, e.g. the best_params found by tune_model
+    model_params: Dict[str, Any] = {}
+    # Warm-start LinearRegression from persisted XᵀX / Xᵀy instead of refitting. The
+    # pipeline's data_path then holds only the new partition, and partition_id names
+    # it stably (e.g. "2018-09") so that a re-run does not fold it in twice.
+    incremental: bool = False
+    partition_id: Optional[str] = None
+    sufficient_stats_path: str = "artifacts/linear_sufficient_stats.npz"
+    # Log linear models as memory-mapped NumPy arrays (src/linear_artifact.py) instead of a pickle
+    compact_artifact: bool = True
+    # Fit one LinearRegression per value of this raw column (src/segmented_model.py)
+    segment_column: Optional[str] = None
+    min_segment_rows: int = 50
 
     class Config:
         protected_namespaces = ()  # ✅ Avoids namespace conflicts
+
+
+class TuningConfig(BaseModel):
+    """
+    Configuration for the hyperparameter search.
+    """
+    ml_model_name: str = "LightGBM"
+    n_trials: int = 50
+    n_workers: int = 1
+    n_folds: int = 3
+    pruner: str = "median"
+    storage_path: str = "artifacts/optuna.db"
+    study_name: Optional[str] = None
+
+    class Config:
+        protected_namespaces = ()
+
+
+class CrossValidationConfig(BaseModel):
+    """
+    Configuration for cross-validation.
+    """
+    ml_model_name: str = "LinearRegression"
+    n_splits: int = 5
+    n_repeats: int = 1
+    # Expanding-window folds ordered by order_purchase_timestamp instead of shuffled k-fold
+    time_ordered: bool = False
+    n_workers: Optional[int] = None
+    model_params: Dict[str, Any] = {}
+
+    class Config:
+        protected_namespaces = ()
+
+
+class DriftConfig(BaseModel):
+    """
+    Configuration for data-drift monitoring.
+    """
+    # Reference of the data the last model was trained on, written after every training run
+    reference_path: str = "artifacts/drift_reference.json"
+    n_bins: int = 10
+    psi_threshold: float = 0.2
+    ks_threshold: float = 0.1
+    chunksize: int = 200_000
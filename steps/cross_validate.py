@@ -0,0 +1,68 @@
+import logging
+import numpy as np
+import pandas as pd
+from zenml import step
+from typing_extensions import Annotated
+from typing import Dict, Tuple
+from src.cross_validation import CrossValidator
+from src.data_cleanner import MEDIAN_FILL_COLUMNS, TARGET_COLUMN, TIME_COLUMN, IndexSplitStrategy, numeric_feature_columns
+from src.profiling import profiled
+from src.tracking import AsyncTracker
+from steps.config import CrossValidationConfig
+
+# The experiment tracker is attached by the pipelines (see steps/stack.py) so
+# that importing this module does not resolve the ZenML stack.
+@step
+@profiled(name="cross_validate_model")
+def cross_validate_model(data: pd.DataFrame, config: CrossValidationConfig) -> Tuple[
+    Annotated[Dict[str, float], "cv_mean"],
+    Annotated[Dict[str, float], "cv_std"]
+]:
+    """
+    Cross-validates the configured model on the ingested data.
+
+    The features are gathered into one matrix and the folds are index arrays
+    into it, so no train/test copies are passed between steps. Null fills are
+    fitted on every fold's training rows, as PreProcessTransformer would be. For
+    time-ordered folds the rows are sorted by time first, so every fold's rows
+    are slices of the matrix; shuffled folds copy their training rows in the worker.
+    Time-ordered folds need ``order_purchase_timestamp`` among the ingested columns.
+
+    Args:
+        data (pd.DataFrame): The ingested data
+        config (CrossValidationConfig): Folds, model and parallelism
+    Returns:
+        cv_mean: Mean of every metric across folds
+        cv_std: Standard deviation of every metric across folds
+    """
+    try:
+        data = data[data[TARGET_COLUMN].notna()]
+        strategy = IndexSplitStrategy(
+            n_splits=config.n_splits,
+            n_repeats=config.n_repeats,
+            time_column=TIME_COLUMN if config.time_ordered else None,
+        )
+        if config.time_ordered:
+            # Sorted once here, each fold's training rows are a prefix of the matrix
+            data = data.iloc[strategy.time_order(data)]
+        folds = strategy.handle_data(data)
+        # Nulls are left in the matrix: each fold fills them with its own training medians
+        columns = [c for c in numeric_feature_columns(data.dtypes) if c != TARGET_COLUMN]
+        X = data[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        fill_columns = [j for j, column in enumerate(columns) if column in MEDIAN_FILL_COLUMNS]
+
+        validator = CrossValidator(
+            config.ml_model_name, n_workers=config.n_workers, model_params=config.model_params,
+            fill_columns=fill_columns,
+        )
+        summary = validator.evaluate(X, data[TARGET_COLUMN].to_numpy(), folds)
+        with AsyncTracker() as tracker:
+            tracker.log_metrics({
+                f"cv_{name}_{statistic}": value
+                for statistic, scores in summary.items()
+                for name, value in scores.items()
+            })
+        return summary["mean"], summary["std"]
+    except Exception as e:
+        logging.error(f"Error occurred during cross-validation: {str(e)}")
+        raise e
@@ -0,0 +1,35 @@
+import logging
+from typing import Optional
+
+import pandas as pd
+from sklearn.pipeline import Pipeline
+from zenml import step
+
+from src.dashboard import AGGREGATES_PATH, build_aggregates, write_aggregates
+
+
+@step
+def write_dashboard_aggregates(model: Pipeline, X_test: pd.DataFrame, y_test: pd.Series, deploy_decision: bool,
+                               segment_column: Optional[str] = None, path: str = AGGREGATES_PATH) -> None:
+    """
+    Precomputes the metrics and distributions shown by streamlit_app.py into a small JSON file.
+
+    The app serves the deployed model, so nothing is written for a model that is not deployed.
+
+    Args:
+        model (Pipeline): Trained model with its preprocessor
+        X_test (pd.DataFrame): Testing data
+        y_test (pd.Series): Testing labels
+        deploy_decision (bool): Whether ``model`` is being deployed
+        segment_column (str, optional): Column of X_test to break the metrics down by
+        path (str): File the app reads
+    """
+    if not deploy_decision:
+        logging.info("Model not deployed; dashboard aggregates left unchanged")
+        return
+    try:
+        write_aggregates(build_aggregates(model, X_test, y_test, segment_column), path)
+        logging.info(f"Dashboard aggregates written to {path}")
+    except Exception as e:
+        logging.error(f"Error occurred while writing the dashboard aggregates: {str(e)}")
+        raise e
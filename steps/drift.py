@@ -0,0 +1,113 @@
+import logging
+import os
+from typing import Tuple
+
+import pandas as pd
+from typing_extensions import Annotated
+from zenml import step
+
+from src.drift import DriftReference, iter_frame_chunks
+from src.profiling import profiled
+from src.tracking import AsyncTracker
+from steps.config import DriftConfig
+from steps.ingest_data import IngestData
+from steps.join_tables import cached_join
+
+
+@step(enable_cache=False)
+def check_drift(data_path: str, config: DriftConfig) -> Tuple[
+    Annotated[bool, "drift_detected"],
+    Annotated[float, "max_psi"]
+]:
+    """
+    Compares a data file, or a directory of raw Olist tables, with the stored reference.
+
+    Runs as its own pipeline before the deployment pipeline, so a retrain can
+    be skipped when nothing has drifted. A file is streamed in chunks and never
+    held in memory; a directory is joined through the step cache that
+    ``join_olist_tables`` reads next. ZenML caching is off because the result
+    depends on the file contents and the reference, not on ``data_path``.
+
+    Args:
+        data_path (str): Merged Olist CSV, or a directory of the raw tables
+        config (DriftConfig): Reference location and thresholds
+    Returns:
+        drift_detected (bool): Whether any column is over a threshold; True without a reference
+        max_psi (float): Largest PSI over the columns
+    """
+    try:
+        if not os.path.exists(config.reference_path):
+            logging.info(f"No drift reference at {config.reference_path}; treating the data as drifted")
+            return True, float("inf")
+        reference = DriftReference.load(config.reference_path)
+        if os.path.isdir(data_path):
+            chunks = iter_frame_chunks(cached_join(data_path), config.chunksize)
+        else:
+            chunks = IngestData(data_path, columns=reference.columns, chunksize=config.chunksize).iter_chunks()
+        report = reference.compare(chunks, config.psi_threshold, config.ks_threshold)
+        logging.info(f"Drifted columns: {report['drifted'] or 'none'} (max PSI {report['max_psi']:.4f})")
+        return bool(report["drifted"]), report["max_psi"]
+    except Exception as e:
+        logging.error(f"Error occurred during drift check: {str(e)}")
+        raise e
+
+
+# The experiment tracker is attached by the pipelines (see steps/stack.py) so
+# that importing this module does not resolve the ZenML stack.
+@step
+@profiled(name="detect_drift", rows_from="data")
+def detect_drift(data: pd.DataFrame, config: DriftConfig) -> Tuple[
+    Annotated[bool, "drift_detected"],
+    Annotated[float, "max_psi"]
+]:
+    """
+    Compares the ingested data with the reference of the last trained model's data.
+
+    PSI and KS are computed for every numeric column in one pass over the data
+    and logged to MLflow with the full report. Without a reference (nothing
+    trained yet) the data counts as drifted.
+
+    Args:
+        data (pd.DataFrame): The ingested data
+        config (DriftConfig): Reference location and thresholds
+    Returns:
+        drift_detected (bool): Whether any column is over a threshold
+        max_psi (float): Largest PSI over the columns
+    """
+    try:
+        if not os.path.exists(config.reference_path):
+            logging.info(f"No drift reference at {config.reference_path}; treating the data as drifted")
+            return True, float("inf")
+        reference = DriftReference.load(config.reference_path)
+        report = reference.compare(
+            iter_frame_chunks(data, config.chunksize), config.psi_threshold, config.ks_threshold
+        )
+        with AsyncTracker() as tracker:
+            tracker.log_metrics({
+                f"drift_{name}_{column}": stats[name]
+                for column, stats in report["columns"].items()
+                for name in ("psi", "ks")
+            })
+            tracker.log_metrics({"drift_max_psi": report["max_psi"], "drift_max_ks": report["max_ks"]})
+            tracker.log_dict(report, "drift/report.json")
+        logging.info(f"Drifted columns: {report['drifted'] or 'none'} (max PSI {report['max_psi']:.4f})")
+        return bool(report["drifted"]), report["max_psi"]
+    except Exception as e:
+        logging.error(f"Error occurred during drift detection: {str(e)}")
+        raise e
+
+
+@step
+def update_drift_reference(data: pd.DataFrame, config: DriftConfig) -> None:
+    """
+    Stores the reference sketches of the data a model was just trained and evaluated on.
+
+    The pipelines run it after training succeeds whatever the deployment
+    decision, so the next run only retrains once the data moves away from it.
+
+    Args:
+        data (pd.DataFrame): The ingested data
+        config (DriftConfig): Reference location and number of bins
+    """
+    DriftReference.from_frame(data, n_bins=config.n_bins, chunksize=config.chunksize).save(config.reference_path)
+    logging.info(f"Drift reference written to {config.reference_path}")
@@ -1,50 +1,110 @@
 import logging
 import pandas as pd
+import numpy as np
 from zenml import step
 from typing_extensions import Annotated
-from typing import Tuple
-from src.model_evaluator import MSE, R2_score, RMSE
-from sklearn.base import RegressorMixin
-import mlflow
-from zenml.client import Client
+from typing import Optional, Tuple
+from src.model_evaluator import BootstrapMetrics, RegressionMetricsAccumulator
+from src.profiling import profiled
+from src.tracking import AsyncTracker
+from sklearn.pipeline import Pipeline
 
-experiment_tracker = Client().active_stack.experiment_tracker # experimental tracker
-
-@step(experiment_tracker=experiment_tracker.name if experiment_tracker else None)  # Handle None case
-def evaluate_model(model: RegressorMixin,
+# The experiment tracker is attached by the pipelines (see steps/stack.py) so
+# that importing this module does not resolve the ZenML stack.
+@step
+@profiled(name="evaluate_model", rows_from="X_test")
+def evaluate_model(model: Pipeline,
     X_test: pd.DataFrame,
-    y_test: pd.Series
+    y_test: pd.Series,
+    segment_column: Optional[str] = None,
+    chunksize: Optional[int] = None
     ) -> Tuple[
         Annotated[float, "r2_score"],
         Annotated[float, "rmse_score"]
     ]:
     """
-    Evaluates the trained model using Mean Squared Error (MSE), R-squared score (R2), and Root Mean Squared Error (RMSE).
+    Evaluates the trained model using Mean Squared Error (MSE), R-squared score (R2), Root Mean Squared Error (RMSE)
+    and Mean Absolute Error (MAE), computed together in one pass and logged to MLflow in one batch.
 
     Args:
-        model (RegressorMixin): Trained model
+        model (Pipeline): Trained model with its preprocessor
         X_test (pd.DataFrame): Testing data
         y_test (pd.Series): Testing labels
+        segment_column (str, optional): Column of X_test to break the metrics down by
+        chunksize (int, optional): Predict and accumulate this many rows at a time
+            instead of materialising every prediction
     Returns:
         r2_score (float): R-squared score
         rmse_score (float): Root Mean Squared Error score
     """
     try:
-        prediction = model.predict(X_test)
-        
-        mse_eval = MSE()
-        mse_score = mse_eval.calculate_scores(y_test.values, prediction)
-        mlflow.log_metric("MSE", mse_score)
-        
-        r2_eval = R2_score()
-        r2_score = r2_eval.calculate_scores(y_test.values, prediction)
-        mlflow.log_metric('r2_score', r2_score)
-        
-        rmse_eval = RMSE()
-        rmse_score = rmse_eval.calculate_scores(y_test.values, prediction)
-        mlflow.log_metric('RMSE', rmse_score)
-        
-        return r2_score, rmse_score
+        # Metrics are written by a background thread; leaving the block flushes them
+        with AsyncTracker() as tracker:
+            y_true = y_test.to_numpy()
+            if segment_column is not None:
+                labels, codes = np.unique(X_test[segment_column].to_numpy(), return_inverse=True)
+            else:
+                labels, codes = None, None
+
+            accumulator = RegressionMetricsAccumulator()
+            step_size = chunksize or max(len(X_test), 1)
+            for start in range(0, len(X_test), step_size):
+                stop = start + step_size
+                prediction = model.predict(X_test.iloc[start:stop])
+                accumulator.update(y_true[start:stop], prediction, None if codes is None else codes[start:stop])
+
+            scores = accumulator.result()
+            metrics = dict(scores)
+            if labels is not None:
+                for code, segment_scores in accumulator.segment_results().items():
+                    for name, value in segment_scores.items():
+                        metrics[f"{name}_{segment_column}_{labels[code]}"] = value
+            tracker.log_metrics(metrics)
+            logging.info(f"Evaluation metrics: {scores}")
+
+        return scores["r2_score"], scores["RMSE"]
     except Exception as e:
         logging.error(f"Error occurred during model evaluation: {str(e)}")
-        raise e
\ No newline at end of file
+        raise e
+
+@step
+@profiled(name="bootstrap_evaluate_model", rows_from="X_test")
+def bootstrap_evaluate_model(model: Pipeline,
+    X_test: pd.DataFrame,
+    y_test: pd.Series,
+    n_resamples: int = 2000,
+    confidence: float = 0.95,
+    n_workers: int = 1
+    ) -> Tuple[
+        Annotated[float, "r2_lower"],
+        Annotated[float, "r2_upper"]
+    ]:
+    """
+    Evaluates the trained model with bootstrap confidence intervals for every metric.
+
+    Args:
+        model (Pipeline): Trained model with its preprocessor
+        X_test (pd.DataFrame): Testing data
+        y_test (pd.Series): Testing labels
+        n_resamples (int): Number of bootstrap resamples
+        confidence (float): Confidence level of the intervals
+        n_workers (int): Processes drawing resamples in parallel
+    Returns:
+        r2_lower (float): Lower confidence bound of the R-squared score
+        r2_upper (float): Upper confidence bound of the R-squared score
+    """
+    try:
+        prediction = model.predict(X_test)
+        evaluator = BootstrapMetrics(n_resamples=n_resamples, confidence=confidence, n_workers=n_workers)
+        scores = evaluator.calculate_scores(y_test.to_numpy(), prediction)
+        with AsyncTracker() as tracker:
+            tracker.log_metrics({
+                f"{name}_{bound}": value
+                for name, interval in scores.items()
+                for bound, value in interval.items()
+                if bound != "value"
+            })
+        return scores["r2_score"]["lower"], scores["r2_score"]["upper"]
+    except Exception as e:
+        logging.error(f"Error occurred during bootstrap evaluation: {str(e)}")
+        raise e
@@ -1,42 +1,166 @@
+import hashlib
+import json
 import logging
+import os
+from typing import Iterator, List, Optional
+
 import pandas as pd
 from zenml import step
 
+from src.data_cleanner import COLUMN_DTYPES, FEATURE_COLUMNS, TARGET_COLUMN, narrow_integers
+from src.profiling import profiled
+
+# Columns read by default: exactly the ones DataPreProcessStrategy keeps.
+DEFAULT_COLUMNS = FEATURE_COLUMNS + [TARGET_COLUMN]
+DEFAULT_CHUNKSIZE = 200_000
+HASH_BLOCK_SIZE = 1 << 20
+# Parquet cache used by the pipelines; repeat runs on an unchanged file skip the CSV parse
+INGEST_CACHE_DIR = "artifacts/ingest_cache"
+
+
 class IngestData:
     """
     Ingests data from a data_path.
     """
-    def __init__(self, data_path: str):
+    def __init__(
+        self,
+        data_path: str,
+        columns: Optional[List[str]] = None,
+        chunksize: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+    ):
         """
         Args:
             data_path (str): path to the data
+            columns (List[str], optional): columns to read; ``None`` reads every column
+            chunksize (int, optional): number of CSV rows parsed per chunk
+            cache_dir (str, optional): directory for the Parquet cache; ``None`` disables it
         """
         self.data_path = data_path
+        self.columns = columns
+        self.chunksize = chunksize
+        self.cache_dir = cache_dir
 
     def get_data(self):
         """
         Ingesting data from the data_path
 
+        Returns the cached Parquet copy when one exists for the current file
+        contents, otherwise parses the CSV (and populates the cache).
         """
         logging.info(f"Ingesting data from {self.data_path}")
-        df = pd.read_csv(self.data_path)
-        return df
+        if self.cache_dir is None:
+            if self.columns is None and self.chunksize is None:
+                return pd.read_csv(self.data_path)
+            return narrow_integers(pd.concat(self.iter_chunks(), ignore_index=True))
+
+        cache_path = self.cache_path()
+        if not os.path.exists(cache_path):
+            logging.info(f"Writing Parquet cache to {cache_path}")
+            self._write_cache(cache_path)
+        else:
+            logging.info(f"Reading cached data from {cache_path}")
+        return self._read_cache(cache_path)
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Streams the CSV in chunks, parsing only the requested columns with
+        compact dtypes.
+
+        Yields:
+            pd.DataFrame: The next chunk of rows.
+        """
+        dtypes = self._dtypes()
+        reader = pd.read_csv(
+            self.data_path,
+            usecols=self.columns,
+            dtype=dtypes,
+            chunksize=self.chunksize or DEFAULT_CHUNKSIZE,
+        )
+        with reader:
+            yield from reader
+
+    def cache_path(self) -> str:
+        """
+        Returns the cache file for the current file contents and column spec.
+        """
+        digest = hashlib.sha256()
+        with open(self.data_path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        spec = {"columns": self.columns, "dtypes": self._dtypes()}
+        digest.update(json.dumps(spec, sort_keys=True).encode())
+        stem = os.path.splitext(os.path.basename(self.data_path))[0]
+        return os.path.join(self.cache_dir, f"{stem}-{digest.hexdigest()[:16]}.parquet")
+
+    def _dtypes(self) -> dict:
+        columns = self.columns if self.columns is not None else COLUMN_DTYPES.keys()
+        # Categories are written as plain strings; they are dictionary-encoded
+        # again when the cache is read.
+        return {
+            column: "str" if COLUMN_DTYPES[column] == "category" else COLUMN_DTYPES[column]
+            for column in columns
+            if column in COLUMN_DTYPES
+        }
+
+    def _write_cache(self, cache_path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        writer = None
+        try:
+            for chunk in self.iter_chunks():
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                else:
+                    table = table.cast(writer.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        os.replace(tmp_path, cache_path)
+
+    def _read_cache(self, cache_path: str) -> pd.DataFrame:
+        categories = [
+            column for column, dtype in COLUMN_DTYPES.items()
+            if dtype == "category" and (self.columns is None or column in self.columns)
+        ]
+        df = pd.read_parquet(cache_path, memory_map=True, read_dictionary=categories or None)
+        return narrow_integers(df)
+
 
 @step
-def ingest_data(data_path: str) -> pd.DataFrame:
+@profiled(name="ingest_data", rows_from="return")
+def ingest_data(
+    data_path: str,
+    columns: Optional[List[str]] = None,
+    cache_dir: Optional[str] = None,
+) -> pd.DataFrame:
     """
     Ingests data from a specified path.
 
     Args:
         data_path (str): The path to the data file.
+        columns (List[str], optional): Columns to read. Defaults to the columns
+            kept by DataPreProcessStrategy.
+        cache_dir (str, optional): Directory for the Parquet cache. Repeat runs
+            on unchanged data read the cache instead of the CSV.
 
     Returns:
         pd.DataFrame: The loaded data.
     """
     try:
-        ingest_data = IngestData(data_path)
-        data = ingest_data.get_data()
-        return data
+        columns = columns if columns is not None else DEFAULT_COLUMNS
+        ingest_data = IngestData(
+            data_path,
+            columns=columns,
+            chunksize=DEFAULT_CHUNKSIZE,
+            cache_dir=cache_dir,
+        )
+        return ingest_data.get_data()
     except Exception as e:
         logging.info(f"Error while ingesting data: {e}")
-        raise e
\ No newline at end of file
+        raise e
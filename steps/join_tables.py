@@ -0,0 +1,68 @@
+import logging
+from typing import List, Optional
+
+import pandas as pd
+from zenml import step
+
+from src.data_cleanner import narrow_integers
+from src.olist_join import OlistTableJoin
+from src.profiling import profiled
+from src.step_cache import StepCache, fingerprint_file
+from steps.ingest_data import DEFAULT_COLUMNS
+
+
+def cached_join(data_dir: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Joins the raw Olist tables in a directory, or reads the result from the step cache.
+
+    The entry is keyed on the fingerprints of every input file, so the join only
+    runs again when one of the tables changes.
+
+    Args:
+        data_dir (str): Directory holding the raw Olist CSV files.
+        columns (List[str], optional): Columns of the joined table. Defaults to
+            the columns kept by DataPreProcessStrategy.
+
+    Returns:
+        pd.DataFrame: The joined data.
+    """
+    columns = columns if columns is not None else DEFAULT_COLUMNS
+    join = OlistTableJoin(data_dir, columns)
+    step_cache = StepCache()
+    key = step_cache.key(
+        "join_olist_tables",
+        *(fingerprint_file(path) for path in join.paths().values()),
+        columns,
+    )
+    data = step_cache.get(key)
+    if data is not None:
+        return data
+
+    data = narrow_integers(join.join())
+    step_cache.put(key, data)
+    return data
+
+
+@step
+@profiled(name="join_olist_tables", rows_from="return")
+def join_olist_tables(data_dir: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Builds the wide orders table from the raw Olist tables in a directory.
+
+    The orders, items, payments, customers, products and reviews tables are
+    joined on their keys (see src/olist_join.py); see ``cached_join`` for how
+    the result is cached.
+
+    Args:
+        data_dir (str): Directory holding the raw Olist CSV files.
+        columns (List[str], optional): Columns of the joined table. Defaults to
+            the columns kept by DataPreProcessStrategy.
+
+    Returns:
+        pd.DataFrame: The joined data.
+    """
+    try:
+        return cached_join(data_dir, columns)
+    except Exception as e:
+        logging.info(f"Error while joining the Olist tables: {e}")
+        raise e
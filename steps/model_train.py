@@ -1,55 +1,184 @@
 import logging
 import pandas as pd
-import mlflow
-import mlflow.sklearn
 from zenml import step
-from zenml.client import Client
 from zenml.integrations.sklearn.materializers.sklearn_materializer import SklearnMaterializer
-from src.model_dev import LinearRegressionModel
-from sklearn.base import RegressorMixin
-from steps.config import ModelNameConfig
-from mlflow.models.signature import infer_signature
+from src.data_cleanner import TARGET_COLUMN, PreProcessTransformer, StreamingPreProcessStrategy
+from src.linear_artifact import is_linear_pipeline, log_linear_model
+from src.model_dev import MODEL_REGISTRY, IncrementalLinearRegressionModel, get_model
+from src.model_selection import CandidateSelection
+from src.profiling import profile_step, profiled
+from src.segmented_model import SegmentedLinearRegression
+from src.step_cache import StepCache, fingerprint_frame, fingerprint_object
+from src.tracking import AsyncTracker, sample_signature
+from sklearn.pipeline import Pipeline
+from typing_extensions import Annotated
+from steps.config import AUTO_MODEL, ModelNameConfig
+from steps.ingest_data import DEFAULT_CHUNKSIZE, DEFAULT_COLUMNS, IngestData
 
-# Get the experiment tracker from the active ZenML stack
-experiment_tracker = Client().active_stack.experiment_tracker
-
-@step(experiment_tracker=experiment_tracker.name if experiment_tracker else None, output_materializers={"model": SklearnMaterializer})  # ✅ Assign materializer
+# The experiment tracker is attached by the pipelines (see steps/stack.py) so
+# that importing this module does not resolve the ZenML stack.
+@step(output_materializers={"model": SklearnMaterializer})  # ✅ Assign materializer
+@profiled(name="train_model", rows_from="X_train")
 def train_model(
     X_train: pd.DataFrame,
     X_test: pd.DataFrame,
     y_train: pd.DataFrame,
     y_test: pd.DataFrame,
+    preprocessor: PreProcessTransformer,
     config: ModelNameConfig
-) -> RegressorMixin:
+) -> Annotated[Pipeline, "model"]:
     """
-    Trains a linear regression model with MLflow experiment tracking.
+    Trains the configured model with MLflow experiment tracking.
+
+    With ``ml_model_name="auto"`` the ``candidate_models`` are trained in parallel,
+    ranked by ``selection_metric`` on a validation split of X_train, and the best
+    one is refitted on all of X_train. With ``config.segment_column`` one
+    LinearRegression is fitted per segment of that column, in parallel, and the
+    returned pipeline routes rows by segment.
+
+    The regressor is fitted on the preprocessor's output and returned (and logged
+    to MLflow under ``model``, where the deployer looks for it) together with the
+    preprocessor, so the prediction server accepts raw columns. Linear models are
+    logged as a NumPy-only artifact (see src/linear_artifact.py) unless
+    ``config.compact_artifact`` is off.
+
+    When the inputs, config and code match an earlier run the model is restored
+    from the step cache instead of retrained; it is still logged under ``model``
+    in a new run, so the deployer finds it.
 
     Returns:
-        RegressorMixin: Trained model
+        Pipeline: Fitted preprocessor followed by the trained model
     """
 
+    import mlflow
+    import mlflow.sklearn
+
+    step_cache = StepCache()
+    key = step_cache.key(
+        "train_model",
+        *(fingerprint_frame(frame) for frame in (X_train, X_test, y_train, y_test)),
+        fingerprint_object(preprocessor),
+        config.model_dump_json(),
+    )
+    cached_model = step_cache.get(key)
+
     # ✅ Ensure there is no active MLflow run before starting a new one
     if mlflow.active_run():
         mlflow.end_run()
 
-    model = None
-
-    if config.ml_model_name == "LinearRegression":
+    if cached_model is not None:
         with mlflow.start_run():
-            mlflow.sklearn.autolog()
-            
-            model = LinearRegressionModel()
-            trained_model = model.train(X_train, y_train)
+            mlflow.set_tag("step_cache", "hit")
+            _log_model(cached_model, X_train, config)
+        return cached_model
 
-            # ✅ Infer model signature
-            signature = infer_signature(X_train, trained_model.predict(X_train))
+    model = None
 
-            # ✅ Log the trained model with MLflow
-            mlflow.sklearn.log_model(trained_model, artifact_path="linear_regression_model", signature=signature)
+    if config.ml_model_name in MODEL_REGISTRY or config.ml_model_name == AUTO_MODEL:
+        # Params, metrics and tags are written in the background; the model is
+        # logged explicitly below, bundled with its preprocessor.
+        with mlflow.start_run(), AsyncTracker() as tracker:
+            if config.ml_model_name == AUTO_MODEL:
+                selection = CandidateSelection(
+                    config.candidate_models, metric=config.selection_metric, n_workers=config.n_workers
+                )
+                # Ranked on a validation split of X_train, so evaluate_model's test scores stay unbiased
+                best_name, trained_model, scores = selection.train(preprocessor.transform(X_train), y_train)
+                tracker.log_metrics({f"{name}_val_{config.selection_metric}": score for name, score in scores.items()})
+                tracker.set_tags({"selected_model": best_name})
+            elif config.segment_column is not None:
+                if config.ml_model_name != "LinearRegression":
+                    raise ValueError("Segmented training only supports LinearRegression")
+                trained_model = SegmentedLinearRegression(
+                    preprocessor, config.segment_column, config.min_segment_rows, config.n_workers
+                ).fit(X_train, y_train)
+                tracker.log_metrics({
+                    "n_segments": len(trained_model.segments_),
+                    "n_segments_fitted": int((trained_model.segment_rows_ >= config.min_segment_rows).sum()),
+                })
+            elif config.ml_model_name == "LinearRegression" and config.incremental:
+                model = IncrementalLinearRegressionModel(config.sufficient_stats_path)
+                # Every partition is filled with the first one's values, also at inference
+                preprocessor = model.freeze_preprocessor(preprocessor)
+                trained_model = model.train(
+                    preprocessor.transform(X_train), y_train,
+                    partition_id=config.partition_id, fill_values=preprocessor.fill_values_,
+                )
+                tracker.log_artifact(config.sufficient_stats_path)
+            else:
+                model = get_model(config.ml_model_name)
+                trained_model = model.train(preprocessor.transform(X_train), y_train, **config.model_params)
+            tracker.log_params(trained_model.get_params())
+            tracker.set_tags({"estimator_class": type(trained_model).__name__})
+            if isinstance(trained_model, SegmentedLinearRegression):
+                # The segmented model preprocesses itself, as it also needs the raw segment column
+                inference_pipeline = Pipeline([("model", trained_model)])
+            else:
+                inference_pipeline = Pipeline([("preprocess", preprocessor), ("model", trained_model)])
 
+            _log_model(inference_pipeline, X_train, config)
             logging.info("Model trained and logged to MLflow successfully.")
-            return trained_model  # ✅ Now uses SklearnMaterializer
+            step_cache.put(key, inference_pipeline)
+            return inference_pipeline  # ✅ Now uses SklearnMaterializer
         
     else:
         logging.error(f"Unsupported model name: {config.ml_model_name}")
         raise ValueError("Unsupported model name")
+
+
+@step(output_materializers={"model": SklearnMaterializer})
+def train_incremental_model(data_path: str, config: ModelNameConfig) -> Annotated[Pipeline, "model"]:
+    """
+    Folds a new data partition into the incremental LinearRegression without loading it whole.
+
+    ``data_path`` holds only the new partition, named by ``config.partition_id``.
+    It is read in chunks twice: StreamingPreProcessStrategy collects the fill
+    medians on the first pass, and the second pass preprocesses every chunk and
+    folds it into the sufficient statistics. Once statistics exist, their frozen
+    fill values are used instead of the partition's medians.
+
+    Returns:
+        Pipeline: Preprocessor followed by the model fitted on every partition so far
+    """
+    import mlflow
+
+    with profile_step("train_incremental_model"):
+        ingest = IngestData(data_path, columns=DEFAULT_COLUMNS, chunksize=DEFAULT_CHUNKSIZE)
+        model = IncrementalLinearRegressionModel(config.sufficient_stats_path)
+        strategy = StreamingPreProcessStrategy().fit(ingest.iter_chunks())
+        preprocessor = model.freeze_preprocessor(strategy.to_transformer())
+        batches = (
+            (preprocessor.transform(chunk), chunk[TARGET_COLUMN].to_numpy(dtype="float64"))
+            for chunk in ingest.iter_chunks()
+        )
+
+        if mlflow.active_run():
+            mlflow.end_run()
+        with mlflow.start_run(), AsyncTracker() as tracker:
+            trained_model = model.train_batches(
+                batches, partition_id=config.partition_id, fill_values=preprocessor.fill_values_
+            )
+            tracker.log_artifact(config.sufficient_stats_path)
+            tracker.log_params(trained_model.get_params())
+            tracker.set_tags({"estimator_class": type(trained_model).__name__, "partition_id": config.partition_id})
+            inference_pipeline = Pipeline([("preprocess", preprocessor), ("model", trained_model)])
+
+            chunks = ingest.iter_chunks()
+            sample = next(chunks).drop(columns=TARGET_COLUMN)
+            chunks.close()
+            _log_model(inference_pipeline, sample, config)
+            logging.info(f"Model trained through partition {config.partition_id} and logged to MLflow.")
+            return inference_pipeline
+
+
+def _log_model(inference_pipeline: Pipeline, X_train: pd.DataFrame, config: ModelNameConfig):
+    import mlflow.sklearn
+
+    # ✅ Infer model signature from a sample of the training data
+    signature = sample_signature(inference_pipeline, X_train)
+
+    # ✅ Log the trained model with MLflow
+    if config.compact_artifact and is_linear_pipeline(inference_pipeline):
+        log_linear_model(inference_pipeline, artifact_path="model", signature=signature)
+    else:
+        mlflow.sklearn.log_model(inference_pipeline, artifact_path="model", signature=signature)
@@ -0,0 +1,30 @@
+import functools
+from typing import Optional
+
+
+@functools.lru_cache(maxsize=None)
+def experiment_tracker_name() -> Optional[str]:
+    """
+    Resolves the active stack's experiment tracker on first use.
+
+    Steps no longer look the tracker up at import time; pipelines attach it with
+    ``step.with_options(experiment_tracker=experiment_tracker_name())`` when they
+    are built, so importing steps (and src/) does not start a ZenML client.
+
+    Returns:
+        Optional[str]: Name of the experiment tracker, or None if the stack has none
+    """
+    from zenml.client import Client
+
+    experiment_tracker = Client().active_stack.experiment_tracker
+    return experiment_tracker.name if experiment_tracker else None
+
+
+@functools.lru_cache(maxsize=None)
+def model_deployer():
+    """
+    Resolves the active stack's MLflow model deployer on first use.
+    """
+    from zenml.integrations.mlflow.model_deployers.mlflow_model_deployer import MLFlowModelDeployer
+
+    return MLFlowModelDeployer.get_active_model_deployer()
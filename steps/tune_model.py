@@ -0,0 +1,52 @@
+import logging
+from typing import Any, Dict, Tuple
+import pandas as pd
+from zenml import step
+from typing_extensions import Annotated
+from src.data_cleanner import PreProcessTransformer
+from src.hyperparameter_tuning import HyperparameterTuner
+from src.profiling import profiled
+from steps.config import TuningConfig
+
+@step
+@profiled(name="tune_model", rows_from="X_train")
+def tune_model(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    preprocessor: PreProcessTransformer,
+    config: TuningConfig
+) -> Tuple[
+    Annotated[Dict[str, Any], "best_params"],
+    Annotated[float, "best_cv_rmse"]
+]:
+    """
+    Searches the configured model's hyperparameters with Optuna.
+
+    The study lives in ``config.storage_path``, so rerunning the step resumes an
+    interrupted search instead of restarting it. Studies are keyed on the
+    training data and search space, so new data gets a search of its own.
+
+    Args:
+        X_train (pd.DataFrame): Training data
+        y_train (pd.Series): Training labels
+        preprocessor (PreProcessTransformer): Fitted preprocessing
+        config (TuningConfig): Search settings
+    Returns:
+        best_params: Keyword arguments for the model (see ModelNameConfig.model_params)
+        best_cv_rmse: Mean cross-validated RMSE of the best trial
+    """
+    try:
+        tuner = HyperparameterTuner(
+            config.ml_model_name,
+            config.storage_path,
+            study_name=config.study_name,
+            n_trials=config.n_trials,
+            n_workers=config.n_workers,
+            n_folds=config.n_folds,
+            pruner=config.pruner,
+        )
+        study = tuner.tune(preprocessor.transform(X_train), y_train)
+        return tuner.best_model_params(study), float(study.best_value)
+    except Exception as e:
+        logging.error(f"Error occurred during hyperparameter tuning: {str(e)}")
+        raise e
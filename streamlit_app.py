@@ -0,0 +1,122 @@
+"""
+Scores customer-satisfaction predictions with the latest deployed model.
+
+    streamlit run streamlit_app.py
+
+Set MODEL_URI to serve a specific model instead of the one behind the running
+MLflow deployment. Streamlit reruns this script on every interaction, so the
+model is loaded once per process (and again only when a new model is deployed),
+and the charts come from the aggregates file written by the deployment pipeline instead
+of the dataset.
+"""
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.dashboard import (
+    AGGREGATES_PATH, input_columns, load_aggregates, read_batch, score_batch, segment_column_of,
+)
+from src.inference_server import load_model, model_version
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def resolve_model() -> tuple:
+    """URI and version of the model to serve; looked up at most once a minute."""
+    uri = os.environ.get("MODEL_URI")
+    if uri is None:
+        from run_deployment import deployed_model_uri
+
+        uri = deployed_model_uri()
+    return uri, (model_version(uri) if uri else None)
+
+
+@st.cache_resource(show_spinner="Loading model...")
+def get_model(uri: str, version: str):
+    # Keyed on the version, so a new deployment is picked up and the old handle dropped
+    return load_model(uri)
+
+
+@st.cache_data(show_spinner=False)
+def get_aggregates(path: str, mtime: float):
+    return load_aggregates(path)
+
+
+@st.cache_data(show_spinner="Scoring...", max_entries=8)
+def score_upload(data: bytes, uri: str, version: str) -> tuple:
+    # Cached on the file contents, so other interactions do not re-read, re-score or re-encode it
+    model = get_model(uri, version)
+    frame = read_batch(io.BytesIO(data), input_columns(model))
+    frame["prediction"] = score_batch(model, frame)
+    return frame, frame.to_csv(index=False).encode()
+
+
+st.set_page_config(page_title="Customer Satisfaction", layout="wide")
+st.title("Customer Satisfaction Prediction")
+
+uri, version = resolve_model()
+if uri is None:
+    st.error("No deployed model found. Run `python run_deployment.py --config deploy` or set MODEL_URI.")
+    st.stop()
+model = get_model(uri, version)
+columns = input_columns(model)
+aggregates = get_aggregates(AGGREGATES_PATH, os.path.getmtime(AGGREGATES_PATH)) if os.path.exists(AGGREGATES_PATH) else None
+
+overview, single, batch = st.tabs(["Model", "Score an order", "Score a file"])
+
+with overview:
+    st.caption(f"Serving `{uri}`")
+    if aggregates is None:
+        st.info(f"No {AGGREGATES_PATH} yet; it is written when the deployment pipeline deploys a model.")
+    else:
+        st.caption(f"Test set of {aggregates['rows']:,} rows, computed {aggregates['created_at']}")
+        metric_columns = st.columns(len(aggregates["metrics"]))
+        for column, (name, value) in zip(metric_columns, aggregates["metrics"].items()):
+            column.metric(name, f"{value:.4f}")
+        histogram = aggregates["prediction_histogram"]
+        left, right = st.columns(2)
+        left.subheader("Predicted score")
+        centres = (np.array(histogram["edges"][:-1]) + np.array(histogram["edges"][1:])) / 2
+        left.bar_chart(pd.DataFrame({"orders": histogram["counts"]}, index=np.round(centres, 2)))
+        right.subheader("Actual review score")
+        right.bar_chart(pd.DataFrame({"orders": list(aggregates["label_counts"].values())},
+                                     index=list(aggregates["label_counts"])))
+        if aggregates["segments"]:
+            st.subheader(f"Metrics by {aggregates['segment_column']}")
+            st.dataframe(pd.DataFrame(aggregates["segments"]).T.sort_values("rows", ascending=False))
+
+with single:
+    features = (aggregates or {}).get("features", {})
+    segment_column = segment_column_of(model)
+    # A form only reruns the script on submit, not on every edited field
+    with st.form("order"):
+        fields = st.columns(3)
+        record = {}
+        for i, column in enumerate(columns):
+            stats = features.get(column)
+            if column == segment_column:
+                record[column] = fields[i % 3].text_input(column)
+            else:
+                default = stats["median"] if stats is not None and np.isfinite(stats["median"]) else 0.0
+                record[column] = fields[i % 3].number_input(column, value=float(default))
+        submitted = st.form_submit_button("Predict")
+    if submitted:
+        try:
+            prediction = score_batch(model, pd.DataFrame([record]))[0]
+            st.success(f"Predicted customer satisfaction: {prediction:.2f} / 5")
+        except ValueError as e:
+            st.error(str(e))
+
+with batch:
+    upload = st.file_uploader("CSV with the model's columns", type="csv")
+    if upload is not None:
+        try:
+            frame, csv = score_upload(upload.getvalue(), uri, version)
+            st.caption(f"Scored {len(frame):,} rows")
+            st.dataframe(frame.head(1000))
+            st.download_button("Download predictions", csv,
+                               file_name="predictions.csv", mime="text/csv")
+        except ValueError as e:
+            st.error(str(e))
@@ -0,0 +1,19 @@
+import os
+import tempfile
+
+import pytest
+
+# Profiles and step-cache entries written by the code under test go to a
+# scratch directory instead of artifacts/. Set before any src module is imported.
+_SCRATCH = tempfile.mkdtemp(prefix="mlops-tests-")
+os.environ.setdefault("PROFILE_DIR", os.path.join(_SCRATCH, "profiles"))
+os.environ.setdefault("STEP_CACHE_DIR", os.path.join(_SCRATCH, "step_cache"))
+os.environ.setdefault("MLFLOW_DISABLE_AGENT_HINT", "1")
+
+
+@pytest.fixture(scope="session")
+def olist_csv(tmp_path_factory) -> str:
+    """A small synthetic merged Olist file."""
+    from src.synthetic_data import generate
+
+    return generate(str(tmp_path_factory.mktemp("data") / "olist.csv"), n_rows=3000, chunksize=1000)
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.pipeline import Pipeline
+
+from src.autoscaler import ScalingPolicy, WorkerSupervisor
+from src.data_cleanner import FEATURE_COLUMNS, PreProcessTransformer
+from src.linear_artifact import export_linear_model
+from src.segmented_model import SegmentedLinearRegression
+
+
+def test_history_is_bounded_by_the_policy_window():
+    supervisor = WorkerSupervisor("unused", policy=ScalingPolicy(min_workers=0, cooldown_s=5.0), poll_interval_s=0.5)
+    for _ in range(100):
+        supervisor.poll()
+    assert len(supervisor.history) == supervisor.history.maxlen == 11
+
+
+def test_segmented_models_are_refused_before_any_worker_starts(tmp_path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(500, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    X["customer_state"] = rng.choice(np.array(["SP", "RJ"]), len(X))
+    y = pd.Series(rng.normal(size=len(X)))
+    model = SegmentedLinearRegression(PreProcessTransformer().fit(X), min_segment_rows=50).fit(X, y)
+    path = export_linear_model(Pipeline([("model", model)]), str(tmp_path / "model"))
+
+    supervisor = WorkerSupervisor(path, port=0)
+    with pytest.raises(ValueError, match="segmented"):
+        supervisor.start()
+    assert supervisor.workers == 0
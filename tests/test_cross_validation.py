@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.cross_validation import CrossValidator
+from src.data_cleanner import MEDIAN_FILL_COLUMNS, TARGET_COLUMN, IndexSplitStrategy, PreProcessTransformer
+from src.model_evaluator import RegressionMetrics
+from steps.ingest_data import DEFAULT_COLUMNS, IngestData
+
+
+@pytest.fixture
+def data(olist_csv):
+    data = IngestData(olist_csv, columns=DEFAULT_COLUMNS).get_data()
+    # Enough nulls that fill values differ between folds
+    rng = np.random.default_rng(6)
+    data.loc[rng.random(len(data)) < 0.2, "product_weight_g"] = np.nan
+    return data
+
+
+@pytest.mark.parametrize("time_column", [None, "row_time"])
+def test_folds_fill_nulls_from_their_training_rows(data, time_column):
+    data = data.assign(row_time=pd.date_range("2018-01-01", periods=len(data), freq="h"))
+    folds = IndexSplitStrategy(n_splits=3, time_column=time_column).handle_data(data)
+    features = data[DEFAULT_COLUMNS].drop(columns=TARGET_COLUMN)
+    columns = list(features.columns)
+    fill_columns = [j for j, c in enumerate(columns) if c in MEDIAN_FILL_COLUMNS]
+
+    summary = CrossValidator("LinearRegression", n_workers=2, fill_columns=fill_columns).evaluate(
+        features.to_numpy(dtype=np.float64, na_value=np.nan), data[TARGET_COLUMN].to_numpy(), folds
+    )
+
+    expected = []
+    for train_idx, test_idx in folds:
+        train, test = data.iloc[train_idx], data.iloc[test_idx]
+        preprocessor = PreProcessTransformer().fit(train)
+        model = LinearRegression().fit(preprocessor.transform(train), train[TARGET_COLUMN])
+        expected.append(RegressionMetrics().calculate_scores(test[TARGET_COLUMN], model.predict(preprocessor.transform(test))))
+    for name in ("MSE", "r2_score"):
+        assert summary["mean"][name] == pytest.approx(np.mean([e[name] for e in expected]), rel=1e-9)
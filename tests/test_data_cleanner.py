@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_cleanner import (
+    MEDIAN_FILL_COLUMNS,
+    DataPreProcessStrategy,
+    PreProcessTransformer,
+    StreamingPreProcessStrategy,
+)
+from steps.ingest_data import DEFAULT_COLUMNS, IngestData
+
+
+@pytest.fixture
+def ingest(olist_csv):
+    return IngestData(olist_csv, columns=DEFAULT_COLUMNS, chunksize=500)
+
+
+def test_streaming_matches_in_memory_preprocessing(ingest):
+    data = pd.concat(ingest.iter_chunks(), ignore_index=True)
+    expected = DataPreProcessStrategy().handle_data(data)
+    # Exact medians, so that only the chunking differs from the in-memory path
+    strategy = StreamingPreProcessStrategy(sketch_size=1 << 16)
+    streamed = pd.concat(strategy.handle_data(ingest.iter_chunks), ignore_index=True)
+
+    assert list(streamed.columns) == list(expected.columns)
+    np.testing.assert_allclose(streamed.to_numpy(dtype=np.float64), expected.to_numpy(dtype=np.float64))
+
+
+def test_transformer_matches_a_fitted_one(ingest):
+    data = pd.concat(ingest.iter_chunks(), ignore_index=True)
+    fitted = PreProcessTransformer().fit(data)
+    transformer = StreamingPreProcessStrategy().fit(ingest.iter_chunks()).to_transformer()
+
+    assert list(transformer.feature_names_in_) == list(fitted.feature_names_in_)
+    filled = [i for i, c in enumerate(fitted.feature_names_in_) if c in MEDIAN_FILL_COLUMNS]
+    np.testing.assert_array_equal(np.isnan(transformer.fill_values_), np.isnan(fitted.fill_values_))
+    # Sketch medians are approximate
+    np.testing.assert_allclose(transformer.fill_values_[filled], fitted.fill_values_[filled], rtol=0.02)
+
+
+def test_refit_takes_the_new_schema(ingest):
+    strategy = StreamingPreProcessStrategy().fit(ingest.iter_chunks())
+    narrower = (chunk.drop(columns=["payment_value"]) for chunk in ingest.iter_chunks())
+    strategy.fit(narrower)
+
+    assert "payment_value" not in strategy.columns
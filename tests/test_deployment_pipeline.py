@@ -0,0 +1,70 @@
+import inspect
+
+import numpy as np
+import pytest
+from sklearn.pipeline import Pipeline
+
+from pipelines.deployment_pipeline import DeploymentTriggerConfig, continous_deployment_pipeline, deployment_trigger
+from src.model_dev import get_model
+from src.model_evaluator import BootstrapMetrics
+from steps.clean_data import clean_data
+from steps.evaluation import bootstrap_evaluate_model
+from steps.ingest_data import DEFAULT_COLUMNS, IngestData
+
+
+def _default_min_accuracy() -> float:
+    from run_deployment import run_deployment
+
+    cli_default = next(p.default for p in run_deployment.params if p.name == "min_accuracy")
+    pipeline_default = inspect.signature(continous_deployment_pipeline.entrypoint).parameters["min_accuracy"].default
+    assert cli_default == pipeline_default == DeploymentTriggerConfig().min_accuracy
+    return pipeline_default
+
+
+def _bootstrap_r2_lower(y_true, y_pred) -> float:
+    defaults = inspect.signature(bootstrap_evaluate_model.entrypoint).parameters
+    metrics = BootstrapMetrics(n_resamples=defaults["n_resamples"].default, confidence=defaults["confidence"].default)
+    return metrics.calculate_scores(y_true, y_pred)["r2_score"]["lower"]
+
+
+@pytest.fixture(scope="module")
+def full_size_olist_csv(tmp_path_factory) -> str:
+    """Synthetic data at the size of the real Olist file, where a linear model reaches an R² near 0.01."""
+    from src.synthetic_data import generate
+
+    return generate(str(tmp_path_factory.mktemp("data") / "olist_full.csv"), n_rows=100_000)
+
+
+def test_default_gate_deploys_a_model_trained_on_olist_data(full_size_olist_csv):
+    data = IngestData(full_size_olist_csv, columns=DEFAULT_COLUMNS).get_data()
+    X_train, X_test, y_train, y_test, preprocessor = clean_data.entrypoint(data)
+    model = Pipeline([
+        ("preprocess", preprocessor),
+        ("model", get_model("LinearRegression").train(preprocessor.transform(X_train), y_train)),
+    ])
+
+    r2_lower = _bootstrap_r2_lower(y_test.to_numpy(), model.predict(X_test))
+    config = DeploymentTriggerConfig(min_accuracy=_default_min_accuracy())
+    assert deployment_trigger.entrypoint(accuracy=r2_lower, drift_detected=True, config=config)
+
+
+def test_default_gate_deploys_a_weak_but_real_model():
+    # About the R² the models reach on the real Olist data (~0.017)
+    rng = np.random.default_rng(5)
+    n = 20_000
+    signal = rng.normal(size=n)
+    y_true = 4.0 + 0.13 * signal + rng.normal(size=n)
+    y_pred = 4.0 + 0.13 * signal
+
+    r2_lower = _bootstrap_r2_lower(y_true, y_pred)
+    assert 0.0 < r2_lower < 0.02
+    config = DeploymentTriggerConfig(min_accuracy=_default_min_accuracy())
+    assert deployment_trigger.entrypoint(accuracy=r2_lower, drift_detected=True, config=config)
+
+
+@pytest.mark.parametrize("r2_lower, drift_detected", [(-0.01, True), (0.02, False)])
+def test_default_gate_rejects(r2_lower, drift_detected):
+    # A model no better than the mean, or unchanged data
+    assert not deployment_trigger.entrypoint(
+        accuracy=r2_lower, drift_detected=drift_detected, config=DeploymentTriggerConfig()
+    )
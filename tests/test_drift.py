@@ -0,0 +1,21 @@
+import pytest
+
+from steps.config import DriftConfig
+from steps.drift import check_drift, update_drift_reference
+from steps.ingest_data import IngestData
+
+
+@pytest.fixture
+def drift_config(tmp_path) -> DriftConfig:
+    return DriftConfig(reference_path=str(tmp_path / "drift_reference.json"), chunksize=1000)
+
+
+def test_reference_is_written_without_a_deployment(olist_csv, drift_config):
+    assert check_drift.entrypoint(olist_csv, config=drift_config) == (True, float("inf"))
+
+    data = IngestData(olist_csv).get_data()
+    update_drift_reference.entrypoint(data, config=drift_config)
+
+    drift_detected, max_psi = check_drift.entrypoint(olist_csv, config=drift_config)
+    assert not drift_detected
+    assert max_psi < drift_config.psi_threshold
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from src.hyperparameter_tuning import HyperparameterTuner
+
+
+def _data(seed):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(300, 3))
+    return X, X @ np.array([1.0, -2.0, 0.5]) + rng.normal(0, 0.1, 300)
+
+
+def test_finished_study_is_not_reused_for_new_data(tmp_path):
+    storage = str(tmp_path / "optuna.db")
+    first = HyperparameterTuner("LinearRegression", storage, n_trials=3, pruner="none").tune(*_data(0))
+    again = HyperparameterTuner("LinearRegression", storage, n_trials=3, pruner="none").tune(*_data(0))
+    new_data = HyperparameterTuner("LinearRegression", storage, n_trials=3, pruner="none").tune(*_data(1))
+
+    assert again.study_name == first.study_name
+    assert len(again.trials) == 3
+    assert new_data.study_name != first.study_name
+    assert len(new_data.trials) == 3
+
+
+def test_named_study_refuses_different_data(tmp_path):
+    storage = str(tmp_path / "optuna.db")
+    HyperparameterTuner("LinearRegression", storage, study_name="lr", n_trials=2, pruner="none").tune(*_data(0))
+
+    with pytest.raises(ValueError, match="different data"):
+        HyperparameterTuner("LinearRegression", storage, study_name="lr", n_trials=2, pruner="none").tune(*_data(1))
@@ -0,0 +1,57 @@
+import os
+
+import pandas as pd
+import pandas.testing as pdt
+
+from steps.ingest_data import DEFAULT_COLUMNS, IngestData
+
+
+def test_cache_round_trip_matches_csv(olist_csv, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    ingest = IngestData(olist_csv, columns=DEFAULT_COLUMNS, chunksize=700, cache_dir=cache_dir)
+
+    written = ingest.get_data()
+    assert os.path.exists(ingest.cache_path())
+    cached = ingest.get_data()
+    uncached = IngestData(olist_csv, columns=DEFAULT_COLUMNS, chunksize=700).get_data()
+
+    pdt.assert_frame_equal(cached, written)
+    pdt.assert_frame_equal(cached, uncached)
+    assert list(cached.columns) == DEFAULT_COLUMNS
+    assert len(cached) == 3000
+
+
+def test_cached_values_match_a_plain_read(olist_csv, tmp_path):
+    cached = IngestData(olist_csv, columns=DEFAULT_COLUMNS, cache_dir=str(tmp_path)).get_data()
+    plain = pd.read_csv(olist_csv, usecols=DEFAULT_COLUMNS)[DEFAULT_COLUMNS]
+
+    pdt.assert_frame_equal(cached.astype("float64"), plain.astype("float64"), rtol=1e-6)
+    # Integer-valued columns without nulls are narrowed; the rest stay float32
+    assert cached["review_score"].dtype == "int16"
+    assert cached["price"].dtype == "float32"
+    assert cached["product_photos_qty"].dtype == "float32"
+
+
+def test_category_columns_survive_the_cache(olist_csv, tmp_path):
+    columns = DEFAULT_COLUMNS + ["customer_state"]
+    ingest = IngestData(olist_csv, columns=columns, cache_dir=str(tmp_path))
+    ingest.get_data()
+    cached = ingest.get_data()
+
+    assert isinstance(cached["customer_state"].dtype, pd.CategoricalDtype)
+    expected = pd.read_csv(olist_csv, usecols=["customer_state"])["customer_state"]
+    assert cached["customer_state"].astype(str).tolist() == expected.tolist()
+
+
+def test_cache_key_follows_contents_and_columns(olist_csv, tmp_path):
+    copy = tmp_path / "copy.csv"
+    copy.write_bytes(open(olist_csv, "rb").read())
+    cache_dir = str(tmp_path / "cache")
+    ingest = IngestData(str(copy), columns=DEFAULT_COLUMNS, cache_dir=cache_dir)
+    before = ingest.cache_path()
+
+    assert IngestData(str(copy), columns=DEFAULT_COLUMNS[:3], cache_dir=cache_dir).cache_path() != before
+    with open(copy, "a") as f:
+        f.write(open(olist_csv).readlines()[1])
+    assert ingest.cache_path() != before
+    assert len(ingest.get_data()) == 3001
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.model_dev import IncrementalLinearRegressionModel
+
+
+@pytest.fixture
+def partitions():
+    rng = np.random.default_rng(2)
+    coef = rng.normal(size=5)
+    out = []
+    for n in (800, 500):
+        X = rng.normal(size=(n, 5))
+        out.append((X, X @ coef + 3.0 + rng.normal(0, 0.1, n)))
+    return out
+
+
+def test_partitions_fold_into_the_full_fit(partitions, tmp_path):
+    model = IncrementalLinearRegressionModel(str(tmp_path / "stats.npz"))
+    model.train(*partitions[0], partition_id="2018-01", chunksize=300)
+    batches = [(X[i:i + 200], y[i:i + 200]) for X, y in partitions[1:] for i in range(0, len(X), 200)]
+    reg = model.train_batches(iter(batches), partition_id="2018-02")
+
+    expected = LinearRegression().fit(np.vstack([p[0] for p in partitions]), np.concatenate([p[1] for p in partitions]))
+    np.testing.assert_allclose(reg.coef_, expected.coef_, rtol=1e-10)
+    assert reg.intercept_ == pytest.approx(expected.intercept_, rel=1e-10)
+
+
+def test_known_partition_is_not_read_again(partitions, tmp_path):
+    model = IncrementalLinearRegressionModel(str(tmp_path / "stats.npz"))
+    first = model.train(*partitions[0], partition_id="2018-01")
+
+    def unread():
+        raise AssertionError("batches of a known partition were read")
+        yield
+
+    again = model.train_batches(unread(), partition_id="2018-01")
+    np.testing.assert_array_equal(again.coef_, first.coef_)
+
+
+def test_partition_id_is_required(partitions, tmp_path):
+    with pytest.raises(ValueError):
+        IncrementalLinearRegressionModel(str(tmp_path / "stats.npz")).train(*partitions[0])
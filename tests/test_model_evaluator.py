@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from src.model_evaluator import RegressionMetrics, RegressionMetricsAccumulator
+
+
+def _sklearn_scores(y_true, y_pred):
+    mse = mean_squared_error(y_true, y_pred)
+    return {
+        "MSE": mse,
+        "RMSE": np.sqrt(mse),
+        "MAE": mean_absolute_error(y_true, y_pred),
+        "r2_score": r2_score(y_true, y_pred),
+    }
+
+
+@pytest.fixture
+def predictions():
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(1, 6, 5000).astype(np.float64)
+    y_pred = y_true + rng.normal(0, 0.8, 5000)
+    segments = rng.choice(np.array(["SP", "RJ", "MG", "BA"]), 5000)
+    return y_true, y_pred, segments
+
+
+def test_scores_match_sklearn(predictions):
+    y_true, y_pred, _ = predictions
+    scores = RegressionMetrics().calculate_scores(y_true, y_pred)
+    for name, expected in _sklearn_scores(y_true, y_pred).items():
+        assert scores[name] == pytest.approx(expected, rel=1e-12)
+
+
+def test_segment_scores_match_sklearn(predictions):
+    y_true, y_pred, segments = predictions
+    scores = RegressionMetrics().calculate_scores(y_true, y_pred, segments)
+
+    assert set(scores["segments"]) == {"SP", "RJ", "MG", "BA"}
+    for segment, segment_scores in scores["segments"].items():
+        rows = segments == segment
+        for name, expected in _sklearn_scores(y_true[rows], y_pred[rows]).items():
+            assert segment_scores[name] == pytest.approx(expected, rel=1e-12)
+
+
+def test_streamed_batches_match_one_pass(predictions):
+    y_true, y_pred, segments = predictions
+    _, codes = np.unique(segments, return_inverse=True)
+    accumulator = RegressionMetricsAccumulator()
+    for batch in np.array_split(np.arange(len(y_true)), 7):
+        accumulator.update(y_true[batch], y_pred[batch], codes[batch])
+
+    one_pass = RegressionMetricsAccumulator().update(y_true, y_pred, codes)
+    for name, value in one_pass.result().items():
+        assert accumulator.result()[name] == pytest.approx(value, rel=1e-12)
+    for code, segment_scores in one_pass.segment_results().items():
+        for name, value in segment_scores.items():
+            assert accumulator.segment_results()[code][name] == pytest.approx(value, rel=1e-12)
+
+
+def test_r2_is_stable_for_a_large_offset(predictions):
+    y_true, y_pred, _ = predictions
+    scores = RegressionMetrics().calculate_scores(y_true + 1e8, y_pred + 1e8)
+    assert scores["r2_score"] == pytest.approx(r2_score(y_true, y_pred), rel=1e-6)
+
+
+def test_segments_from_an_object_column(predictions):
+    y_true, y_pred, segments = predictions
+    column = pd.Series(segments.tolist(), dtype=object)
+    scores = RegressionMetrics().calculate_scores(y_true, y_pred, column.to_numpy())
+
+    assert set(scores["segments"]) == {"SP", "RJ", "MG", "BA"}
+    assert all(type(label) is str for label in scores["segments"])
+    integer_scores = RegressionMetrics().calculate_scores(y_true, y_pred, np.unique(segments, return_inverse=True)[1])
+    assert all(type(label) is int for label in integer_scores["segments"])
@@ -0,0 +1,27 @@
+import numpy as np
+
+from src.model_selection import CandidateSelection, SharedArrays, _train_candidate
+
+
+def test_workers_return_only_the_score():
+    rng = np.random.default_rng(3)
+    X, y = rng.normal(size=(200, 4)), rng.normal(size=200)
+    with SharedArrays(X_train=X[:150], y_train=y[:150], X_val=X[150:], y_val=y[150:]) as shared:
+        result = _train_candidate("LinearRegression", shared.specs, "rmse", {})
+
+    assert result[0] == "LinearRegression"
+    assert isinstance(result[1], float)
+    assert len(result) == 2
+
+
+def test_selects_the_best_validation_score():
+    rng = np.random.default_rng(4)
+    X = rng.normal(size=(2000, 3))
+    # Non-linear target, which the tree model fits and the linear one cannot
+    y = np.sign(X[:, 0]) * 2 + X[:, 1] ** 2 + rng.normal(0, 0.1, 2000)
+    selection = CandidateSelection(["LinearRegression", "LightGBM"], metric="rmse", n_workers=2)
+    best_name, model, scores = selection.train(X, y)
+
+    assert set(scores) == {"LinearRegression", "LightGBM"}
+    assert best_name == min(scores, key=scores.get) == "LightGBM"
+    assert model.predict(X).shape == (2000,)
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from src.olist_join import encode_keys, hash_join
+
+
+def _brute_force_join(left_codes, right_codes):
+    return sorted(
+        (i, j) for i, a in enumerate(left_codes) for j, b in enumerate(right_codes) if a >= 0 and a == b
+    )
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_hash_join_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n_keys = 20
+    # Many-to-many keys, keys on one side only, and nulls (-1) on both sides
+    left = rng.integers(-1, n_keys, 300)
+    right = rng.integers(-1, n_keys - 5, 200)
+
+    left_idx, right_idx = hash_join(left, right, n_keys)
+
+    assert sorted(zip(left_idx.tolist(), right_idx.tolist())) == _brute_force_join(left, right)
+    # Output follows the left input's row order, like pd.merge(how="inner", sort=False)
+    assert np.all(np.diff(left_idx) >= 0)
+
+
+def test_encode_keys_shares_codes_across_tables():
+    import pandas as pd
+
+    (left, right), n_keys = encode_keys(pd.Series(["a", "b", None, "c"]), pd.Series(["c", "a", "d"]))
+
+    assert n_keys == 4
+    assert left[2] == -1
+    assert left[0] == right[1] and left[3] == right[0]
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.data_cleanner import FEATURE_COLUMNS, MEDIAN_FILL_COLUMNS, PreProcessTransformer, TARGET_COLUMN
+from src.segmented_model import SegmentedLinearRegression
+
+
+@pytest.fixture
+def segmented_data():
+    rng = np.random.default_rng(1)
+    n = 4000
+    X = pd.DataFrame(rng.normal(size=(n, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    X["customer_state"] = rng.choice(np.array(["SP", "RJ", "MG", "AC"]), n, p=[0.5, 0.3, 0.195, 0.005])
+    # Every state has its own weights, so the per-segment fits differ from the global one
+    weights = {state: rng.normal(size=len(FEATURE_COLUMNS)) for state in ["SP", "RJ", "MG", "AC"]}
+    y = pd.Series(
+        [row @ weights[state] for row, state in zip(X[FEATURE_COLUMNS].to_numpy(), X["customer_state"])]
+        + rng.normal(0, 0.1, n),
+        name=TARGET_COLUMN,
+    )
+    return X, y
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_segments_match_separate_fits(segmented_data, n_workers):
+    X, y = segmented_data
+    preprocessor = PreProcessTransformer().fit(X)
+    model = SegmentedLinearRegression(preprocessor, min_segment_rows=50, n_workers=n_workers).fit(X, y)
+
+    for state in ["SP", "RJ", "MG"]:
+        rows = (X["customer_state"] == state).to_numpy()
+        expected = LinearRegression().fit(preprocessor.transform(X[rows]), y[rows])
+        np.testing.assert_allclose(model.predict(X[rows]), expected.predict(preprocessor.transform(X[rows])),
+                                   rtol=1e-9, atol=1e-9)
+
+
+def test_small_and_unseen_segments_use_the_global_model(segmented_data):
+    X, y = segmented_data
+    preprocessor = PreProcessTransformer().fit(X)
+    model = SegmentedLinearRegression(preprocessor, min_segment_rows=50, n_workers=1).fit(X, y)
+    global_model = LinearRegression().fit(preprocessor.transform(X), y)
+
+    rows = (X["customer_state"] == "AC").to_numpy()
+    assert rows.sum() < 50
+    unseen = X[rows].assign(customer_state="ZZ")
+    for frame in (X[rows], unseen):
+        np.testing.assert_allclose(model.predict(frame), global_model.predict(preprocessor.transform(frame)),
+                                   rtol=1e-9, atol=1e-9)
+
+
+def test_default_preprocessor_is_fitted_on_the_training_rows(segmented_data):
+    X, y = segmented_data
+    X = X.copy()
+    X.loc[X.index[::7], MEDIAN_FILL_COLUMNS[0]] = np.nan
+    default = SegmentedLinearRegression(min_segment_rows=50, n_workers=1).fit(X, y)
+    explicit = SegmentedLinearRegression(PreProcessTransformer().fit(X), min_segment_rows=50, n_workers=1).fit(X, y)
+
+    assert default.preprocessor is None
+    np.testing.assert_allclose(default.predict(X), explicit.predict(X), rtol=1e-12, atol=1e-12)
@@ -0,0 +1,37 @@
+import mlflow
+import pytest
+from mlflow.tracking import MlflowClient
+
+from src.tracking import MAX_ENTITIES_PER_BATCH, AsyncTracker
+
+
+@pytest.fixture
+def tracking_uri(tmp_path):
+    previous = mlflow.get_tracking_uri()
+    mlflow.set_tracking_uri(f"sqlite:///{tmp_path / 'mlflow.db'}")
+    yield
+    mlflow.set_tracking_uri(previous)
+
+
+def test_full_batches_stay_within_the_entity_limit(tracking_uri, monkeypatch):
+    requests = []
+    log_batch = MlflowClient.log_batch
+
+    def counting_log_batch(self, run_id, metrics=(), params=(), tags=(), **kwargs):
+        requests.append((len(metrics), len(params), len(tags)))
+        return log_batch(self, run_id, metrics=metrics, params=params, tags=tags, **kwargs)
+
+    monkeypatch.setattr(MlflowClient, "log_batch", counting_log_batch)
+    with AsyncTracker(flush_interval_s=5.0) as tracker:
+        tracker.log_metrics({f"m{i}": i for i in range(1500)})
+        tracker.log_params({f"p{i}": i for i in range(150)})
+        tracker.set_tags({f"t{i}": i for i in range(150)})
+        run_id = tracker.run_id
+
+    assert all(sum(request) <= MAX_ENTITIES_PER_BATCH for request in requests)
+    run = MlflowClient().get_run(run_id)
+    assert len(run.data.metrics) == 1500
+    assert len(run.data.params) == 150
+    assert len([t for t in run.data.tags if t.startswith("t")]) == 150
+    # The tracker started the run, so it also ended it
+    assert mlflow.active_run() is None